@@ -1,4 +1,6 @@
 from .client import AdsPowerClient
+from .async_client import AsyncAdsPowerClient
+from bitnet_api.pacing import RequestPacer
 from .models import (
     BaseResponse,
     BrowserResponse,
@@ -14,6 +16,8 @@ from .models import (
 
 __all__ = [
     'AdsPowerClient',
+    'AsyncAdsPowerClient',
+    'RequestPacer',
     'BaseResponse',
     'BrowserResponse',
     'BrowserListResponse',
@@ -0,0 +1,83 @@
+from typing import Dict, Optional, Union
+
+from bitnet_api.codec import JSONCodec
+from bitnet_api.pacing import RequestPacer
+from bitnet_api.timeouts import Timeout, effective_timeout
+from bitnet_api.transport import AsyncConnectionPool, build_path, raise_for_status
+
+from .client import BaseAdsPowerClient
+
+
+class AsyncAdsPowerClient(BaseAdsPowerClient):
+    """AdsPower API异步客户端
+    
+    方法与AdsPowerClient一致、返回相同的响应模型，但每个方法都返回可等待对象：
+    
+        async with AsyncAdsPowerClient() as client:
+            response = await client.start_browser(profile_id="xxx")
+    
+    所有请求经过内置的令牌桶节流器排队，按可持续的最高速率发出，
+    而不是因超过本地API频率限制而失败。
+    """
+    
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 50325,
+                 pool_maxsize: int = 10,
+                 pacing: Optional[RequestPacer] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None):
+        """初始化AdsPower API异步客户端
+        
+        Args:
+            host: API主机地址
+            port: API端口号
+            pool_maxsize: 同时打开的最大连接数
+            pacing: 请求节流器，默认使用RequestPacer()的默认速率；
+                可通过RequestPacer(endpoint_rates={...})为单个端点设置速率
+            codec: 请求/响应体的JSON编解码器，JSONCodec实例、"orjson"或"json"；
+                默认在安装了orjson时使用orjson，否则使用标准库json
+            timeout: 默认的连接/读取超时，Timeout实例或同时用于两者的秒数；
+                默认连接3秒、读取30秒
+            endpoint_timeouts: 按端点设置的超时，覆盖在内置的慢端点超时之上
+        """
+        super().__init__(host=host, port=port, pacing=pacing or RequestPacer(), codec=codec,
+                         timeout=timeout, endpoint_timeouts=endpoint_timeouts)
+        self.pool = AsyncConnectionPool(host, port, maxsize=pool_maxsize)
+    
+    async def close(self):
+        """关闭客户端持有的所有连接"""
+        await self.pool.close()
+    
+    async def __aenter__(self) -> 'AsyncAdsPowerClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        """发送请求到API
+        
+        Args:
+            method: HTTP方法（GET或POST）
+            endpoint: API端点（不带前导斜杠）
+            data: POST请求数据或GET查询参数
+            
+        Returns:
+            响应数据字典
+        """
+        if method == "GET":
+            path = build_path(endpoint, data)
+            body = b""
+        else:
+            path = build_path(endpoint)
+            body = self.codec.encode(data or {})
+        timeout = effective_timeout(self.timeout_for(endpoint), endpoint)
+        status, reason, content = await self.pool.request(method, path, body, self.headers, timeout)
+        raise_for_status(status, reason, f"{self.base_url}{path}", content)
+        return self.codec.decode(content)
+    
+    async def _call(self, method: str, endpoint: str, response_cls, data: Dict = None):
+        await self.pacing.acquire_async(endpoint)
+        return response_cls.from_dict(await self._request(method, endpoint, data))
@@ -1,55 +1,74 @@
-import requests
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 
 from .models import (
     BaseResponse, BrowserResponse, BrowserListResponse, 
     GroupListResponse, BrowserActiveResponse, BrowserFingerprint,
-    UserProxyConfig
+    UserProxyConfig, Browser
 )
+from bitnet_api.codec import JSONCodec, make_codec
+from bitnet_api.exceptions import APIError
+from bitnet_api.pacing import RequestPacer
+from bitnet_api.timeouts import DEFAULT_TIMEOUT, Timeout, effective_timeout
+from bitnet_api.transport import Transport, build_path, make_transport, raise_for_status
 
+# browser-profile/list每页最多返回的环境数
+LIST_MAX_LIMIT = 100
 
-class AdsPowerClient:
-    """AdsPower API客户端"""
+# 启动浏览器需要的时间明显长于默认读超时
+SLOW_ENDPOINT_TIMEOUTS = {
+    "api/v2/browser-profile/start": Timeout(connect=3.0, read=120.0),
+}
+
+
+class BaseAdsPowerClient:
+    """AdsPower API接口定义，由同步和异步客户端共享
     
-    def __init__(self, host: str = "127.0.0.1", port: int = 50325):
-        """初始化AdsPower API客户端
+    每个API方法构造请求参数后交给_call()发送，子类基于各自的传输实现_call()。
+    异步客户端的_call()是协程函数，因此同样的方法在异步客户端上返回可等待对象。
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 50325, pacing: Optional[RequestPacer] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None):
+        """初始化客户端共享的连接设置
         
         Args:
             host: API主机地址
             port: API端口号
+            pacing: 请求节流器，为None时不做节流
+            codec: 请求/响应体的JSON编解码器，JSONCodec实例、"orjson"或"json"；
+                默认在安装了orjson时使用orjson，否则使用标准库json
+            timeout: 默认的连接/读取超时，Timeout实例或同时用于两者的秒数；
+                默认连接3秒、读取30秒
+            endpoint_timeouts: 按端点设置的超时，覆盖在内置的慢端点超时之上
         """
         self.base_url = f"http://{host}:{port}"
         self.headers = {"Content-Type": "application/json"}
+        self.pacing = pacing
+        self.codec = make_codec(codec)
+        self.timeout = DEFAULT_TIMEOUT if timeout is None else Timeout.coerce(timeout)
+        self.endpoint_timeouts = dict(SLOW_ENDPOINT_TIMEOUTS)
+        for endpoint, endpoint_timeout in (endpoint_timeouts or {}).items():
+            self.endpoint_timeouts[endpoint] = Timeout.coerce(endpoint_timeout)
     
-    def _post(self, endpoint: str, data: Dict = None) -> Dict:
-        """发送POST请求到API
-        
-        Args:
-            endpoint: API端点（不带前导斜杠）
-            data: 请求数据（将转换为JSON）
-            
-        Returns:
-            响应数据字典
-        """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.post(url, headers=self.headers, json=data or {})
-        response.raise_for_status()
-        return response.json()
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """返回端点使用的连接/读取超时"""
+        return self.endpoint_timeouts.get(endpoint, self.timeout)
     
-    def _get(self, endpoint: str, params: Dict = None) -> Dict:
-        """发送GET请求到API
+    def _call(self, method: str, endpoint: str, response_cls, data: Dict = None):
+        """发送请求并将响应转换为response_cls对象
         
         Args:
+            method: HTTP方法（GET或POST）
             endpoint: API端点（不带前导斜杠）
-            params: 请求参数
+            response_cls: 带有from_dict()构造方法的响应模型
+            data: POST请求数据或GET查询参数
             
         Returns:
-            响应数据字典
+            response_cls对象
         """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params or {})
-        response.raise_for_status()
-        return response.json()
+        raise NotImplementedError
     
     # 浏览器环境管理API
     def create_browser(self, 
@@ -137,8 +156,7 @@ class AdsPowerClient:
         # 移除None值
         data = {k: v for k, v in data.items() if v is not None}
         # api/v2/browser-profile/create
-        response_data = self._post("api/v2/browser-profile/create", data)
-        return BrowserResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/create", BrowserResponse, data)
     
     def start_browser(self, 
                      profile_id: Optional[str] = None,
@@ -194,9 +212,7 @@ class AdsPowerClient:
         if device_scale:
             data["device_scale"] = device_scale
             
-        response_data = self._post("api/v2/browser-profile/start", data)
-        print(f'start response_data:{response_data}')
-        return BrowserActiveResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/start", BrowserActiveResponse, data)
     
     def stop_browser(self, profile_id: Optional[str] = None, profile_no: Optional[str] = None) -> BaseResponse:
         """关闭浏览器
@@ -214,8 +230,7 @@ class AdsPowerClient:
         if profile_no:
             data["profile_no"] = profile_no
             
-        response_data = self._post("api/v2/browser-profile/stop", data)
-        return BaseResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/stop", BaseResponse, data)
     
     def list_browsers(self, 
                       group_id: Optional[str] = None,
@@ -255,8 +270,7 @@ class AdsPowerClient:
         if sort_order:
             data["sort_order"] = sort_order
             
-        response_data = self._post("api/v2/browser-profile/list", data)
-        return BrowserListResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/list", BrowserListResponse, data)
     
     def update_browser(self, 
                        profile_id: str,
@@ -337,8 +351,7 @@ class AdsPowerClient:
         # 移除None值
         data = {k: v for k, v in data.items() if v is not None}
         
-        response_data = self._post("api/v2/browser-profile/update", data)
-        return BaseResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/update", BaseResponse, data)
     
     def delete_browser(self, profile_id: List[str]) -> BaseResponse:
         """删除浏览器环境
@@ -350,8 +363,7 @@ class AdsPowerClient:
             BaseResponse对象
         """
         data = {"profile_id": profile_id}
-        response_data = self._post("api/v2/browser-profile/delete", data)
-        return BaseResponse.from_dict(response_data)
+        return self._call("POST", "api/v2/browser-profile/delete", BaseResponse, data)
     
     def check_browser_active(self, profile_id: Optional[str] = None, profile_no: Optional[str] = None) -> BrowserActiveResponse:
         """检查浏览器活动状态
@@ -369,8 +381,7 @@ class AdsPowerClient:
         if profile_no:
             params["profile_no"] = profile_no
             
-        response_data = self._get("api/v2/browser-profile/active", params)
-        return BrowserActiveResponse.from_dict(response_data)
+        return self._call("GET", "api/v2/browser-profile/active", BrowserActiveResponse, params)
     
     def list_groups(self, group_name: Optional[str] = None, page: int = 1, page_size: int = 10) -> GroupListResponse:
         """查询分组列表
@@ -391,8 +402,7 @@ class AdsPowerClient:
         if group_name:
             params["group_name"] = group_name
             
-        response_data = self._get("api/v1/group/list", params)
-        return GroupListResponse.from_dict(response_data)
+        return self._call("GET", "api/v1/group/list", GroupListResponse, params)
     
     def check_status(self) -> BaseResponse:
         """检查API接口状态
@@ -402,5 +412,188 @@ class AdsPowerClient:
         Returns:
             BaseResponse对象，code为0表示API可用
         """
-        response_data = self._get("status")
-        return BaseResponse.from_dict(response_data)
\ No newline at end of file
+        return self._call("GET", "status", BaseResponse)
+
+
+class AdsPowerClient(BaseAdsPowerClient):
+    """AdsPower API客户端"""
+    
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 50325,
+                 pool_connections: int = 1,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 pacing: Optional[RequestPacer] = None,
+                 transport: Union[str, Transport] = "http",
+                 codec: Union[None, str, JSONCodec] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None):
+        """初始化AdsPower API客户端
+        
+        客户端持有一个长连接(keep-alive)连接池，多次调用会复用TCP连接。
+        使用完毕后调用close()或通过with语句释放连接。
+        
+        Args:
+            host: API主机地址
+            port: API端口号
+            pool_connections: 缓存的主机连接池数量（仅requests传输）
+            pool_maxsize: 每个主机保持的最大连接数
+            pool_block: 连接全部占用时是否阻塞等待，而不是临时新建连接
+            pacing: 请求节流器（RequestPacer），为None时不做节流
+            transport: HTTP传输后端，"http"（默认，基于http.client的轻量连接池）、
+                "requests"（兼容模式）或自定义Transport实例
+            codec: 请求/响应体的JSON编解码器，JSONCodec实例、"orjson"或"json"；
+                默认在安装了orjson时使用orjson，否则使用标准库json
+            timeout: 默认的连接/读取超时，Timeout实例或同时用于两者的秒数；
+                默认连接3秒、读取30秒
+            endpoint_timeouts: 按端点设置的超时，覆盖在内置的慢端点超时之上
+        """
+        super().__init__(host=host, port=port, pacing=pacing, codec=codec, timeout=timeout,
+                         endpoint_timeouts=endpoint_timeouts)
+        self.transport = make_transport(transport, host, port,
+                                        pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block)
+    
+    def close(self):
+        """关闭客户端持有的所有连接"""
+        self.transport.close()
+    
+    def __enter__(self) -> 'AdsPowerClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def iter_browser_pages(self,
+                           group_id: Optional[str] = None,
+                           profile_id: Optional[List[str]] = None,
+                           profile_no: Optional[List[str]] = None,
+                           sort_type: Optional[str] = None,
+                           sort_order: Optional[str] = None,
+                           limit: int = 50,
+                           max_limit: int = LIST_MAX_LIMIT) -> Iterator[BrowserListResponse]:
+        """逐页查询环境列表，直到返回不足一页为止
+        
+        AdsPower的分页信息不含总数，因此返回条数少于每页数量即视为最后一页。
+        每取到一个满页，只要已读条数能被翻倍后的每页数量整除，就把每页数量翻倍
+        （不超过max_limit），这样新页码正好从已读位置接着读，不会重复或遗漏。
+        每次请求都经过客户端的节流器。
+        
+        Args:
+            group_id: 分组ID
+            profile_id: 环境ID列表
+            profile_no: 环境编号列表
+            sort_type: 排序类型
+            sort_order: 排序顺序
+            limit: 第一页的每页数量
+            max_limit: 每页数量的上限
+            
+        Returns:
+            BrowserListResponse对象的迭代器
+            
+        Raises:
+            APIError: 某一页查询失败时
+        """
+        max_limit = max(1, min(max_limit, LIST_MAX_LIMIT))
+        limit = max(1, min(limit, max_limit))
+        offset = 0
+        while True:
+            response = self.list_browsers(group_id=group_id, profile_id=profile_id, profile_no=profile_no,
+                                          sort_type=sort_type, sort_order=sort_order,
+                                          page=offset // limit + 1, limit=limit)
+            if response.code != 0:
+                raise APIError(f"查询环境列表失败: {response.msg}")
+            yield response
+            count = len(response.browsers)
+            offset += count
+            if count < limit:
+                return
+            grown = min(limit * 2, max_limit)
+            if grown > limit and offset % grown == 0:
+                limit = grown
+    
+    def iter_browsers(self,
+                      group_id: Optional[str] = None,
+                      profile_id: Optional[List[str]] = None,
+                      profile_no: Optional[List[str]] = None,
+                      sort_type: Optional[str] = None,
+                      sort_order: Optional[str] = None,
+                      limit: int = 50,
+                      max_limit: int = LIST_MAX_LIMIT) -> Iterator[Browser]:
+        """逐个返回所有环境，自动翻页
+        
+        按需取页：只有读完当前页后才请求下一页，提前停止迭代不会多发请求。
+        翻页方式见iter_browser_pages()。
+        
+        Args:
+            group_id: 分组ID
+            profile_id: 环境ID列表
+            profile_no: 环境编号列表
+            sort_type: 排序类型
+            sort_order: 排序顺序
+            limit: 第一页的每页数量
+            max_limit: 每页数量的上限
+            
+        Returns:
+            Browser对象的迭代器
+            
+        Raises:
+            APIError: 某一页查询失败时
+        """
+        for response in self.iter_browser_pages(group_id=group_id, profile_id=profile_id,
+                                                profile_no=profile_no, sort_type=sort_type,
+                                                sort_order=sort_order, limit=limit, max_limit=max_limit):
+            yield from response.browsers
+    
+    def _request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        """发送请求到API
+        
+        Args:
+            method: HTTP方法（GET或POST）
+            endpoint: API端点（不带前导斜杠）
+            data: POST请求数据或GET查询参数
+            
+        Returns:
+            响应数据字典
+        """
+        if method == "GET":
+            path = build_path(endpoint, data)
+            body = b""
+        else:
+            path = build_path(endpoint)
+            body = self.codec.encode(data or {})
+        timeout = effective_timeout(self.timeout_for(endpoint), endpoint)
+        status, reason, content = self.transport.request(method, path, body, self.headers, timeout)
+        raise_for_status(status, reason, f"{self.base_url}{path}", content)
+        return self.codec.decode(content)
+    
+    def _post(self, endpoint: str, data: Dict = None) -> Dict:
+        """发送POST请求到API
+        
+        Args:
+            endpoint: API端点（不带前导斜杠）
+            data: 请求数据（将转换为JSON）
+            
+        Returns:
+            响应数据字典
+        """
+        return self._request("POST", endpoint, data)
+    
+    def _get(self, endpoint: str, params: Dict = None) -> Dict:
+        """发送GET请求到API
+        
+        Args:
+            endpoint: API端点（不带前导斜杠）
+            params: 请求参数
+            
+        Returns:
+            响应数据字典
+        """
+        return self._request("GET", endpoint, params)
+    
+    def _call(self, method: str, endpoint: str, response_cls, data: Dict = None):
+        if self.pacing is not None:
+            self.pacing.acquire(endpoint)
+        return response_cls.from_dict(self._request(method, endpoint, data))
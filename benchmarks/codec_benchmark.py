@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: decoding a full browser/list page with each JSON codec.
+
+The payload mimics a 1000-item page where every browser carries a complete
+browserFingerPrint block. Decoding starts from the raw response bytes, the
+way the clients receive them.
+
+Usage:
+    python benchmarks/codec_benchmark.py [--items N] [--rounds N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitnet_api import OrjsonCodec, StdlibJSONCodec
+
+
+def make_page(items: int) -> bytes:
+    """Build the raw bytes of a browser/list response with `items` browsers"""
+    fingerprint = {
+        "coreVersion": "112", "ostype": "PC", "os": "Win32", "osVersion": "10",
+        "version": "112.0.5615.121", "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        "timeZone": "Asia/Shanghai", "languages": "zh-CN,zh", "resolution": "1920 x 1080",
+        "webGL": "0", "webGLMeta": "1", "webGLManufacturer": "Google Inc. (NVIDIA)",
+        "hardwareConcurrency": "8", "deviceMemory": "8", "doNotTrack": "1",
+        "clientRectNoiseEnabled": True, "portScanProtect": "1", "colorDepth": 24,
+    }
+    content = [{
+        "id": f"{n:032x}", "seq": n, "name": f"browser {n}", "groupId": "g1",
+        "proxyMethod": 2, "proxyType": "socks5", "host": "10.0.0.1", "port": 1080 + n % 100,
+        "remark": "", "status": 0, "browserFingerPrint": dict(fingerprint, id=f"fp{n}"),
+    } for n in range(items)]
+    page = {"success": True, "data": {"list": content, "totalNum": items, "page": 0, "pageSize": items}}
+    return json.dumps(page).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    content = make_page(args.items)
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson not installed, only the stdlib codec is measured")
+
+    print(f"page size: {len(content) / 1024:.0f} KiB, {args.items} browsers")
+    print(f"{'codec':<10}{'decode ms':>12}{'encode ms':>12}")
+    for codec in codecs:
+        decoded = codec.decode(content)
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            codec.decode(content)
+        decode_ms = (time.perf_counter() - start) / args.rounds * 1e3
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            codec.encode(decoded)
+        encode_ms = (time.perf_counter() - start) / args.rounds * 1e3
+        print(f"{codec.name:<10}{decode_ms:>12.2f}{encode_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
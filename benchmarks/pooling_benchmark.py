@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: calls per second with and without pooled keep-alive connections.
+
+Runs against the mock server from tests/mock_server.py and compares the old
+behaviour (module-level requests.post per call, new TCP connection each time)
+with BitnetClient's pooled transport.
+
+Usage:
+    python benchmarks/pooling_benchmark.py [--calls N] [--threads T]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from bitnet_api import BitnetClient
+from mock_server import MockServer
+
+
+def run(call, calls: int, threads: int) -> float:
+    """Run `call` `calls` times on `threads` threads and return calls/second"""
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            call()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: call(), range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = MockServer(port=0)
+    server.start()
+    try:
+        url = f"http://{server.host}:{server.port}/browser/pids/alive"
+        headers = {"Content-Type": "application/json"}
+
+        def unpooled():
+            response = requests.post(url, headers=headers, json={"ids": ["test-browser-1"]})
+            response.raise_for_status()
+            return response.json()
+
+        # Identical concurrent reads would be coalesced; measure the connections alone
+        client = BitnetClient(host=server.host, port=server.port, pool_maxsize=args.threads,
+                              coalesce_reads=False)
+
+        def pooled():
+            return client._make_request("browser/pids/alive", {"ids": ["test-browser-1"]})
+
+        print(f"{'mode':<12}{'threads':>8}{'calls/s':>12}")
+        for threads in (1, args.threads):
+            before = run(unpooled, args.calls, threads)
+            after = run(pooled, args.calls, threads)
+            print(f"{'unpooled':<12}{threads:>8}{before:>12.0f}")
+            print(f"{'pooled':<12}{threads:>8}{after:>12.0f}   ({after / before:.2f}x)")
+        client.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call overhead of each transport backend.
+
+Every backend sends the same pre-encoded request to the mock server over a
+kept-alive connection. The baseline is a bare http.client connection with
+no pooling or client logic at all; a backend's overhead is its mean per-call
+time minus that baseline.
+
+Usage:
+    python benchmarks/transport_benchmark.py [--calls N]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from bitnet_api import BitnetClient
+from mock_server import MockServer
+
+ENDPOINT = "browser/detail"
+DATA = {"id": "test-browser-1"}
+
+
+def per_call_us(call, calls: int) -> float:
+    """Return the mean wall time of `call` in microseconds"""
+    for _ in range(min(100, calls)):
+        call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=3000)
+    args = parser.parse_args()
+
+    server = MockServer(port=0)
+    server.start()
+    try:
+        body = json.dumps(DATA).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        connection = http.client.HTTPConnection(server.host, server.port)
+
+        def raw():
+            connection.request("POST", f"/{ENDPOINT}", body, headers)
+            return connection.getresponse().read()
+
+        baseline = per_call_us(raw, args.calls)
+        connection.close()
+
+        print(f"{'backend':<12}{'us/call':>10}{'overhead us':>14}")
+        print(f"{'raw':<12}{baseline:>10.1f}{0:>14.1f}")
+        for transport in ("http", "requests"):
+            with BitnetClient(host=server.host, port=server.port, transport=transport) as client:
+                elapsed = per_call_us(lambda: client._make_request(ENDPOINT, DATA), args.calls)
+            print(f"{transport:<12}{elapsed:>10.1f}{elapsed - baseline:>14.1f}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
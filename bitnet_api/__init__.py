@@ -1,4 +1,24 @@
 from .client import BitnetClient
+from .async_client import AsyncBitnetClient
+from .batch import Batch
+from .pacing import TokenBucket, RequestPacer
+from .retry import RetryPolicy
+from .metrics import ClientMetrics
+from .circuit import CircuitBreaker, CircuitBreakerRegistry
+from .limiter import AdaptiveLimit, ConcurrencyLimiter
+from .scheduler import PriorityScheduler, URGENT, INTERACTIVE, BULK
+from .exceptions import APIError, CircuitOpenError, DeadlineExceeded, ListChangedError
+from .timeouts import Timeout, Deadline, deadline
+from .codec import JSONCodec, StdlibJSONCodec, OrjsonCodec
+from .streaming import BrowserStream, JSONArrayStream
+from .paging import PagePrefetcher, fetch_all_pages
+from .fleet import FleetLauncher, LaunchSpec, LaunchResult, LaunchSummary
+from .bulk import BrowserTemplate, BulkCreator, BulkResult, ChunkedSender, CreateResult
+from .updates import UpdateReport, diff_browser
+from .writebehind import WriteBehindQueue
+from .mirror import FleetMirror
+from .store import FleetStore
+from .proxycheck import ProxyChecker, ProxyCheckCache, ProxyCheckResult, ProxySpec
 from .models import (
     BaseResponse, BrowserFingerPrint, Browser, Group, 
     PageInfo, BrowserListResponse, GroupListResponse, 
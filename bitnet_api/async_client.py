@@ -0,0 +1,224 @@
+import asyncio
+import time
+from typing import Dict, Optional, Union
+
+import requests
+
+from .circuit import CircuitBreaker, CircuitBreakerRegistry
+from .client import BaseBitnetClient
+from .codec import JSONCodec
+from .exceptions import CircuitOpenError
+from .limiter import AdaptiveLimit, ConcurrencyLimiter
+from .retry import RetryPolicy
+from .scheduler import PriorityScheduler, priority_for
+from .singleflight import AsyncSingleFlight
+from .timeouts import Timeout, current_deadline, effective_timeout
+from .transport import AsyncConnectionPool, build_path, raise_for_status
+
+
+class AsyncBitnetClient(BaseBitnetClient):
+    """
+    Asyncio client for the Bitnet Browser API.
+
+    Exposes the same methods as BitnetClient, returning the same response
+    models, but every method returns an awaitable:
+
+        async with AsyncBitnetClient() as client:
+            response = await client.open_browser(id=browser_id)
+
+    All calls made on one client share a single keep-alive connection pool,
+    so many concurrent calls can be in flight from one event loop.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 54345,
+                 token: Optional[str] = None,
+                 pool_maxsize: int = 100,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 coalesce_reads: bool = True,
+                 concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+                 priority_scheduling: bool = True):
+        """
+        Initialize the async Bitnet API client.
+
+        Args:
+            host: API host address
+            port: API port number
+            token: Authentication token (if required)
+            pool_maxsize: Maximum number of connections open at once; calls
+                beyond this wait for a free connection
+            retry_policy: Retry policy for failed requests; defaults to
+                RetryPolicy(). Use RetryPolicy(max_attempts=1) to disable retries.
+            circuit_breakers: Per-endpoint-family circuit breakers; defaults
+                to CircuitBreakerRegistry()
+            timeout: Default connect/read timeout, as a Timeout or a number of
+                seconds for both; defaults to DEFAULT_TIMEOUT
+            endpoint_timeouts: Per-endpoint timeouts, merged over the built-in
+                ones for slow endpoints such as browser/open and cache/clear
+            codec: JSON codec for request and response bodies: a JSONCodec,
+                "orjson" or "json"; defaults to orjson when it is installed
+            coalesce_reads: Share one round-trip among identical read requests
+                (same endpoint and body) that are in flight at the same time
+            concurrency_limiter: Adaptive per-endpoint limit on requests in
+                flight (AIMD), shared by every call made through the client;
+                None (the default) leaves concurrency unlimited
+            priority_scheduling: Queue requests for the pool_maxsize
+                connections by priority, so urgent calls such as
+                close_browser() overtake bulk traffic
+        """
+        super().__init__(host=host, port=port, token=token, retry_policy=retry_policy,
+                         circuit_breakers=circuit_breakers, timeout=timeout,
+                         endpoint_timeouts=endpoint_timeouts, codec=codec,
+                         coalesce_reads=coalesce_reads, concurrency_limiter=concurrency_limiter)
+        if priority_scheduling:
+            self.scheduler = PriorityScheduler(pool_maxsize, self.metrics)
+        self._inflight = AsyncSingleFlight()
+        self.pool = AsyncConnectionPool(host, port, maxsize=pool_maxsize)
+
+    async def close(self):
+        """Close all pooled connections held by the client"""
+        await self.pool.close()
+
+    async def __aenter__(self) -> 'AsyncBitnetClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _make_request(self, endpoint: str, data: Dict = None) -> Dict:
+        """
+        Make a POST request to the API.
+
+        Transient failures are retried according to the client's retry policy.
+        Calls to an endpoint family whose circuit is open fail immediately
+        with CircuitOpenError. Each attempt uses the endpoint's timeouts,
+        clamped to the current deadline.
+
+        Identical read requests made concurrently share one round-trip and
+        receive the same response dictionary.
+
+        Args:
+            endpoint: API endpoint (without leading slash)
+            data: Request data (will be converted to JSON)
+
+        Returns:
+            Response data as dictionary
+        """
+        body = self.codec.encode(data or {})
+        if not self._coalesces(endpoint):
+            return await self._send(endpoint, data, body)
+        active = current_deadline()
+        result, shared = await self._inflight.do((endpoint, body), lambda: self._send(endpoint, data, body),
+                                                 timeout=active.remaining() if active else None)
+        if shared:
+            self.metrics.record_coalesced(endpoint)
+        return result
+
+    async def _acquire_slots(self, endpoint: str, limit: Optional[AdaptiveLimit]) -> Optional[float]:
+        """
+        Wait for the endpoint's concurrency limit, then for a connection.
+
+        Returns:
+            Start time from the concurrency limit, to pass to _release_slots()
+        """
+        active = current_deadline()
+        started = None
+        if limit is not None:
+            started = await limit.acquire_async(active.remaining() if active else None)
+        if self.scheduler is not None:
+            try:
+                await self.scheduler.acquire_async(priority_for(endpoint),
+                                                   active.remaining() if active else None)
+            except BaseException:
+                if started is not None:
+                    limit.cancel(started)
+                raise
+        return started
+
+    async def _send(self, endpoint: str, data: Optional[Dict], body: bytes) -> Dict:
+        """Send an encoded request, retrying it as the retry policy allows"""
+        path = build_path(endpoint)
+        breaker = self.circuit_breakers.get(endpoint)
+        limit = self.concurrency_limiter.get(endpoint) if self.concurrency_limiter else None
+        attempt = 0
+        first_failure = None
+        while True:
+            attempt += 1
+            effective_timeout(self.timeout_for(endpoint), endpoint)
+            started = await self._acquire_slots(endpoint, limit)
+            try:
+                # Waiting for a slot may have used up part of the deadline
+                timeout = effective_timeout(self.timeout_for(endpoint), endpoint)
+                if breaker is not None:
+                    try:
+                        if breaker.acquire():
+                            await self._probe_health(breaker)
+                    except CircuitOpenError:
+                        self.metrics.record_rejection(endpoint)
+                        raise
+            except BaseException:
+                self._release_slots(limit, started)
+                raise
+            try:
+                status, reason, content = await self.pool.request("POST", path, body, self.headers,
+                                                                  timeout)
+                raise_for_status(status, reason, f"{self.base_url}{path}", content)
+            except requests.exceptions.RequestException as e:
+                transient = self.retry_policy.is_transient(e)
+                self._release_slots(limit, started, overloaded=transient)
+                if breaker is not None:
+                    if transient:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                now = time.monotonic()
+                if first_failure is None:
+                    first_failure = now
+                delay = None
+                try:
+                    delay = self._retry_delay(endpoint, data, e, attempt, now - first_failure)
+                finally:
+                    if delay is None:
+                        self.metrics.record_call(endpoint, error=True, retries=attempt - 1,
+                                                 retry_time=now - first_failure)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            except BaseException:
+                self._release_slots(limit, started)
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                self._release_slots(limit, started, overloaded=False)
+                if breaker is not None:
+                    breaker.record_success()
+                break
+        retry_time = time.monotonic() - first_failure if first_failure is not None else 0.0
+        self.metrics.record_call(endpoint, retries=attempt - 1, retry_time=retry_time)
+        return self.codec.decode(content)
+
+    async def _probe_health(self, breaker: CircuitBreaker):
+        """Probe the health endpoint on behalf of an open circuit"""
+        try:
+            timeout = effective_timeout(self.timeout_for("health"), "health")
+            status, reason, content = await self.pool.request("POST", "/health", b"{}", self.headers,
+                                                              timeout)
+            raise_for_status(status, reason, f"{self.base_url}/health", content)
+        except requests.exceptions.RequestException as e:
+            breaker.probe_failed()
+            raise CircuitOpenError(f"Circuit for '{breaker.name}' endpoints is open, "
+                                   f"health probe failed: {e}") from e
+        except BaseException:
+            # Cancelled or interrupted: let the next caller probe
+            breaker.probe_failed()
+            raise
+        breaker.probe_succeeded()
+
+    async def _call(self, endpoint: str, response_cls, data: Dict = None):
+        return response_cls.from_dict(await self._make_request(endpoint, data))
@@ -0,0 +1,127 @@
+"""
+Batches of client calls run concurrently.
+
+Inside a `with client.batch() as batch:` block, client methods queue their
+request and return a concurrent.futures.Future instead of blocking. When
+the block exits, the queued calls run on a bounded worker pool and the
+block returns once every call has finished:
+
+    with client.batch(max_workers=8) as batch:
+        for browser_id in browser_ids:
+            client.open_browser(id=browser_id)
+    for outcome in batch.results():
+        ...
+
+Bulk helpers that consume large or unbounded inputs use run_bounded()
+instead, which reads its input lazily and yields results as they finish.
+"""
+
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Batch:
+    """Calls queued inside one client.batch() block"""
+
+    def __init__(self, max_workers: int):
+        """
+        Args:
+            max_workers: Maximum number of calls run at once
+        """
+        self.max_workers = max(1, max_workers)
+        self.futures: List[Future] = []
+        self._calls: List[Tuple[Future, contextvars.Context, Callable[[], Any]]] = []
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        """
+        Queue a call to run when the batch is flushed.
+
+        The call runs in a copy of the caller's context, so deadlines active
+        where the method was called also apply when it runs.
+
+        Returns:
+            Future resolved with the call's result or exception
+        """
+        future = Future()
+        self.futures.append(future)
+        self._calls.append((future, contextvars.copy_context(), fn))
+        return future
+
+    def add(self, future: Future):
+        """Include a future resolved elsewhere, such as a write-behind update, in results()"""
+        self.futures.append(future)
+
+    def run(self):
+        """Run all queued calls and wait for them to finish"""
+        calls, self._calls = self._calls, []
+        if not calls:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            for future, context, fn in calls:
+                executor.submit(context.run, self._run_one, future, fn)
+
+    def cancel(self):
+        """Cancel all queued calls without running them"""
+        calls, self._calls = self._calls, []
+        for future, _, _ in calls:
+            future.cancel()
+
+    @staticmethod
+    def _run_one(future: Future, fn: Callable[[], Any]):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def results(self) -> List[Any]:
+        """
+        Return the outcome of every call in the order the calls were made.
+
+        Each item is the call's response, or the exception it raised, so one
+        failed call does not hide the others. Calls cancelled because the
+        block raised are listed as a CancelledError.
+        """
+        return [CancelledError() if future.cancelled() else future.exception() or future.result()
+                for future in self.futures]
+
+
+def run_bounded(fn: Callable[[T], R], items: Iterable[T], max_workers: int,
+                thread_name_prefix: str = "bitnet-bulk") -> Iterator[R]:
+    """
+    Call `fn` on every item with at most `max_workers` calls at once.
+
+    Items are read from `items` only as workers free up, so the input can
+    be a generator over millions of rows. Each call runs in a copy of the
+    caller's context. Results are yielded in completion order; an
+    exception raised by `fn` is raised from the iterator. Stopping the
+    iteration early lets running calls finish but starts no new ones.
+    """
+    max_workers = max(1, max_workers)
+    items = iter(items)
+    pending: Set[Future] = set()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_workers:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(contextvars.copy_context().run, fn, item))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=False)
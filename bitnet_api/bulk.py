@@ -0,0 +1,361 @@
+"""
+Bulk operations on many browser profiles.
+
+Creating thousands of profiles one create_or_update_browser() call at a
+time rebuilds and re-serializes the same fingerprint and settings for every
+profile. BulkCreator encodes the settings shared by all profiles (the
+BrowserTemplate) once, splices each profile's own fields onto those bytes,
+and sends the creates concurrently at a bounded rate:
+
+    template = BrowserTemplate(group_id=group_id, browser_fingerprint=fingerprint)
+    rows = ({"name": f"shop {n}", "remark": row.note} for n, row in enumerate(read_rows()))
+    for result in client.create_browsers(template, rows, concurrency=8, rate=20):
+        if result.success:
+            save(result.index, result.id)
+
+Endpoints that take a list, such as `browser/delete/ids`, time out or are
+rejected when the list is very long, and a failed request does not say
+which items it covered. ChunkedSender splits the list into chunks sized to
+the server's latency, sends them concurrently, and bisects failed chunks
+down to the items that fail on their own. The outcome is a BulkResult
+bitmap with one bit per input item.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+)
+
+import requests
+
+from .batch import run_bounded
+from .models import BaseResponse, BrowserFingerPrint, BrowserResponse
+from .pacing import TokenBucket
+
+if TYPE_CHECKING:
+    from .client import BitnetClient
+
+# Request keys of the create_or_update_browser() arguments
+BROWSER_UPDATE_KEYS = {
+    "group_id": "groupId",
+    "name": "name",
+    "remark": "remark",
+    "platform": "platform",
+    "url": "url",
+    "user_name": "userName",
+    "password": "password",
+    "is_syn_open": "isSynOpen",
+    "fa_secret_key": "faSecretKey",
+    "cookie": "cookie",
+    "proxy_method": "proxyMethod",
+    "proxy_type": "proxyType",
+    "host": "host",
+    "port": "port",
+    "proxy_username": "proxyUserName",
+    "proxy_password": "proxyPassword",
+    "ip_check_service": "ipCheckService",
+    "is_ipv6": "isIpv6",
+    "refresh_proxy_url": "refreshProxyUrl",
+    "country": "country",
+    "province": "province",
+    "city": "city",
+    "dynamic_ip_url": "dynamicIpUrl",
+    "dynamic_ip_channel": "dynamicIpChannel",
+    "is_dynamic_ip_change_ip": "isDynamicIpChangeIp",
+    "duplicate_check": "duplicateCheck",
+    "workbench": "workbench",
+    "abort_image": "abortImage",
+    "abort_image_max_size": "abortImageMaxSize",
+    "abort_media": "abortMedia",
+    "mute_audio": "muteAudio",
+    "stop_while_net_error": "stopWhileNetError",
+    "stop_while_ip_change": "stopWhileIpChange",
+    "stop_while_country_change": "stopWhileCountryChange",
+    "browser_fingerprint": "browserFingerPrint",
+}
+
+# What create_or_update_browser() sends for arguments left at their defaults
+CREATE_DEFAULTS = {
+    "proxyMethod": 2,
+    "proxyType": "noproxy",
+    "host": "",
+    "port": "",
+    "proxyUserName": "",
+    "proxyPassword": "",
+    "browserFingerPrint": {"coreVersion": "104"},
+}
+
+
+def browser_update_data(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Translate create_or_update_browser() arguments into request keys.
+
+    None values are dropped and a BrowserFingerPrint is converted to a dict.
+
+    Raises:
+        ValueError: For an argument create_or_update_browser() does not take
+    """
+    data = {}
+    for name, value in fields.items():
+        key = BROWSER_UPDATE_KEYS.get(name)
+        if key is None:
+            raise ValueError(f"Unknown browser field {name!r}")
+        if isinstance(value, BrowserFingerPrint):
+            value = value.to_dict()
+        if value is not None:
+            data[key] = value
+    return data
+
+
+class BrowserTemplate:
+    """
+    Settings shared by every profile of a bulk create.
+
+    Takes the keyword arguments of create_or_update_browser(). Arguments not
+    given get the same defaults create_or_update_browser() uses.
+    """
+
+    def __init__(self, **fields):
+        self.data = {**CREATE_DEFAULTS, **browser_update_data(fields)}
+
+
+@dataclass
+class CreateResult:
+    """Outcome of creating one profile"""
+    index: int
+    success: bool
+    id: Optional[str] = None
+    seq: Optional[int] = None
+    msg: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+class BulkCreator:
+    """Creates many profiles from one template with bounded concurrency and rate"""
+
+    def __init__(self, client: 'BitnetClient', template: BrowserTemplate, concurrency: Optional[int] = None,
+                 rate: Optional[float] = None):
+        """
+        Args:
+            client: Client the profiles are created through
+            template: Settings shared by every profile
+            concurrency: Maximum number of creates in flight; defaults to the
+                client's connection pool size
+            rate: Maximum creates started per second; None for no limit
+        """
+        self.client = client
+        self.template = template
+        self.concurrency = max(1, concurrency or client.pool_maxsize)
+        self.bucket = TokenBucket(rate) if rate else None
+        # Encoded template without the keys the profiles set themselves, by
+        # key set, with the closing brace cut off so fields can be appended
+        self._heads: Dict[FrozenSet[str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def create(self, profiles: Iterable[Dict[str, Any]]) -> Iterator[CreateResult]:
+        """
+        Create one profile per item of `profiles`.
+
+        Each item holds the fields of its profile that differ from the
+        template, as create_or_update_browser() arguments (name, remark,
+        host, port, proxy_username, user_name, password, ...). Items are
+        read lazily and results are not kept, so the input can be a
+        generator over any number of rows.
+
+        Creates are not retried: a create whose response was lost may
+        still have created the profile, and a retry would duplicate it.
+
+        Returns:
+            Iterator of CreateResult in completion order; `index` is the
+            position of the profile in `profiles`
+        """
+        return run_bounded(self._create, enumerate(profiles), self.concurrency,
+                           thread_name_prefix="bitnet-create")
+
+    def encode(self, profile: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Build the request body for one profile.
+
+        Returns:
+            Tuple of the profile's own request fields and the full body
+        """
+        if "id" in profile:
+            raise ValueError("Bulk creates cannot target an existing browser id")
+        data = browser_update_data(profile)
+        keys = frozenset(data)
+        head = self._heads.get(keys)
+        if head is None:
+            base = {key: value for key, value in self.template.data.items() if key not in keys}
+            head = self.client.codec.encode(base).rstrip()[:-1]
+            with self._lock:
+                self._heads[keys] = head
+        if not data:
+            return data, head + b"}"
+        tail = self.client.codec.encode(data).lstrip()[1:]
+        return data, head + (b"," if head.rstrip() != b"{" else b"") + tail
+
+    def _create(self, item: Tuple[int, Dict[str, Any]]) -> CreateResult:
+        index, profile = item
+        result = CreateResult(index=index, success=False)
+        try:
+            data, body = self.encode(profile)
+        except ValueError as e:
+            result.error, result.msg = e, str(e)
+            return result
+        if self.bucket is not None:
+            self.bucket.acquire()
+        try:
+            response = self.client._call("browser/update", BrowserResponse, data, body=body)
+        except requests.exceptions.RequestException as e:
+            result.error, result.msg = e, str(e)
+            return result
+        result.success, result.msg = response.success, response.msg
+        if response.data is not None:
+            result.id, result.seq = response.data.id, response.data.seq
+        return result
+
+
+class BulkResult:
+    """
+    Per-item outcome of a chunked bulk call, one bit per input item.
+
+        result = client.delete_browsers_chunked(ids)
+        if not result.all_succeeded:
+            retry([ids[i] for i in result.failed_indices()])
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.bits = bytearray((total + 7) // 8)
+        self.requests = 0
+        self.elapsed = 0.0
+        self.last_error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.total
+
+    def mark(self, start: int, stop: int):
+        """Mark items `start` up to `stop` (exclusive) as succeeded"""
+        for index in range(start, stop):
+            self.bits[index >> 3] |= 1 << (index & 7)
+
+    def ok(self, index: int) -> bool:
+        """Whether item `index` was processed successfully"""
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    @property
+    def succeeded(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.succeeded
+
+    @property
+    def all_succeeded(self) -> bool:
+        return self.failed == 0
+
+    def failed_indices(self) -> List[int]:
+        """Return the positions of the items that failed"""
+        return [index for index in range(self.total) if not self.ok(index)]
+
+
+class ChunkedSender:
+    """
+    Sends a long list to a list-taking endpoint in adaptive, concurrent chunks.
+
+    After each successful chunk the next chunk size is scaled towards the
+    size that would take `target_latency` seconds (at most doubling); a
+    rejected chunk halves it. A chunk the server rejects is split in two and
+    each half sent again, down to single items, so only the items that fail
+    on their own are reported as failed; a chunk that could not be sent at
+    all (connection errors, timeouts, an open circuit) fails as a whole. Since a failed request may still have been
+    applied in part, a failure bit means "not confirmed", not "not done".
+    """
+
+    def __init__(self, send: Callable[[List[Any]], BaseResponse], chunk_size: int = 100,
+                 min_chunk_size: int = 1, max_chunk_size: int = 1000, concurrency: int = 4,
+                 target_latency: float = 2.0):
+        """
+        Args:
+            send: Makes the API call for one chunk of items
+            chunk_size: Size of the first chunks
+            min_chunk_size: Smallest chunk size adaptation goes down to
+            max_chunk_size: Largest chunk size adaptation goes up to
+            concurrency: Maximum number of chunks in flight
+            target_latency: Seconds one chunk should take
+        """
+        self.send = send
+        self.min_chunk_size = max(1, min_chunk_size)
+        self.max_chunk_size = max(self.min_chunk_size, max_chunk_size)
+        self.chunk_size = min(max(chunk_size, self.min_chunk_size), self.max_chunk_size)
+        self.concurrency = max(1, concurrency)
+        self.target_latency = target_latency
+        self._lock = threading.Lock()
+
+    def run(self, items: Sequence[Any]) -> BulkResult:
+        """
+        Send every item and report which ones succeeded.
+
+        Returns:
+            BulkResult with one bit per item of `items`
+        """
+        result = BulkResult(len(items))
+        started = time.monotonic()
+        for _ in run_bounded(lambda span: self._send_span(items, span, result), self._spans(len(items)),
+                             self.concurrency, thread_name_prefix="bitnet-chunks"):
+            pass
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def _spans(self, total: int) -> Iterator[Tuple[int, int]]:
+        """Cut [0, total) into chunks, sizing each one when it is needed"""
+        start = 0
+        while start < total:
+            stop = min(total, start + self.chunk_size)
+            yield start, stop
+            start = stop
+
+    def _send_span(self, items: Sequence[Any], span: Tuple[int, int], result: BulkResult):
+        start, stop = span
+        chunk = list(items[start:stop])
+        began = time.monotonic()
+        error, split = self._attempt(chunk)
+        latency = time.monotonic() - began
+        with self._lock:
+            result.requests += 1
+            if error is None:
+                result.mark(start, stop)
+                scale = min(2.0, self.target_latency / max(latency, 1e-3))
+                self.chunk_size = max(self.min_chunk_size, min(self.max_chunk_size, int(len(chunk) * scale)))
+                return
+            result.last_error = error
+            if split:
+                self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+        if split and stop - start > 1:
+            middle = (start + stop) // 2
+            self._send_span(items, (start, middle), result)
+            self._send_span(items, (middle, stop), result)
+
+    def _attempt(self, chunk: List[Any]) -> Tuple[Optional[str], bool]:
+        """
+        Send one chunk.
+
+        Returns:
+            Tuple of the error message (None on success) and whether the
+            chunk is worth splitting. It only is when the server answered
+            and rejected the chunk; splitting cannot help when it is down,
+            its circuit is open or the deadline has passed
+        """
+        try:
+            response = self.send(chunk)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            return str(e), status is not None and 400 <= status < 500
+        except requests.exceptions.RequestException as e:
+            return str(e) or type(e).__name__, False
+        if not response.success:
+            return response.msg or "request failed", True
+        return None, False
@@ -0,0 +1,163 @@
+"""
+Per-endpoint-family circuit breakers.
+
+When the desktop app stalls, calls that keep arriving only make the stall
+worse. After `failure_threshold` consecutive failures a family's circuit
+opens and its calls fail immediately with CircuitOpenError. Once
+`recovery_timeout` has passed, the next caller probes the `health`
+endpoint; if the API answers, the circuit goes half-open and lets a few
+trial calls through, closing again once one of them succeeds. A probe or
+trial that never reports back (its caller was cancelled or died) is given
+up after another `recovery_timeout`, so the circuit cannot stay stuck.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+from .endpoints import endpoint_family
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Endpoints that never trip a breaker; health is the recovery probe itself
+EXEMPT_ENDPOINTS = frozenset(["health"])
+
+
+class CircuitBreaker:
+    """Circuit breaker state machine for one endpoint family"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 5.0,
+                 half_open_max_calls: int = 1):
+        """
+        Args:
+            name: Family name, used in error messages
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing again
+            half_open_max_calls: Trial calls allowed at once while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._trials = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """
+        Ask to send a call through the circuit.
+
+        Returns:
+            True if the caller must run a health probe and report it with
+            probe_succeeded()/probe_failed() before sending its call
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                # Trials still outstanding after recovery_timeout are taken as lost
+                if (self._trials < self.half_open_max_calls
+                        or now - self._trial_started >= self.recovery_timeout):
+                    self._trials = min(self._trials + 1, self.half_open_max_calls)
+                    self._trial_started = now
+                    return False
+            elif self._probing:
+                if now - self._probe_started >= self.recovery_timeout:
+                    self._probe_started = now
+                    return True
+            elif now - self._opened_at >= self.recovery_timeout:
+                self._probing = True
+                self._probe_started = now
+                return True
+        raise CircuitOpenError(f"Circuit for '{self.name}' endpoints is {self.state}")
+
+    def probe_succeeded(self):
+        """Report a healthy probe; the prober's own call becomes the first trial"""
+        with self._lock:
+            self._probing = False
+            self.state = HALF_OPEN
+            self._trials = 1
+            self._trial_started = time.monotonic()
+
+    def probe_failed(self):
+        """Report a failed probe; the circuit stays open for another timeout"""
+        with self._lock:
+            self._probing = False
+            self._open()
+
+    def release(self):
+        """Give back a half-open trial whose call ended without an answer or a transient error"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        """Report a call the server answered"""
+        with self._lock:
+            self.failures = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._trials = 0
+
+    def record_failure(self):
+        """Report a call that failed with a transient error"""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._trials = 0
+
+
+class CircuitBreakerRegistry:
+    """Creates and holds one CircuitBreaker per endpoint family"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 5.0,
+                 half_open_max_calls: int = 1):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds a circuit stays open before probing
+            half_open_max_calls: Trial calls allowed at once while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """
+        Return the breaker guarding `endpoint`, or None if it is exempt.
+        """
+        if endpoint in EXEMPT_ENDPOINTS:
+            return None
+        family = endpoint_family(endpoint)
+        breaker = self.breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.get(family)
+                if breaker is None:
+                    breaker = self.breakers[family] = CircuitBreaker(
+                        family, self.failure_threshold, self.recovery_timeout,
+                        self.half_open_max_calls)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Return the current state of every family seen so far"""
+        return {family: breaker.state for family, breaker in self.breakers.items()}
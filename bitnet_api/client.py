@@ -1,27 +1,81 @@
-import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union, Any
+
 import requests
-from typing import Dict, List, Optional, Union, Any
 
 from .models import (
     HealthResponse, BrowserResponse, BrowserListResponse, 
     GroupResponse, GroupListResponse, ProxyCheckResponse, 
-    BrowserPidResponse, GenericResponse, BrowserFingerPrint
+    BrowserPidResponse, GenericResponse, BrowserFingerPrint, Browser
+)
+from .batch import Batch, run_bounded
+from .bulk import BrowserTemplate, BulkCreator, BulkResult, ChunkedSender, CreateResult
+from .circuit import CircuitBreaker, CircuitBreakerRegistry
+from .codec import JSONCodec, make_codec
+from .endpoints import READ_ENDPOINTS
+from .exceptions import CircuitOpenError, DeadlineExceeded, ListChangedError
+from .limiter import AdaptiveLimit, ConcurrencyLimiter
+from .metrics import ClientMetrics
+from .paging import PagePrefetcher, fetch_all_pages
+from .retry import RetryPolicy
+from .scheduler import PriorityScheduler, priority, priority_for
+from .singleflight import SingleFlight
+from .timeouts import (
+    DEFAULT_TIMEOUT, SLOW_ENDPOINT_TIMEOUTS, Timeout, current_deadline, deadline, effective_timeout
 )
+from .streaming import BrowserStream
+from .transport import ResponseStream, Transport, build_path, make_transport, raise_for_status
+from .updates import UpdateReport, group_changes, group_proxies, send_groups
+from .writebehind import WriteBehindQueue
 
 
-class BitnetClient:
+class BaseBitnetClient:
     """
-    Client for interacting with the Bitnet Browser API
+    Endpoint definitions shared by the sync and async Bitnet API clients.
+    
+    Every API method builds its request payload and hands it to _call(),
+    which subclasses implement on top of their own transport. The async
+    client's _call() is a coroutine function, so the same methods return
+    awaitables there.
     """
     
-    def __init__(self, host: str = "127.0.0.1", port: int = 54345, token: Optional[str] = None):
-        """
-        Initialize the Bitnet API client.
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 54345,
+                 token: Optional[str] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 coalesce_reads: bool = True,
+                 concurrency_limiter: Optional[ConcurrencyLimiter] = None):
+        """
+        Initialize the settings shared by all clients.
         
         Args:
             host: API host address
             port: API port number
             token: Authentication token (if required)
+            retry_policy: Retry policy for failed requests; defaults to
+                RetryPolicy(). Use RetryPolicy(max_attempts=1) to disable retries.
+            circuit_breakers: Per-endpoint-family circuit breakers; defaults
+                to CircuitBreakerRegistry()
+            timeout: Default connect/read timeout, as a Timeout or a number of
+                seconds for both; defaults to DEFAULT_TIMEOUT
+            endpoint_timeouts: Per-endpoint timeouts, merged over the built-in
+                ones for slow endpoints such as browser/open and cache/clear
+            codec: JSON codec for request and response bodies: a JSONCodec,
+                "orjson" or "json"; defaults to orjson when it is installed
+            coalesce_reads: Share one round-trip among identical read requests
+                (same endpoint and body) that are in flight at the same time
+            concurrency_limiter: Adaptive per-endpoint limit on requests in
+                flight (AIMD), shared by every call made through the client;
+                None (the default) leaves concurrency unlimited
         """
         self.base_url = f"http://{host}:{port}"
         self.token = token
@@ -30,28 +84,117 @@ class BitnetClient:
         }
         if token:
             self.headers["Authorization"] = f"Bearer {token}"
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.metrics = ClientMetrics()
+        self.codec = make_codec(codec)
+        self.coalesce_reads = coalesce_reads
+        self.concurrency_limiter = concurrency_limiter
+        self.scheduler: Optional[PriorityScheduler] = None
+        self.timeout = DEFAULT_TIMEOUT if timeout is None else Timeout.coerce(timeout)
+        self.endpoint_timeouts = dict(SLOW_ENDPOINT_TIMEOUTS)
+        for endpoint, endpoint_timeout in (endpoint_timeouts or {}).items():
+            self.endpoint_timeouts[endpoint] = Timeout.coerce(endpoint_timeout)
+    
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """Return the configured connect/read timeout for `endpoint`"""
+        return self.endpoint_timeouts.get(endpoint, self.timeout)
     
-    def _make_request(self, endpoint: str, data: Dict = None) -> Dict:
+    def deadline(self, seconds: float):
         """
-        Make a POST request to the API.
+        Bound every request made inside a `with` block by one deadline.
+        
+        The deadline covers retries and every request of multi-call helpers,
+        and each request's timeouts are clamped to the time remaining. Calls
+        made after it has passed raise DeadlineExceeded.
+        
+            with client.deadline(30):
+                client.open_browser(id=browser_id)
+        
+        Args:
+            seconds: Time budget for the whole block
+        """
+        return deadline(seconds)
+    
+    def priority(self, name: str):
+        """
+        Send every request made inside a `with` block with priority `name`.
+        
+        When all connections are busy, waiting requests get the next free
+        connection by priority: "urgent", then "interactive", then "bulk".
+        Outside such a block close and health calls are urgent and all
+        other calls interactive.
+        
+            with client.priority("bulk"):
+                for browser_id in browser_ids:
+                    client.get_browser_detail(id=browser_id)
+        
+        Args:
+            name: "urgent", "interactive" or "bulk"
+        """
+        return priority(name)
+    
+    def _release_slots(self, limit: Optional[AdaptiveLimit], started: Optional[float],
+                       overloaded: Optional[bool] = None):
+        """
+        Give back the slots taken by _acquire_slots().
+        
+        Args:
+            limit: The endpoint's concurrency limit, if any
+            started: Value returned by _acquire_slots()
+            overloaded: How the request went, or None if it was never sent
+        """
+        if self.scheduler is not None:
+            self.scheduler.release()
+        if started is not None:
+            if overloaded is None:
+                limit.cancel(started)
+            else:
+                limit.release(started, overloaded=overloaded)
+    
+    def _coalesces(self, endpoint: str) -> bool:
+        """Whether identical in-flight calls to `endpoint` may share one response"""
+        return self.coalesce_reads and endpoint in READ_ENDPOINTS
+    
+    def _retry_delay(self, endpoint: str, data: Optional[Dict], error: Exception,
+                     attempt: int, elapsed: float) -> Optional[float]:
+        """
+        Ask the retry policy how long to wait before retrying a failed request.
+        
+        Returns:
+            Seconds to wait, or None if the error must be raised
+        
+        Raises:
+            DeadlineExceeded: If the current deadline cut the request short or
+                leaves no time for the retry
+        """
+        delay = self.retry_policy.next_delay(endpoint, data, error, attempt, elapsed)
+        active = current_deadline()
+        if active is not None:
+            remaining = active.remaining()
+            if ((delay is not None and delay >= remaining)
+                    or (remaining <= 0 and isinstance(error, requests.exceptions.Timeout))):
+                raise DeadlineExceeded(f"Deadline exceeded while calling {endpoint}") from error
+        return delay
+    
+    def _call(self, endpoint: str, response_cls, data: Dict = None):
+        """
+        Send a request and convert the response into `response_cls`.
         
         Args:
             endpoint: API endpoint (without leading slash)
+            response_cls: Response model with a from_dict() constructor
             data: Request data (will be converted to JSON)
             
         Returns:
-            Response data as dictionary
+            Instance of `response_cls`
         """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.post(url, headers=self.headers, json=data or {})
-        response.raise_for_status()
-        return response.json()
+        raise NotImplementedError
     
     # Health check API
     def health_check(self) -> HealthResponse:
         """Check if the API is running properly"""
-        response_data = self._make_request("health")
-        return HealthResponse.from_dict(response_data)
+        return self._call("health", HealthResponse)
     
     # Browser management APIs
     def create_or_update_browser(self, 
@@ -203,8 +346,7 @@ class BitnetClient:
         # 清除空值
         data = {k: v for k, v in data.items() if v is not None}
         
-        response_data = self._make_request("browser/update", data)
-        return BrowserResponse.from_dict(response_data)
+        return self._call("browser/update", BrowserResponse, data)
     
     def update_browser_partial(self, ids: List[str], **kwargs) -> GenericResponse:
         """
@@ -218,8 +360,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"ids": ids, **kwargs}
-        response_data = self._make_request("browser/update/partial", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/update/partial", GenericResponse, data)
     
     def browser_list(self, page: int = 0, page_size: int = 10, group_id: Optional[str] = None) -> BrowserListResponse:
         """
@@ -233,14 +374,17 @@ class BitnetClient:
         Returns:
             BrowserListResponse object with list of browsers
         """
+        return self._call("browser/list", BrowserListResponse, self._browser_list_data(page, page_size, group_id))
+    
+    @staticmethod
+    def _browser_list_data(page: int, page_size: int, group_id: Optional[str]) -> Dict:
         data = {
             "page": page,
             "pageSize": page_size
         }
         if group_id:
             data["groupId"] = group_id
-        response_data = self._make_request("browser/list", data)
-        return BrowserListResponse.from_dict(response_data)
+        return data
     
     def browser_list_concise(self, 
                             page: int = 0, 
@@ -265,8 +409,7 @@ class BitnetClient:
             "sortDirection": sort_direction,
             "sortProperties": sort_properties
         }
-        response_data = self._make_request("browser/list/concise", data)
-        return BrowserListResponse.from_dict(response_data)
+        return self._call("browser/list/concise", BrowserListResponse, data)
     
     def get_browser_pids(self, ids: List[str]) -> BrowserPidResponse:
         """
@@ -279,8 +422,7 @@ class BitnetClient:
             BrowserPidResponse object with PIDs
         """
         data = {"ids": ids}
-        response_data = self._make_request("browser/pids", data)
-        return BrowserPidResponse.from_dict(response_data)
+        return self._call("browser/pids", BrowserPidResponse, data)
     
     def get_browser_pids_alive(self, ids: List[str]) -> BrowserPidResponse:
         """
@@ -293,13 +435,11 @@ class BitnetClient:
             BrowserPidResponse object with alive status and PIDs
         """
         data = {"ids": ids}
-        response_data = self._make_request("browser/pids/alive", data)
-        return BrowserPidResponse.from_dict(response_data)
+        return self._call("browser/pids/alive", BrowserPidResponse, data)
     
     def get_all_browser_pids(self) -> BrowserPidResponse:
         """Get PIDs for all browser windows"""
-        response_data = self._make_request("browser/pids/all")
-        return BrowserPidResponse.from_dict(response_data)
+        return self._call("browser/pids/all", BrowserPidResponse)
     
     def open_browser(self, 
                        id: str, 
@@ -339,8 +479,7 @@ class BitnetClient:
         if new_page_url:
             data["newPageUrl"] = new_page_url
             
-        response_data = self._make_request("browser/open", data)
-        return BrowserResponse.from_dict(response_data)
+        return self._call("browser/open", BrowserResponse, data)
     
     def close_browser(self, id: str) -> GenericResponse:
         """
@@ -353,8 +492,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("browser/close", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/close", GenericResponse, data)
     
     def close_browsers_by_seqs(self, seqs: List[int]) -> GenericResponse:
         """
@@ -367,8 +505,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"seqs": seqs}
-        response_data = self._make_request("browser/close/byseqs", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/close/byseqs", GenericResponse, data)
     
     def delete_browser(self, id: str) -> GenericResponse:
         """
@@ -381,8 +518,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("browser/delete", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/delete", GenericResponse, data)
     
     def delete_browsers(self, ids: List[str]) -> GenericResponse:
         """
@@ -395,8 +531,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"ids": ids}
-        response_data = self._make_request("browser/delete/ids", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/delete/ids", GenericResponse, data)
     
     def get_browser_detail(self, id: str) -> BrowserResponse:
         """
@@ -409,8 +544,7 @@ class BitnetClient:
             BrowserResponse object with browser details
         """
         data = {"id": id}
-        response_data = self._make_request("browser/detail", data)
-        return BrowserResponse.from_dict(response_data)
+        return self._call("browser/detail", BrowserResponse, data)
     
     def reopen_browsers_at_pos(self, ids: List[str], all: bool = False) -> GenericResponse:
         """
@@ -424,13 +558,11 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"ids": ids, "all": all}
-        response_data = self._make_request("browser/reopenAtPos", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/reopenAtPos", GenericResponse, data)
     
     def get_browser_ports(self) -> BrowserPidResponse:
         """Get ports for all open browser windows"""
-        response_data = self._make_request("browser/ports")
-        return BrowserPidResponse.from_dict(response_data)
+        return self._call("browser/ports", BrowserPidResponse)
     
     def update_browser_group(self, group_id: str, browser_ids: List[str]) -> GenericResponse:
         """
@@ -447,8 +579,7 @@ class BitnetClient:
             "groupId": group_id,
             "browserIds": browser_ids
         }
-        response_data = self._make_request("browser/group/update", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/group/update", GenericResponse, data)
     
     def update_browser_remark(self, remark: str, browser_ids: List[str]) -> GenericResponse:
         """
@@ -465,8 +596,7 @@ class BitnetClient:
             "remark": remark,
             "browserIds": browser_ids
         }
-        response_data = self._make_request("browser/remark/update", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/remark/update", GenericResponse, data)
     
     def update_browser_proxy(self, 
                             ids: List[str], 
@@ -503,8 +633,7 @@ class BitnetClient:
             "proxyPassword": proxy_password,
             **kwargs
         }
-        response_data = self._make_request("browser/proxy/update", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/proxy/update", GenericResponse, data)
     
     # Group management APIs
     def add_group(self, group_name: str, sort_num: int = 0) -> GroupResponse:
@@ -522,8 +651,7 @@ class BitnetClient:
             "groupName": group_name,
             "sortNum": sort_num
         }
-        response_data = self._make_request("group/add", data)
-        return GroupResponse.from_dict(response_data)
+        return self._call("group/add", GroupResponse, data)
     
     def edit_group(self, id: str, group_name: str, sort_num: int = 0) -> GroupResponse:
         """
@@ -542,8 +670,7 @@ class BitnetClient:
             "groupName": group_name,
             "sortNum": sort_num
         }
-        response_data = self._make_request("group/edit", data)
-        return GroupResponse.from_dict(response_data)
+        return self._call("group/edit", GroupResponse, data)
     
     def delete_group(self, id: str) -> GenericResponse:
         """
@@ -556,8 +683,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("group/delete", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("group/delete", GenericResponse, data)
     
     def get_group_detail(self, id: str) -> GroupResponse:
         """
@@ -570,8 +696,7 @@ class BitnetClient:
             GroupResponse object with group details
         """
         data = {"id": id}
-        response_data = self._make_request("group/detail", data)
-        return GroupResponse.from_dict(response_data)
+        return self._call("group/detail", GroupResponse, data)
     
     def get_group_list(self, 
                       page: int = 0, 
@@ -599,8 +724,7 @@ class BitnetClient:
             "sortDirection": sort_direction,
             "sortProperties": sort_properties
         }
-        response_data = self._make_request("group/list", data)
-        return GroupListResponse.from_dict(response_data)
+        return self._call("group/list", GroupListResponse, data)
     
     # Window management APIs
     def arrange_windows(self, 
@@ -647,8 +771,7 @@ class BitnetClient:
             "offsetY": offset_y,
             "seqlist": seq_list
         }
-        response_data = self._make_request("windowbounds", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("windowbounds", GenericResponse, data)
     
     def arrange_windows_flexable(self, seq_list: List[int] = None) -> GenericResponse:
         """
@@ -661,14 +784,12 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"seqlist": seq_list or []}
-        response_data = self._make_request("windowbounds/flexable", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("windowbounds/flexable", GenericResponse, data)
     
     # User information API
     def get_user_info(self) -> GenericResponse:
         """Get information about the current user"""
-        response_data = self._make_request("userInfo")
-        return GenericResponse.from_dict(response_data)
+        return self._call("userInfo", GenericResponse)
     
     # Proxy checking API
     def check_proxy(self, 
@@ -677,7 +798,7 @@ class BitnetClient:
                    proxy_type: str,
                    proxy_username: str = "",
                    proxy_password: str = "",
-                   id: str = "xxx") -> ProxyCheckResponse:
+                   id: Optional[str] = None) -> ProxyCheckResponse:
         """
         Test if a proxy is working properly.
         
@@ -687,11 +808,14 @@ class BitnetClient:
             proxy_type: Type of proxy (http, socks5, etc.)
             proxy_username: Proxy authentication username
             proxy_password: Proxy authentication password
-            id: An ID for the test
+            id: An ID for the test; a unique one is generated when omitted,
+                so concurrent checks can be told apart
             
         Returns:
             ProxyCheckResponse object with proxy test results
         """
+        if id is None:
+            id = uuid.uuid4().hex
         data = {
             "host": host,
             "port": port,
@@ -700,8 +824,7 @@ class BitnetClient:
             "proxyPassword": proxy_password,
             "id": id
         }
-        response_data = self._make_request("checkagent", data)
-        return ProxyCheckResponse.from_dict(response_data)
+        return self._call("checkagent", ProxyCheckResponse, data)
         
     # 以下是根据文档新增的API方法
     
@@ -717,8 +840,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("browser/closing/reset", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/closing/reset", GenericResponse, data)
     
     def get_all_displays(self) -> GenericResponse:
         """
@@ -727,8 +849,7 @@ class BitnetClient:
         Returns:
             GenericResponse object with display information
         """
-        response_data = self._make_request("alldisplays")
-        return GenericResponse.from_dict(response_data)
+        return self._call("alldisplays", GenericResponse)
     
     def close_all_browsers(self) -> GenericResponse:
         """
@@ -737,8 +858,7 @@ class BitnetClient:
         Returns:
             GenericResponse object
         """
-        response_data = self._make_request("browser/close/all")
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/close/all", GenericResponse)
     
     def clear_browser_cache(self, ids: List[str]) -> GenericResponse:
         """
@@ -752,8 +872,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"ids": ids}
-        response_data = self._make_request("cache/clear", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("cache/clear", GenericResponse, data)
     
     def clear_browser_cache_except_extensions(self, ids: List[str]) -> GenericResponse:
         """
@@ -766,8 +885,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"ids": ids}
-        response_data = self._make_request("cache/clear/exceptExtensions", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("cache/clear/exceptExtensions", GenericResponse, data)
     
     def random_browser_fingerprint(self, browser_id: str) -> GenericResponse:
         """
@@ -780,8 +898,7 @@ class BitnetClient:
             GenericResponse object with fingerprint data
         """
         data = {"browserId": browser_id}
-        response_data = self._make_request("browser/fingerprint/random", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/fingerprint/random", GenericResponse, data)
     
     def set_browser_cookies(self, browser_id: str, cookies: List[Dict]) -> GenericResponse:
         """
@@ -798,8 +915,7 @@ class BitnetClient:
             "browserId": browser_id,
             "cookies": cookies
         }
-        response_data = self._make_request("browser/cookies/set", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/cookies/set", GenericResponse, data)
     
     def clear_browser_cookies(self, browser_id: str, save_synced: bool = True) -> GenericResponse:
         """
@@ -816,8 +932,7 @@ class BitnetClient:
             "browserId": browser_id,
             "saveSynced": save_synced
         }
-        response_data = self._make_request("browser/cookies/clear", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/cookies/clear", GenericResponse, data)
     
     def get_browser_cookies(self, browser_id: str) -> GenericResponse:
         """
@@ -830,8 +945,7 @@ class BitnetClient:
             GenericResponse object with cookie data
         """
         data = {"browserId": browser_id}
-        response_data = self._make_request("browser/cookies/get", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/cookies/get", GenericResponse, data)
     
     def format_cookies(self, cookie: Any, hostname: str) -> GenericResponse:
         """
@@ -848,8 +962,7 @@ class BitnetClient:
             "cookie": cookie,
             "hostname": hostname
         }
-        response_data = self._make_request("browser/cookies/format", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("browser/cookies/format", GenericResponse, data)
     
     def run_rpa_task(self, id: str) -> GenericResponse:
         """
@@ -862,8 +975,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("rpa/run", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("rpa/run", GenericResponse, data)
     
     def stop_rpa_task(self, id: str) -> GenericResponse:
         """
@@ -876,8 +988,7 @@ class BitnetClient:
             GenericResponse object
         """
         data = {"id": id}
-        response_data = self._make_request("rpa/stop", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("rpa/stop", GenericResponse, data)
     
     def auto_paste(self, browser_id: str, url: str) -> GenericResponse:
         """
@@ -894,8 +1005,7 @@ class BitnetClient:
             "browserId": browser_id,
             "url": url
         }
-        response_data = self._make_request("autopaste", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("autopaste", GenericResponse, data)
     
     def read_excel_file(self, filepath: str) -> GenericResponse:
         """
@@ -908,8 +1018,7 @@ class BitnetClient:
             GenericResponse object with file content
         """
         data = {"filepath": filepath}
-        response_data = self._make_request("utils/readexcel", data)
-        return GenericResponse.from_dict(response_data)
+        return self._call("utils/readexcel", GenericResponse, data)
     
     def read_text_file(self, filepath: str) -> GenericResponse:
         """
@@ -922,5 +1031,695 @@ class BitnetClient:
             GenericResponse object with file content
         """
         data = {"filepath": filepath}
-        response_data = self._make_request("utils/readfile", data)
-        return GenericResponse.from_dict(response_data) 
\ No newline at end of file
+        return self._call("utils/readfile", GenericResponse, data)
+
+
+class BitnetClient(BaseBitnetClient):
+    """
+    Client for interacting with the Bitnet Browser API
+    """
+    
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 54345,
+                 token: Optional[str] = None,
+                 pool_connections: int = 1,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 transport: Union[str, Transport] = "http",
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 timeout: Union[None, float, Timeout] = None,
+                 endpoint_timeouts: Optional[Dict[str, Union[float, Timeout]]] = None,
+                 codec: Union[None, str, JSONCodec] = None,
+                 coalesce_reads: bool = True,
+                 concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+                 priority_scheduling: bool = False,
+                 write_behind: Optional[float] = None,
+                 write_behind_max_ids: int = 1000):
+        """
+        Initialize the Bitnet API client.
+        
+        The client keeps a persistent keep-alive connection pool, so repeated
+        calls reuse TCP connections instead of opening a new one per request.
+        Call close() (or use the client as a context manager) to release it.
+        
+        Args:
+            host: API host address
+            port: API port number
+            token: Authentication token (if required)
+            pool_connections: Number of per-host connection pools to cache
+                (requests transport only)
+            pool_maxsize: Maximum number of connections kept open per host
+            pool_block: Block when all pooled connections are in use instead of
+                opening an extra, non-pooled connection
+            transport: HTTP backend, either "http" (lean http.client pool, the
+                default), "requests" (requests.Session, for compatibility) or
+                a custom Transport instance
+            retry_policy: Retry policy for failed requests; defaults to
+                RetryPolicy(). Use RetryPolicy(max_attempts=1) to disable retries.
+            circuit_breakers: Per-endpoint-family circuit breakers; defaults
+                to CircuitBreakerRegistry()
+            timeout: Default connect/read timeout, as a Timeout or a number of
+                seconds for both; defaults to DEFAULT_TIMEOUT
+            endpoint_timeouts: Per-endpoint timeouts, merged over the built-in
+                ones for slow endpoints such as browser/open and cache/clear
+            codec: JSON codec for request and response bodies: a JSONCodec,
+                "orjson" or "json"; defaults to orjson when it is installed
+            coalesce_reads: Share one round-trip among identical read requests
+                (same endpoint and body) that are in flight at the same time
+            concurrency_limiter: Adaptive per-endpoint limit on requests in
+                flight (AIMD), shared by every call made through the client;
+                None (the default) leaves concurrency unlimited
+            priority_scheduling: Queue requests for pool_maxsize slots by
+                priority, so urgent calls such as close_browser() overtake
+                bulk traffic. This caps the requests in flight at
+                pool_maxsize whatever pool_block says, including those of
+                helpers run with a higher concurrency (batches, ProxyChecker,
+                FleetLauncher); a streamed response holds its slot until it
+                is closed. Off by default
+            write_behind: Buffer update_browser_remark() and
+                update_browser_group() calls for this many seconds and send
+                them merged by value; those methods then return a Future.
+                None (the default) sends every call immediately
+            write_behind_max_ids: Number of buffered browser writes that
+                triggers an early flush, and the most ids per merged request
+        """
+        super().__init__(host=host, port=port, token=token, retry_policy=retry_policy,
+                         circuit_breakers=circuit_breakers, timeout=timeout,
+                         endpoint_timeouts=endpoint_timeouts, codec=codec,
+                         coalesce_reads=coalesce_reads, concurrency_limiter=concurrency_limiter)
+        if priority_scheduling:
+            self.scheduler = PriorityScheduler(pool_maxsize, self.metrics)
+        self._inflight = SingleFlight()
+        self._local = threading.local()
+        self.pool_maxsize = pool_maxsize
+        self.transport = make_transport(transport, host, port,
+                                        pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block)
+        # Browser id to seq, learned from browser detail, list and open responses
+        self._seqs: Dict[str, int] = {}
+        self._seqs_lock = threading.Lock()
+        self._listeners: List[Callable[[str, Optional[Dict], Any], None]] = []
+        self.write_behind: Optional[WriteBehindQueue] = None
+        if write_behind is not None:
+            self.write_behind = WriteBehindQueue(self, window=write_behind, max_ids=write_behind_max_ids)
+    
+    def close(self):
+        """Send any buffered writes and close all pooled connections held by the client"""
+        if self.write_behind is not None:
+            self.write_behind.close()
+        self.transport.close()
+    
+    def __enter__(self) -> 'BitnetClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def add_listener(self, listener: Callable[[str, Optional[Dict], Any], None]):
+        """
+        Call `listener(endpoint, data, response)` after every API call made through the client.
+        
+        Listeners see the request data and the parsed response of each
+        call, before write-behind values are applied to it, and run on the
+        thread that made the call. FleetMirror uses this to follow the
+        client's own writes.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Optional[Dict], Any], None]):
+        """Stop calling a listener added with add_listener()"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    @contextmanager
+    def batch(self, max_workers: Optional[int] = None) -> Iterator[Batch]:
+        """
+        Queue the calls made inside a `with` block and run them concurrently.
+        
+        Inside the block every client method returns a
+        concurrent.futures.Future instead of blocking. On exit the queued
+        calls run on a bounded worker pool, and the block only returns once
+        all of them have finished. A failed call sets the exception on its
+        future without affecting the others. If the block itself raises,
+        the queued calls are cancelled instead. With write-behind enabled,
+        remark and group updates made in the block are sent when it exits
+        and are included in results().
+        
+            with client.batch() as batch:
+                for browser_id in browser_ids:
+                    client.open_browser(id=browser_id)
+            responses = batch.results()
+        
+        Only calls made from the thread that opened the batch are queued.
+        
+        Args:
+            max_workers: Maximum number of calls run at once; defaults to
+                the connection pool size
+            
+        Returns:
+            Batch whose results() lists each call's response or exception
+            in call order
+        """
+        if getattr(self._local, "batch", None) is not None:
+            raise RuntimeError("client.batch() blocks cannot be nested")
+        batch = Batch(max_workers or self.pool_maxsize)
+        self._local.batch = batch
+        try:
+            yield batch
+        except BaseException:
+            batch.cancel()
+            raise
+        finally:
+            self._local.batch = None
+        batch.run()
+        if self.write_behind is not None and not all(future.done() for future in batch.futures):
+            # Write-behind updates made in the block are part of it too
+            self.write_behind.flush()
+
+    def update_browser_group(self, group_id: str, browser_ids: List[str]) -> Union[GenericResponse, Future]:
+        """
+        Move browsers to a different group.
+        
+        With write-behind enabled the move is buffered and sent together
+        with other moves to the same group, and a Future of the response
+        is returned.
+        
+        Args:
+            group_id: Target group ID
+            browser_ids: List of browser IDs to move
+            
+        Returns:
+            GenericResponse object, or a Future of it with write-behind
+        """
+        if self.write_behind is not None:
+            return self._write_behind("group_id", group_id, browser_ids)
+        return super().update_browser_group(group_id, browser_ids)
+
+    def update_browser_remark(self, remark: str, browser_ids: List[str]) -> Union[GenericResponse, Future]:
+        """
+        Update remarks for browsers.
+        
+        With write-behind enabled the update is buffered and sent together
+        with other updates to the same remark, and a Future of the response
+        is returned.
+        
+        Args:
+            remark: New remark text
+            browser_ids: List of browser IDs to update
+            
+        Returns:
+            GenericResponse object, or a Future of it with write-behind
+        """
+        if self.write_behind is not None:
+            return self._write_behind("remark", remark, browser_ids)
+        return super().update_browser_remark(remark, browser_ids)
+
+    def _write_behind(self, name: str, value: Any, browser_ids: List[str]) -> Future:
+        future = self.write_behind.submit(name, value, browser_ids)
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            batch.add(future)
+        return future
+
+    def browser_list(self, page: int = 0, page_size: int = 10, group_id: Optional[str] = None,
+                     stream: bool = False) -> Union[BrowserListResponse, BrowserStream]:
+        """
+        Get a list of browser windows.
+        
+        Args:
+            page: Page number (0-based)
+            page_size: Number of items per page
+            group_id: Filter by group ID
+            stream: Parse the page incrementally as it is read from the
+                socket and return a BrowserStream that yields Browser
+                objects, so memory stays flat whatever the page size
+            
+        Returns:
+            BrowserListResponse object with list of browsers, or a
+            BrowserStream when `stream` is True
+        """
+        if stream:
+            return self._stream("browser/list", self._browser_list_data(page, page_size, group_id))
+        return super().browser_list(page=page, page_size=page_size, group_id=group_id)
+
+    def iter_browsers(self, group_id: Optional[str] = None, page_size: int = 100) -> Iterator[Browser]:
+        """
+        Iterate over every browser window, page by page.
+
+        The next page is fetched in the background while the caller works
+        through the current one.
+
+        Args:
+            group_id: Only list browsers of this group
+            page_size: Number of browsers fetched per call
+
+        Returns:
+            Iterator of Browser objects in list order
+
+        Raises:
+            APIError: If the API fails to list a page
+        """
+        pages = PagePrefetcher(lambda page: self.browser_list(page=page, page_size=page_size,
+                                                              group_id=group_id), page_size)
+        for response in pages:
+            yield from response.content
+
+    def list_all_browsers(self, group_id: Optional[str] = None, page_size: int = 100,
+                          parallelism: Optional[int] = None, attempts: int = 3) -> List[Browser]:
+        """
+        List every browser window, fetching the pages concurrently.
+
+        The first page gives the page count; the remaining pages are then
+        fetched `parallelism` at a time. If the list changes between page
+        fetches (browsers created or deleted meanwhile), the listing is
+        started over, up to `attempts` times in all.
+
+        Args:
+            group_id: Only list browsers of this group
+            page_size: Number of browsers fetched per call
+            parallelism: Maximum number of pages fetched at once; defaults
+                to the connection pool size
+            attempts: Number of times to try for a consistent listing
+
+        Returns:
+            List of Browser objects sorted by seq
+
+        Raises:
+            APIError: If the API fails to list a page
+            ListChangedError: If the list kept changing on every attempt
+        """
+        fetch = lambda page: self.browser_list(page=page, page_size=page_size, group_id=group_id)
+        for attempt in range(1, attempts + 1):
+            try:
+                pages = fetch_all_pages(fetch, parallelism or self.pool_maxsize)
+                break
+            except ListChangedError:
+                if attempt >= attempts:
+                    raise
+        browsers = [browser for response in pages for browser in response.content]
+        browsers.sort(key=lambda browser: (browser.seq is None, browser.seq or 0))
+        return browsers
+
+    def create_browsers(self, template: BrowserTemplate, profiles: Iterable[Dict[str, Any]],
+                        concurrency: Optional[int] = None, rate: Optional[float] = None) -> Iterator[CreateResult]:
+        """
+        Create many profiles that share most of their settings.
+        
+        The template is serialized once; each profile only adds its own
+        fields (name, remark, proxy, platform credentials...). Creates run
+        `concurrency` at a time and start at most `rate` per second.
+        
+            template = BrowserTemplate(group_id=group_id, browser_fingerprint=fingerprint)
+            rows = ({"name": name, "host": host, "port": port} for name, host, port in read_csv())
+            for result in client.create_browsers(template, rows, rate=20):
+                print(result.index, result.id)
+        
+        Args:
+            template: Settings shared by every profile
+            profiles: create_or_update_browser() arguments per profile, read
+                lazily
+            concurrency: Maximum number of creates in flight; defaults to
+                the connection pool size
+            rate: Maximum creates started per second; None for no limit
+            
+        Returns:
+            Iterator of CreateResult in completion order, with the created
+            browser's id
+        """
+        return BulkCreator(self, template, concurrency=concurrency, rate=rate).create(profiles)
+
+    def delete_browsers_chunked(self, ids: List[str], chunk_size: int = 100, max_chunk_size: int = 1000,
+                                concurrency: int = 4, target_latency: float = 2.0) -> BulkResult:
+        """
+        Delete any number of browser windows in adaptive, concurrent chunks.
+        
+        Chunk sizes follow the server's latency, and a failed chunk is
+        bisected until the failing ids are isolated, so one bad id does not
+        fail the ids sent with it.
+        
+        Args:
+            ids: List of browser IDs
+            chunk_size: Size of the first chunks
+            max_chunk_size: Largest chunk size to grow to
+            concurrency: Maximum number of chunks in flight
+            target_latency: Seconds one chunk should take
+            
+        Returns:
+            BulkResult with one success bit per id, in the order of `ids`
+        """
+        sender = ChunkedSender(self.delete_browsers, chunk_size=chunk_size, max_chunk_size=max_chunk_size,
+                               concurrency=concurrency, target_latency=target_latency)
+        return sender.run(ids)
+
+    def close_browsers_by_seqs_chunked(self, seqs: List[int], chunk_size: int = 100,
+                                       max_chunk_size: int = 1000, concurrency: int = 4,
+                                       target_latency: float = 2.0) -> BulkResult:
+        """
+        Close any number of browser windows by seq in adaptive, concurrent chunks.
+        
+        Works like delete_browsers_chunked().
+        
+        Args:
+            seqs: List of sequence numbers
+            chunk_size: Size of the first chunks
+            max_chunk_size: Largest chunk size to grow to
+            concurrency: Maximum number of chunks in flight
+            target_latency: Seconds one chunk should take
+            
+        Returns:
+            BulkResult with one success bit per seq, in the order of `seqs`
+        """
+        sender = ChunkedSender(self.close_browsers_by_seqs, chunk_size=chunk_size,
+                               max_chunk_size=max_chunk_size, concurrency=concurrency,
+                               target_latency=target_latency)
+        return sender.run(seqs)
+
+    def close_browsers(self, ids: List[str], chunk_size: int = 100, max_chunk_size: int = 1000,
+                       concurrency: int = 4) -> BulkResult:
+        """
+        Close many browser windows by id with as few calls as possible.
+        
+        The client remembers the seq of every browser it has seen in a
+        detail, list, create or open response. Browsers with a known seq
+        are closed through close_browsers_by_seqs_chunked(); the others,
+        and any whose by-seq close failed, are closed one at a time with
+        close_browser(), `concurrency` at a time.
+        
+            client.list_all_browsers()  # or open_browser() calls: learns the seqs
+            result = client.close_browsers(browser_ids)
+        
+        Args:
+            ids: Browser IDs to close
+            chunk_size: Size of the first by-seq chunks
+            max_chunk_size: Largest by-seq chunk size to grow to
+            concurrency: Maximum number of calls in flight
+            
+        Returns:
+            BulkResult with one success bit per id, in the order of `ids`
+        """
+        result = BulkResult(len(ids))
+        started = time.monotonic()
+        with self._seqs_lock:
+            known = [(index, self._seqs[browser_id]) for index, browser_id in enumerate(ids)
+                     if browser_id in self._seqs]
+        known_indices = {index for index, _ in known}
+        fallback = [index for index in range(len(ids)) if index not in known_indices]
+        if known:
+            by_seq = self.close_browsers_by_seqs_chunked([seq for _, seq in known], chunk_size=chunk_size,
+                                                         max_chunk_size=max_chunk_size, concurrency=concurrency)
+            result.requests += by_seq.requests
+            result.last_error = by_seq.last_error
+            for position, (index, _) in enumerate(known):
+                if by_seq.ok(position):
+                    result.mark(index, index + 1)
+                else:
+                    fallback.append(index)
+        
+        def close_one(index: int):
+            try:
+                response = self.close_browser(ids[index])
+            except requests.exceptions.RequestException as e:
+                return index, str(e) or type(e).__name__
+            return index, None if response.success else (response.msg or "request failed")
+        
+        for index, error in run_bounded(close_one, fallback, concurrency, thread_name_prefix="bitnet-close"):
+            result.requests += 1
+            if error is None:
+                result.mark(index, index + 1)
+            else:
+                result.last_error = error
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def apply_browser_changes(self, current: Iterable[Browser],
+                              desired: Mapping[str, Union[Browser, Dict[str, Any]]],
+                              concurrency: int = 4, max_ids_per_call: int = 1000) -> UpdateReport:
+        """
+        Bring browsers to a desired state with as few partial updates as possible.
+        
+        Each browser's desired fields are compared with its current state
+        and only the differing fields are kept. Browsers needing the same
+        change share one update_browser_partial() call, so thousands of
+        browsers moving to one new setting cost a handful of requests.
+        
+            report = client.apply_browser_changes(
+                current=client.iter_browsers(group_id=group_id),
+                desired={browser.id: {"remark": "warm", "mute_audio": True} for browser in batch})
+        
+        Args:
+            current: Current browsers, e.g. from iter_browsers(),
+                list_all_browsers() or get_browser_detail()
+            desired: Browser id to the wanted state, as a Browser or a dict
+                of Browser field names; unset fields are left alone
+            concurrency: Maximum number of update calls in flight
+            max_ids_per_call: Largest id list sent in one call
+            
+        Returns:
+            UpdateReport with request count, wall time and failed ids
+        """
+        groups, unchanged = group_changes(current, desired)
+        report = UpdateReport(browsers=len(desired), unchanged=unchanged)
+        calls = ((ids, lambda chunk, changes=changes: self.update_browser_partial(chunk, **changes))
+                 for changes, ids in groups.values())
+        return send_groups(calls, report, concurrency, max_ids_per_call)
+
+    def assign_proxies(self, assignments: Mapping[str, Dict[str, Any]], concurrency: int = 4,
+                       max_ids_per_call: int = 1000) -> UpdateReport:
+        """
+        Set each browser's proxy, with one call per distinct proxy configuration.
+        
+            report = client.assign_proxies({
+                browser_id: {"proxy_type": "socks5", "host": host, "port": port,
+                             "proxy_username": user, "proxy_password": password}
+                for browser_id, (host, port, user, password) in rotation.items()
+            })
+            print(report.requests, report.elapsed)
+        
+        Args:
+            assignments: Browser id to update_browser_proxy() arguments
+            concurrency: Maximum number of update calls in flight
+            max_ids_per_call: Largest id list sent in one call
+            
+        Returns:
+            UpdateReport with request count, wall time and failed ids
+        """
+        report = UpdateReport(browsers=len(assignments))
+        calls = ((ids, lambda chunk, config=config: self.update_browser_proxy(chunk, **config))
+                 for config, ids in group_proxies(assignments).values())
+        return send_groups(calls, report, concurrency, max_ids_per_call)
+
+    def iter_browsers_concise(self, page_size: int = 100, sort_direction: str = "desc",
+                              sort_properties: str = "seq") -> Iterator[Browser]:
+        """
+        Iterate over the concise list of every browser window, page by page.
+
+        Like iter_browsers(), the next page is fetched in the background.
+
+        Args:
+            page_size: Number of browsers fetched per call
+            sort_direction: Sort direction (asc or desc)
+            sort_properties: Property to sort by
+
+        Returns:
+            Iterator of Browser objects in list order
+
+        Raises:
+            APIError: If the API fails to list a page
+        """
+        pages = PagePrefetcher(lambda page: self.browser_list_concise(
+            page=page, page_size=page_size, sort_direction=sort_direction,
+            sort_properties=sort_properties), page_size)
+        for response in pages:
+            yield from response.content
+
+    def _make_request(self, endpoint: str, data: Dict = None, body: Optional[bytes] = None) -> Dict:
+        """
+        Make a POST request to the API.
+        
+        Transient failures are retried according to the client's retry policy.
+        Calls to an endpoint family whose circuit is open fail immediately
+        with CircuitOpenError. Each attempt uses the endpoint's timeouts,
+        clamped to the current deadline.
+        
+        Identical read requests made concurrently from several threads share
+        one round-trip and receive the same response dictionary.
+        
+        Args:
+            endpoint: API endpoint (without leading slash)
+            data: Request data (will be converted to JSON)
+            body: `data` already encoded, to send as is; `data` is then
+                only used to decide whether a failed request is retried
+            
+        Returns:
+            Response data as dictionary
+        """
+        if body is None:
+            body = self.codec.encode(data or {})
+        if not self._coalesces(endpoint):
+            return self._send(endpoint, data, body)
+        active = current_deadline()
+        result, shared = self._inflight.do((endpoint, body), lambda: self._send(endpoint, data, body),
+                                           timeout=active.remaining() if active else None)
+        if shared:
+            self.metrics.record_coalesced(endpoint)
+        return result
+    
+    def _acquire_slots(self, endpoint: str, limit: Optional[AdaptiveLimit]) -> Optional[float]:
+        """
+        Wait for the endpoint's concurrency limit, then for a connection.
+        
+        Returns:
+            Start time from the concurrency limit, to pass to _release_slots()
+        """
+        active = current_deadline()
+        started = limit.acquire(active.remaining() if active else None) if limit is not None else None
+        if self.scheduler is not None:
+            try:
+                self.scheduler.acquire(priority_for(endpoint), active.remaining() if active else None)
+            except BaseException:
+                if started is not None:
+                    limit.cancel(started)
+                raise
+        return started
+    
+    def _send(self, endpoint: str, data: Optional[Dict], body: bytes,
+              stream: bool = False) -> Union[Dict, ResponseStream]:
+        """
+        Send an encoded request, retrying it as the retry policy allows.
+        
+        With `stream`, the unread response body is returned once the
+        response headers have arrived.
+        """
+        path = build_path(endpoint)
+        breaker = self.circuit_breakers.get(endpoint)
+        limit = self.concurrency_limiter.get(endpoint) if self.concurrency_limiter else None
+        attempt = 0
+        first_failure = None
+        while True:
+            attempt += 1
+            effective_timeout(self.timeout_for(endpoint), endpoint)
+            started = self._acquire_slots(endpoint, limit)
+            try:
+                # Waiting for a slot may have used up part of the deadline
+                timeout = effective_timeout(self.timeout_for(endpoint), endpoint)
+                if breaker is not None:
+                    try:
+                        if breaker.acquire():
+                            self._probe_health(breaker)
+                    except CircuitOpenError:
+                        self.metrics.record_rejection(endpoint)
+                        raise
+            except BaseException:
+                self._release_slots(limit, started)
+                raise
+            try:
+                send = self.transport.stream if stream else self.transport.request
+                status, reason, content = send("POST", path, body, self.headers, timeout)
+                raise_for_status(status, reason, f"{self.base_url}{path}", content)
+            except requests.exceptions.RequestException as e:
+                transient = self.retry_policy.is_transient(e)
+                self._release_slots(limit, started, overloaded=transient)
+                if breaker is not None:
+                    if transient:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                now = time.monotonic()
+                if first_failure is None:
+                    first_failure = now
+                delay = None
+                try:
+                    delay = self._retry_delay(endpoint, data, e, attempt, now - first_failure)
+                finally:
+                    if delay is None:
+                        self.metrics.record_call(endpoint, error=True, retries=attempt - 1,
+                                                 retry_time=now - first_failure)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            except BaseException:
+                self._release_slots(limit, started)
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if stream:
+                    # The slots are held until the body has been read or the stream closed
+                    content = self._hold_slots(content, limit, started)
+                else:
+                    self._release_slots(limit, started, overloaded=False)
+                if breaker is not None:
+                    breaker.record_success()
+                break
+        retry_time = time.monotonic() - first_failure if first_failure is not None else 0.0
+        self.metrics.record_call(endpoint, retries=attempt - 1, retry_time=retry_time)
+        return content if stream else self.codec.decode(content)
+    
+    def _hold_slots(self, body: ResponseStream, limit: Optional[AdaptiveLimit],
+                    started: Optional[float]) -> ResponseStream:
+        """Wrap a streamed body so that the slots taken for it are released when it is"""
+        def release(complete: bool):
+            body.close()
+            self._release_slots(limit, started, overloaded=False)
+        
+        return ResponseStream(body, release)
+    
+    def _probe_health(self, breaker: CircuitBreaker):
+        """Probe the health endpoint on behalf of an open circuit"""
+        try:
+            timeout = effective_timeout(self.timeout_for("health"), "health")
+            status, reason, content = self.transport.request("POST", "/health", b"{}", self.headers,
+                                                             timeout)
+            raise_for_status(status, reason, f"{self.base_url}/health", content)
+        except requests.exceptions.RequestException as e:
+            breaker.probe_failed()
+            raise CircuitOpenError(f"Circuit for '{breaker.name}' endpoints is open, "
+                                   f"health probe failed: {e}") from e
+        except BaseException:
+            # Cancelled or interrupted: let the next caller probe
+            breaker.probe_failed()
+            raise
+        breaker.probe_succeeded()
+    
+    def _stream(self, endpoint: str, data: Dict = None) -> BrowserStream:
+        def observe(browsers: List[Browser]) -> List[Browser]:
+            # Streamed browsers go through the same hooks as a parsed response
+            return self._observe(endpoint, data, BrowserListResponse(success=True, content=browsers)).content
+        
+        return BrowserStream(self._send(endpoint, data, self.codec.encode(data or {}), stream=True), observe)
+    
+    def _call(self, endpoint: str, response_cls, data: Dict = None, body: Optional[bytes] = None):
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            return batch.submit(lambda: self._parse(endpoint, data, response_cls,
+                                                    self._make_request(endpoint, data, body)))
+        return self._parse(endpoint, data, response_cls, self._make_request(endpoint, data, body))
+    
+    def _parse(self, endpoint: str, data: Optional[Dict], response_cls, payload: Dict):
+        return self._observe(endpoint, data, response_cls.from_dict(payload))
+    
+    def _observe(self, endpoint: str, data: Optional[Dict], response):
+        """Feed a response to the seq map, the listeners and the write-behind overlay"""
+        self._learn_seqs(response)
+        for listener in list(self._listeners):
+            listener(endpoint, data, response)
+        if self.write_behind is not None:
+            # Read-your-writes: show buffered remark and group changes
+            response = self.write_behind.apply(response)
+        return response
+    
+    def _learn_seqs(self, response):
+        """Record the id -> seq pairs of the browsers in a detail or list response"""
+        if isinstance(response, BrowserResponse):
+            browsers = [response.data] if response.data is not None else []
+        elif isinstance(response, BrowserListResponse):
+            browsers = response.content or []
+        else:
+            return
+        seqs = {browser.id: browser.seq for browser in browsers if browser.id and browser.seq is not None}
+        if seqs:
+            with self._seqs_lock:
+                self._seqs.update(seqs)
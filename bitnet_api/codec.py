@@ -0,0 +1,87 @@
+"""
+JSON codecs for request and response bodies.
+
+Bodies are encoded straight to bytes and responses are parsed straight from
+the bytes read off the socket. When orjson is installed it is used by
+default; otherwise the standard library json module is used.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JSONCodec:
+    """Interface for encoding request bodies and decoding response bodies"""
+
+    name = "abstract"
+
+    def encode(self, obj: Any) -> bytes:
+        """Serialize `obj` to UTF-8 JSON bytes"""
+        raise NotImplementedError
+
+    def decode(self, content: bytes) -> Any:
+        """Parse UTF-8 JSON bytes"""
+        raise NotImplementedError
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Codec backed by the standard library json module"""
+
+    name = "json"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def decode(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson, which works on bytes natively"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed; install it with `pip install bitnet-api[fast]`")
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def decode(self, content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+CODECS = {
+    "json": StdlibJSONCodec,
+    "orjson": OrjsonCodec,
+}
+
+
+def make_codec(codec: Union[None, str, JSONCodec] = None) -> JSONCodec:
+    """
+    Resolve a client's `codec` argument into a JSONCodec instance.
+
+    Args:
+        codec: A JSONCodec instance, the name of a built-in codec ("orjson"
+            or "json"), or None to use orjson when it is installed and the
+            standard library otherwise
+
+    Returns:
+        JSONCodec instance
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        codec = "orjson" if orjson is not None else "json"
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {sorted(CODECS)}")
+    return CODECS[codec]()
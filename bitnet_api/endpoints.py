@@ -0,0 +1,116 @@
+"""
+Classification of Bitnet API endpoints.
+
+Resilience features need to know what an endpoint does: whether a request
+can be replayed safely after a failure, and so on. The tables live here so
+every feature classifies endpoints the same way.
+"""
+
+from typing import Dict, Optional
+
+# Endpoints that only read state
+READ_ENDPOINTS = frozenset([
+    "health",
+    "browser/list",
+    "browser/list/concise",
+    "browser/detail",
+    "browser/pids",
+    "browser/pids/alive",
+    "browser/pids/all",
+    "browser/ports",
+    "browser/cookies/get",
+    "browser/cookies/format",
+    "group/list",
+    "group/detail",
+    "userInfo",
+    "alldisplays",
+    "checkagent",
+])
+
+# Writes that leave the same state no matter how often they are applied
+IDEMPOTENT_WRITE_ENDPOINTS = frozenset([
+    "browser/update/partial",
+    "browser/remark/update",
+    "browser/group/update",
+    "browser/proxy/update",
+    "browser/close",
+    "browser/close/byseqs",
+    "browser/close/all",
+    "browser/closing/reset",
+    "group/edit",
+    "cache/clear",
+    "cache/clear/exceptExtensions",
+])
+
+# Control-plane calls that must not wait behind bulk traffic
+URGENT_ENDPOINTS = frozenset([
+    "health",
+    "browser/close",
+    "browser/close/byseqs",
+    "browser/close/all",
+    "browser/closing/reset",
+])
+
+
+# Endpoint families share one circuit breaker, so a stalled subsystem of the
+# desktop app sheds all calls that depend on it. Endpoints not listed here
+# form a family of their own.
+ENDPOINT_FAMILIES = {
+    "browser/open": "launch",
+    "browser/reopenAtPos": "launch",
+    "browser/close": "close",
+    "browser/close/byseqs": "close",
+    "browser/close/all": "close",
+    "browser/closing/reset": "close",
+    "browser/update": "profile",
+    "browser/update/partial": "profile",
+    "browser/remark/update": "profile",
+    "browser/group/update": "profile",
+    "browser/proxy/update": "profile",
+    "browser/delete": "profile",
+    "browser/delete/ids": "profile",
+    "browser/fingerprint/random": "profile",
+    "browser/list": "query",
+    "browser/list/concise": "query",
+    "browser/detail": "query",
+    "browser/pids": "process",
+    "browser/pids/alive": "process",
+    "browser/pids/all": "process",
+    "browser/ports": "process",
+    "browser/cookies/get": "cookies",
+    "browser/cookies/set": "cookies",
+    "browser/cookies/clear": "cookies",
+    "browser/cookies/format": "cookies",
+    "cache/clear": "cache",
+    "cache/clear/exceptExtensions": "cache",
+    "checkagent": "proxy",
+    "windowbounds": "windows",
+    "windowbounds/flexable": "windows",
+    "alldisplays": "windows",
+}
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Return the family an endpoint belongs to"""
+    return ENDPOINT_FAMILIES.get(endpoint, endpoint)
+
+
+def is_replayable(endpoint: str, data: Optional[Dict] = None) -> bool:
+    """
+    Whether a request may be sent again after an ambiguous failure.
+
+    `browser/update` is a full update when it carries an id, but creates a
+    new browser without one, so only the former is replayable.
+
+    Args:
+        endpoint: API endpoint (without leading slash)
+        data: Request data
+
+    Returns:
+        True if replaying the request cannot create duplicate side effects
+    """
+    if endpoint in READ_ENDPOINTS or endpoint in IDEMPOTENT_WRITE_ENDPOINTS:
+        return True
+    if endpoint == "browser/update":
+        return bool(data and data.get("id"))
+    return False
@@ -0,0 +1,24 @@
+"""
+Exceptions raised by the client itself rather than by the HTTP layer.
+
+They derive from `requests.exceptions.RequestException`, so existing
+`except RequestException` handlers keep catching every client failure.
+"""
+
+from requests.exceptions import RequestException, Timeout
+
+
+class CircuitOpenError(RequestException):
+    """Raised without contacting the server while an endpoint's circuit is open"""
+
+
+class DeadlineExceeded(Timeout):
+    """Raised when the deadline of the current operation has passed"""
+
+
+class APIError(RequestException):
+    """Raised by multi-call helpers when the API answers a call with success false"""
+
+
+class ListChangedError(APIError):
+    """Raised when a listing changed while its pages were being fetched"""
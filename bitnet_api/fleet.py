@@ -0,0 +1,201 @@
+"""
+Opening large sets of browser windows.
+
+FleetLauncher keeps a bounded number of `browser/open` calls in flight,
+pulls browser ids from the input only as slots free up, and yields each
+window's connection details as soon as it is ready, so a controller can
+start driving the first windows while the rest are still launching:
+
+    launcher = FleetLauncher(client, concurrency=8)
+    for result in launcher.launch(browser_ids):
+        if result.success:
+            connect(result.ws)
+    print(launcher.summary())
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+import requests
+
+from .batch import run_bounded
+from .exceptions import DeadlineExceeded
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from .client import BitnetClient
+
+
+@dataclass
+class LaunchSpec:
+    """One browser window to open"""
+    id: str
+    args: Optional[List[str]] = None
+    new_page_url: Optional[str] = None
+    ignore_default_urls: bool = False
+
+    @classmethod
+    def coerce(cls, spec: Union[str, Dict, 'LaunchSpec']) -> 'LaunchSpec':
+        """Accept a browser id, a dict of LaunchSpec fields or a LaunchSpec"""
+        if isinstance(spec, LaunchSpec):
+            return spec
+        if isinstance(spec, str):
+            return cls(id=spec)
+        return cls(**spec)
+
+
+@dataclass
+class LaunchResult:
+    """Outcome of opening one browser window"""
+    id: str
+    success: bool
+    ws: Optional[str] = None
+    http: Optional[str] = None
+    pid: Optional[int] = None
+    seq: Optional[int] = None
+    attempts: int = 0
+    latency: float = 0.0
+    msg: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class LaunchSummary:
+    """
+    Totals of one FleetLauncher.launch() run.
+
+    Latencies are of the successful open call alone; `throughput` is windows
+    opened per second of wall time.
+    """
+    launched: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    throughput: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    failures: Dict[str, str] = field(default_factory=dict)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile `q` (0-100) of already sorted `values`"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class FleetLauncher:
+    """Opens many browser windows with bounded concurrency and retries"""
+
+    def __init__(self, client: 'BitnetClient', concurrency: Optional[int] = None,
+                 max_attempts: int = 3, backoff: Optional[RetryPolicy] = None,
+                 queue: Optional[bool] = None):
+        """
+        Args:
+            client: Client the windows are opened through
+            concurrency: Maximum number of opens in flight; defaults to the
+                client's connection pool size
+            max_attempts: Attempts per window, including the first one
+            backoff: Supplies the delay before each retry; defaults to
+                RetryPolicy(backoff_base=0.5, backoff_max=5.0)
+            queue: Open in the app's queue mode; by default it is used
+                whenever more than one open is in flight, which is what the
+                mode exists for
+        """
+        self.client = client
+        self.concurrency = max(1, concurrency or client.pool_maxsize)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff or RetryPolicy(backoff_base=0.5, backoff_max=5.0)
+        self.queue = self.concurrency > 1 if queue is None else queue
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+        self._latencies: List[float] = []
+        self._failures: Dict[str, str] = {}
+        self._retries = 0
+
+    def launch(self, browsers: Iterable[Union[str, Dict, LaunchSpec]]) -> Iterator[LaunchResult]:
+        """
+        Open every browser in `browsers`, yielding results as windows come up.
+
+        The input is consumed lazily, at most `concurrency` items ahead of
+        the opens that have finished. Results arrive in completion order,
+        not input order. Stopping the iteration early lets the opens already
+        in flight finish but starts no new ones.
+
+        Args:
+            browsers: Browser ids, dicts of LaunchSpec fields, or LaunchSpecs
+
+        Returns:
+            Iterator of LaunchResult, one per browser
+        """
+        self._reset()
+        try:
+            yield from run_bounded(self._open, (LaunchSpec.coerce(spec) for spec in browsers),
+                                   self.concurrency, thread_name_prefix="bitnet-launch")
+        finally:
+            self._finished = time.monotonic()
+
+    def _open(self, spec: LaunchSpec) -> LaunchResult:
+        """Open one window, retrying failed attempts with backoff"""
+        result = LaunchResult(id=spec.id, success=False)
+        for attempt in range(1, self.max_attempts + 1):
+            result.attempts = attempt
+            started = time.monotonic()
+            try:
+                response = self.client.open_browser(id=spec.id, args=spec.args, queue=self.queue,
+                                                    ignore_default_urls=spec.ignore_default_urls,
+                                                    new_page_url=spec.new_page_url)
+            except DeadlineExceeded as e:
+                result.error, result.msg = e, str(e)
+                break
+            except requests.exceptions.RequestException as e:
+                result.error, result.msg = e, str(e)
+            else:
+                if response.success:
+                    result.success, result.error = True, None
+                    result.latency = time.monotonic() - started
+                    result.msg = response.msg
+                    if response.data is not None:
+                        result.ws = response.data.ws
+                        result.http = response.data.http
+                        result.pid = response.data.pid
+                        result.seq = response.data.seq
+                    break
+                result.error, result.msg = None, response.msg
+            if attempt < self.max_attempts:
+                time.sleep(self.backoff.backoff(attempt))
+        with self._lock:
+            self._retries += result.attempts - 1
+            if result.success:
+                self._latencies.append(result.latency)
+            else:
+                self._failures[spec.id] = result.msg or "unknown error"
+        return result
+
+    def summary(self) -> LaunchSummary:
+        """Return the totals of the current or last launch() run"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            failures = dict(self._failures)
+            retries = self._retries
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return LaunchSummary(
+            launched=len(latencies),
+            failed=len(failures),
+            retries=retries,
+            elapsed=elapsed,
+            throughput=len(latencies) / elapsed if elapsed > 0 else 0.0,
+            p50=percentile(latencies, 50),
+            p95=percentile(latencies, 95),
+            p99=percentile(latencies, 99),
+            failures=failures,
+        )
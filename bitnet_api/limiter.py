@@ -0,0 +1,233 @@
+"""
+Adaptive per-endpoint concurrency limits (AIMD).
+
+How many `browser/open` calls the desktop app can take at once depends on
+the host and on how many windows are already running, so no fixed number
+fits. Each endpoint gets a limit on requests in flight that adapts the way
+TCP congestion control does: while responses come back quickly and the
+limit is in use, every response grows it by 1/limit (additive increase);
+when latency climbs well above the fastest latency seen, or a request
+fails with a transient error, the limit is cut by a factor
+(multiplicative decrease).
+
+A cut is applied at most once per round: requests that were already in
+flight when the limit was cut cannot cut it again, so one burst of slow
+responses does not collapse the limit to its minimum.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Deque, Dict, Optional
+
+from .exceptions import DeadlineExceeded
+
+# Endpoints that are never limited; health is the circuit breakers' probe
+EXEMPT_ENDPOINTS = frozenset(["health"])
+
+
+class AdaptiveLimit:
+    """AIMD limit on the requests in flight to one endpoint"""
+
+    def __init__(self, name: str, initial_limit: float = 4, min_limit: int = 1, max_limit: int = 64,
+                 backoff_ratio: float = 0.5, latency_tolerance: float = 2.0, latency_floor: float = 0.05):
+        """
+        Args:
+            name: Endpoint name, used in error messages
+            initial_limit: Requests allowed in flight at first
+            min_limit: Lowest the limit can be cut to
+            max_limit: Highest the limit can grow to
+            backoff_ratio: Factor the limit is multiplied by on overload
+            latency_tolerance: A response slower than this multiple of the
+                baseline latency signals overload
+            latency_floor: Responses faster than this many seconds never
+                signal overload, whatever the baseline
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._async_waiters: Deque[asyncio.Future] = collections.deque()
+
+    def _try_acquire(self) -> Optional[float]:
+        """Take a slot if one is free; must be called with the lock held"""
+        if self.in_flight >= int(self.limit):
+            return None
+        self.in_flight += 1
+        return time.monotonic()
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Block until a request may be sent.
+
+        Args:
+            timeout: Longest time to wait for a slot
+
+        Returns:
+            Start time of the request, to pass to release()
+
+        Raises:
+            DeadlineExceeded: If `timeout` passes first
+        """
+        with self._available:
+            started = self._try_acquire()
+            if started is not None:
+                return started
+            end = None if timeout is None else time.monotonic() + timeout
+            while True:
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline exceeded waiting for a {self.name} slot")
+                self._available.wait(remaining)
+                started = self._try_acquire()
+                if started is not None:
+                    return started
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait on the event loop until a request may be sent.
+
+        Args:
+            timeout: Longest time to wait for a slot
+
+        Returns:
+            Start time of the request, to pass to release()
+
+        Raises:
+            DeadlineExceeded: If `timeout` passes first
+        """
+        loop = asyncio.get_running_loop()
+        end = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._lock:
+                started = self._try_acquire()
+                if started is not None:
+                    return started
+                waiter = loop.create_future()
+                self._async_waiters.append(waiter)
+            try:
+                remaining = None if end is None else end - loop.time()
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for a {self.name} slot") from None
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.done() and not waiter.cancelled():
+                        # Pass on the wake-up this waiter will not use
+                        self._wake_next_async()
+                raise
+            finally:
+                with self._lock:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    def release(self, started: float, overloaded: bool = False):
+        """
+        Free a slot and adapt the limit to how the request went.
+
+        Args:
+            started: Value returned by acquire()
+            overloaded: Whether the request failed in a way that signals
+                overload (timeouts, connection failures, 5xx)
+        """
+        now = time.monotonic()
+        latency = now - started
+        with self._available:
+            # Only grow a limit that is being used, not one the caller never reaches
+            saturated = self.in_flight * 2 >= self.limit
+            self.in_flight -= 1
+            if not overloaded:
+                overloaded = self._slow(latency)
+                self._observe(latency)
+            if overloaded:
+                if started >= self._last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._available.notify()
+            self._wake_next_async()
+
+    def cancel(self, started: float):
+        """Free a slot whose request was never sent, leaving the limit as is"""
+        with self._available:
+            self.in_flight -= 1
+            self._available.notify()
+            self._wake_next_async()
+
+    def _wake_next_async(self):
+        """Wake the oldest async waiter; must be called with the lock held"""
+        while self._async_waiters:
+            waiter = self._async_waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+                return
+
+    def _wake(self, waiter: asyncio.Future):
+        if waiter.done():
+            # Cancelled before the wake-up arrived: hand it to the next waiter
+            with self._lock:
+                self._wake_next_async()
+        else:
+            waiter.set_result(None)
+
+    def _slow(self, latency: float) -> bool:
+        return (self.baseline is not None and latency > self.latency_floor
+                and latency > self.baseline * self.latency_tolerance)
+
+    def _observe(self, latency: float):
+        """Track the no-load latency: follow drops at once, rises slowly"""
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += (latency - self.baseline) * 0.01
+
+
+class ConcurrencyLimiter:
+    """Creates and holds one AdaptiveLimit per endpoint"""
+
+    def __init__(self, initial_limit: float = 4, min_limit: int = 1, max_limit: int = 64,
+                 backoff_ratio: float = 0.5, latency_tolerance: float = 2.0, latency_floor: float = 0.05):
+        """
+        Args:
+            initial_limit: Requests allowed in flight per endpoint at first
+            min_limit: Lowest a limit can be cut to
+            max_limit: Highest a limit can grow to
+            backoff_ratio: Factor a limit is multiplied by on overload
+            latency_tolerance: A response slower than this multiple of the
+                endpoint's baseline latency signals overload
+            latency_floor: Responses faster than this many seconds never
+                signal overload
+        """
+        self.settings = dict(initial_limit=initial_limit, min_limit=min_limit, max_limit=max_limit,
+                             backoff_ratio=backoff_ratio, latency_tolerance=latency_tolerance,
+                             latency_floor=latency_floor)
+        self.endpoints: Dict[str, AdaptiveLimit] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> Optional[AdaptiveLimit]:
+        """
+        Return the limit for `endpoint`, or None if it is exempt.
+        """
+        if endpoint in EXEMPT_ENDPOINTS:
+            return None
+        limit = self.endpoints.get(endpoint)
+        if limit is None:
+            with self._lock:
+                limit = self.endpoints.get(endpoint)
+                if limit is None:
+                    limit = self.endpoints[endpoint] = AdaptiveLimit(endpoint, **self.settings)
+        return limit
+
+    def limits(self) -> Dict[str, int]:
+        """Return the current limit of every endpoint seen so far"""
+        return {endpoint: int(limit.limit) for endpoint, limit in self.endpoints.items()}
@@ -0,0 +1,150 @@
+"""
+Client-side request metrics.
+"""
+
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict
+
+
+@dataclass
+class EndpointStats:
+    """Counters for one endpoint"""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    retry_time: float = 0.0
+    rejected: int = 0
+    coalesced: int = 0
+
+
+@dataclass
+class PriorityStats:
+    """Dispatch counters for one priority class"""
+    queued: int = 0
+    peak_queued: int = 0
+    dispatched: int = 0
+    waited: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+    abandoned: int = 0
+
+
+class ClientMetrics:
+    """
+    Thread-safe request counters, kept per endpoint.
+
+    `retry_time` is the wall time calls spent recovering from failures:
+    backoff sleeps plus the attempts made after the first one. `coalesced`
+    counts calls answered by another caller's identical request in flight;
+    they are not counted in `calls`.
+
+    Requests dispatched by priority are also counted per priority class:
+    `queued` is the current queue depth, and `wait_time` the total time
+    requests spent queued for a connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.priorities: Dict[str, PriorityStats] = {}
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_call(self, endpoint: str, error: bool = False, retries: int = 0, retry_time: float = 0.0):
+        """
+        Record a finished call.
+
+        Args:
+            endpoint: API endpoint (without leading slash)
+            error: Whether the call ultimately failed
+            retries: Number of retries the call needed
+            retry_time: Seconds from the first failed attempt to the end of the call
+        """
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.retries += retries
+            stats.retry_time += retry_time
+
+    def record_rejection(self, endpoint: str):
+        """Record a call rejected by an open circuit breaker"""
+        with self._lock:
+            self._stats(endpoint).rejected += 1
+
+    def record_coalesced(self, endpoint: str):
+        """Record a call that shared the response of an identical request in flight"""
+        with self._lock:
+            self._stats(endpoint).coalesced += 1
+
+    def _priority_stats(self, priority: str) -> PriorityStats:
+        stats = self.priorities.get(priority)
+        if stats is None:
+            stats = self.priorities[priority] = PriorityStats()
+        return stats
+
+    def record_enqueue(self, priority: str):
+        """Record a request queued for a connection"""
+        with self._lock:
+            stats = self._priority_stats(priority)
+            stats.queued += 1
+            stats.peak_queued = max(stats.peak_queued, stats.queued)
+
+    def record_dispatch(self, priority: str, wait: float, queued: bool = False):
+        """
+        Record a request given a connection.
+
+        Args:
+            priority: Priority class of the request
+            wait: Seconds the request waited in the queue
+            queued: Whether the request had been queued
+        """
+        with self._lock:
+            stats = self._priority_stats(priority)
+            stats.dispatched += 1
+            if queued:
+                stats.queued -= 1
+                stats.waited += 1
+                stats.wait_time += wait
+                stats.max_wait = max(stats.max_wait, wait)
+
+    def record_abandon(self, priority: str):
+        """Record a queued request that gave up before getting a connection"""
+        with self._lock:
+            stats = self._priority_stats(priority)
+            stats.queued -= 1
+            stats.abandoned += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Return a point-in-time copy of all counters.
+
+        Returns:
+            Dictionary with totals, a per-endpoint breakdown and per-priority
+            dispatch counters
+        """
+        with self._lock:
+            endpoints = {name: asdict(stats) for name, stats in self.endpoints.items()}
+            priorities = {name: asdict(stats) for name, stats in self.priorities.items()}
+        totals = EndpointStats()
+        for stats in endpoints.values():
+            totals.calls += stats["calls"]
+            totals.errors += stats["errors"]
+            totals.retries += stats["retries"]
+            totals.retry_time += stats["retry_time"]
+            totals.rejected += stats["rejected"]
+            totals.coalesced += stats["coalesced"]
+        return {**asdict(totals), "endpoints": endpoints, "priorities": priorities}
+
+    def reset(self):
+        """Clear all counters, keeping the current queue depths"""
+        with self._lock:
+            self.endpoints = {}
+            self.priorities = {name: PriorityStats(queued=stats.queued, peak_queued=stats.queued)
+                               for name, stats in self.priorities.items()}
@@ -0,0 +1,351 @@
+"""
+An in-memory mirror of the account's browsers.
+
+Looking a browser up by name, seq, group or proxy host otherwise means
+paging through `browser/list`. FleetMirror keeps every Browser in memory
+with hash indexes on those keys, so lookups are dictionary hits:
+
+    mirror = FleetMirror(client, refresh_interval=60)
+    mirror.refresh()  # initial load
+    for browser in mirror.in_group(group_id):
+        ...
+    mirror.by_seq(42).name
+
+The mirror listens to the responses of its client: browsers created,
+updated, opened, closed or deleted through the client are reflected as soon
+as the call returns, and every list or detail response refreshes the
+browsers it contains. A background refresh (when `refresh_interval` is
+set) picks up changes made elsewhere, page by page, and drops browsers that
+no longer exist once it has a consistent listing. Groups are mirrored the
+same way.
+
+With a FleetStore the mirror starts from the records saved by the previous
+run, and the first background refresh reconciles them with the API right
+away.
+"""
+
+import threading
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Set
+
+import requests
+
+from .exceptions import ListChangedError
+from .models import Browser, Group
+from .paging import fetch_all_pages
+
+if TYPE_CHECKING:
+    from .client import BitnetClient
+    from .store import FleetStore
+
+# Fields that only describe a running window
+RUNTIME_KEYS = ("ws", "http", "pid")
+
+# Endpoints whose responses hold complete browser records
+FULL_RECORD_ENDPOINTS = {"browser/list", "browser/detail"}
+
+# Endpoints whose responses hold some fields of each browser
+PARTIAL_RECORD_ENDPOINTS = {"browser/list/concise", "browser/open"}
+
+# Endpoints whose responses hold one group
+GROUP_RECORD_ENDPOINTS = {"group/detail", "group/add", "group/edit"}
+
+# Endpoints that set the same fields on a list of browsers, and the request key of that list
+LISTED_UPDATE_ENDPOINTS = {
+    "browser/update/partial": "ids",
+    "browser/proxy/update": "ids",
+    "browser/remark/update": "browserIds",
+    "browser/group/update": "browserIds",
+}
+
+
+def _sort_key(browser: Browser):
+    return browser.seq is None, browser.seq or 0
+
+
+class FleetMirror:
+    """Browsers and groups of one account held in memory, indexed by id, seq, group, name and proxy host"""
+
+    def __init__(self, client: 'BitnetClient', refresh_interval: Optional[float] = None,
+                 page_size: int = 100, store: Optional['FleetStore'] = None, attempts: int = 3):
+        """
+        Args:
+            client: Client whose responses keep the mirror current
+            refresh_interval: Seconds between background refreshes; None
+                refreshes only when refresh() is called
+            page_size: Number of browsers fetched per page when refreshing
+            store: On-disk cache to load the records from and to save
+                every change to
+            attempts: Number of times a refresh lists the browsers (and the
+                groups) to get a consistent listing
+        """
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.store = store
+        self.attempts = max(1, attempts)
+        self.last_error: Optional[BaseException] = None
+        self._browsers: Dict[str, Browser] = {}
+        self._groups: Dict[str, Group] = {}
+        self._by_seq: Dict[int, str] = {}
+        self._by_group: Dict[str, Set[str]] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_host: Dict[str, Set[str]] = {}
+        # Ids seen since the current refresh started; None outside a refresh
+        self._seen: Optional[Set[str]] = None
+        self._seen_groups: Optional[Set[str]] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if store is not None:
+            browsers, groups = store.load()
+            for browser in browsers:
+                self._put(browser, persist=False)
+            self._groups.update((group.id, group) for group in groups)
+        client.add_listener(self._observe)
+        if refresh_interval is not None:
+            self._thread = threading.Thread(target=self._run, name="bitnet-mirror", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the background refresh and stop following the client"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.client.remove_listener(self._observe)
+        if self.store is not None:
+            self.store.flush()
+
+    def __enter__(self) -> 'FleetMirror':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._browsers)
+
+    def __contains__(self, browser_id: str) -> bool:
+        return browser_id in self._browsers
+
+    # Lookups
+
+    def get(self, browser_id: str) -> Optional[Browser]:
+        """Return the browser with this id, if known"""
+        return self._browsers.get(browser_id)
+
+    def by_seq(self, seq: int) -> Optional[Browser]:
+        """Return the browser with this seq, if known"""
+        with self._lock:
+            browser_id = self._by_seq.get(seq)
+            return self._browsers.get(browser_id) if browser_id is not None else None
+
+    def in_group(self, group_id: str) -> List[Browser]:
+        """Return the browsers of a group, sorted by seq"""
+        return self._lookup(self._by_group, group_id)
+
+    def named(self, name: str) -> List[Browser]:
+        """Return the browsers with this name, sorted by seq"""
+        return self._lookup(self._by_name, name)
+
+    def on_proxy_host(self, host: str) -> List[Browser]:
+        """Return the browsers whose proxy is on this host, sorted by seq"""
+        return self._lookup(self._by_host, host.lower())
+
+    def all(self) -> List[Browser]:
+        """Return every known browser, sorted by seq"""
+        with self._lock:
+            return sorted(self._browsers.values(), key=_sort_key)
+
+    def group(self, group_id: str) -> Optional[Group]:
+        """Return the group with this id, if known"""
+        return self._groups.get(group_id)
+
+    def groups(self) -> List[Group]:
+        """Return every known group, sorted by sort_num"""
+        with self._lock:
+            return sorted(self._groups.values(), key=lambda group: group.sort_num)
+
+    def _lookup(self, index: Dict[str, Set[str]], key: str) -> List[Browser]:
+        with self._lock:
+            return sorted((self._browsers[browser_id] for browser_id in index.get(key, ())), key=_sort_key)
+
+    # Refreshing
+
+    def refresh(self):
+        """
+        List every browser and group once, updating the mirror as pages arrive.
+
+        Browsers and groups that were not listed, and were not created
+        through the client meanwhile, are dropped once the listing is
+        complete. A listing that changed while its pages were fetched is
+        started over, and nothing is dropped unless one was consistent.
+
+        Raises:
+            APIError: If the API fails to list a page
+            ListChangedError: If the listing changed on every attempt
+        """
+        with self._refresh_lock:
+            with self._lock:
+                self._seen, self._seen_groups = set(), set()
+            try:
+                # The list responses reach the mirror through _observe()
+                self.client.list_all_browsers(page_size=self.page_size, attempts=self.attempts)
+                self._list_groups()
+                with self._lock:
+                    for browser_id in set(self._browsers) - self._seen:
+                        self._remove(browser_id)
+                    for group_id in set(self._groups) - self._seen_groups:
+                        self._remove_group(group_id)
+            finally:
+                with self._lock:
+                    self._seen = self._seen_groups = None
+
+    def _list_groups(self):
+        fetch = lambda page: self.client.get_group_list(page=page, page_size=self.page_size)
+        for attempt in range(1, self.attempts + 1):
+            try:
+                fetch_all_pages(fetch, self.client.pool_maxsize)
+                return
+            except ListChangedError:
+                if attempt >= self.attempts:
+                    raise
+
+    def _run(self):
+        # Records loaded from a store are reconciled right away
+        wait = 0 if self.store is not None else self.refresh_interval
+        while not self._stopped.wait(wait):
+            wait = self.refresh_interval
+            try:
+                self.refresh()
+                self.last_error = None
+            except requests.exceptions.RequestException as e:
+                # Keep serving the last known state until the API is back
+                self.last_error = e
+
+    # Following the client
+
+    def _observe(self, endpoint: str, data: Optional[Dict], response: Any):
+        """Apply one successful client call to the mirror"""
+        if not getattr(response, "success", False):
+            return
+        data = data or {}
+        with self._lock:
+            if endpoint in FULL_RECORD_ENDPOINTS or endpoint in PARTIAL_RECORD_ENDPOINTS:
+                browsers = response.content if endpoint.startswith("browser/list") else [response.data]
+                for browser in browsers or ():
+                    if browser is not None and browser.id:
+                        if endpoint in FULL_RECORD_ENDPOINTS:
+                            # A copy, so callers changing their response do not change the mirror
+                            browser = replace(browser)
+                            current = self._browsers.get(browser.id)
+                            if browser.browser_finger_print is None and current is not None:
+                                browser.browser_finger_print = current.browser_finger_print
+                            self._put(browser)
+                        else:
+                            self._merge(browser.id, browser.to_dict())
+            elif endpoint == "browser/update":
+                fields = dict(data)
+                if response.data is not None:
+                    fields.update(response.data.to_dict())
+                if fields.get("id"):
+                    self._merge(fields["id"], fields, create=True)
+            elif endpoint in LISTED_UPDATE_ENDPOINTS:
+                key = LISTED_UPDATE_ENDPOINTS[endpoint]
+                fields = {name: value for name, value in data.items() if name != key}
+                for browser_id in data.get(key, ()):
+                    self._merge(browser_id, fields)
+            elif endpoint == "browser/close":
+                self._clear_runtime([data.get("id")])
+            elif endpoint == "browser/close/byseqs":
+                self._clear_runtime([self._by_seq.get(seq) for seq in data.get("seqs", ())])
+            elif endpoint == "browser/close/all":
+                self._clear_runtime(list(self._browsers))
+            elif endpoint == "browser/delete":
+                self._remove(data.get("id"))
+            elif endpoint == "browser/delete/ids":
+                for browser_id in data.get("ids", ()):
+                    self._remove(browser_id)
+            elif endpoint == "group/list":
+                for group in response.content or ():
+                    self._put_group(group)
+            elif endpoint in GROUP_RECORD_ENDPOINTS:
+                if response.data is not None:
+                    self._put_group(response.data)
+            elif endpoint == "group/delete":
+                self._remove_group(data.get("id"))
+
+    def _merge(self, browser_id: str, fields: Mapping[str, Any], create: bool = False):
+        """Set API `fields` on a known browser (or a new one with `create`)"""
+        current = self._browsers.get(browser_id)
+        if current is None and not create:
+            return
+        record = current.to_dict() if current is not None else {}
+        record.update(fields)
+        record["id"] = browser_id
+        self._put(Browser.from_dict(record))
+
+    def _clear_runtime(self, browser_ids: Iterable[Optional[str]]):
+        for browser_id in browser_ids:
+            current = self._browsers.get(browser_id)
+            if current is not None:
+                record = current.to_dict()
+                for key in RUNTIME_KEYS:
+                    record.pop(key, None)
+                self._put(Browser.from_dict(record))
+
+    def _put(self, browser: Browser, persist: bool = True):
+        previous = self._browsers.get(browser.id)
+        self._remove(browser.id, forget=False)
+        self._browsers[browser.id] = browser
+        if persist and self.store is not None and browser != previous:
+            self.store.put_browser(browser, fingerprint_changed=previous is None or (
+                previous.browser_finger_print != browser.browser_finger_print))
+        if browser.seq is not None:
+            self._by_seq[browser.seq] = browser.id
+        for index, key in self._index_keys(browser):
+            index.setdefault(key, set()).add(browser.id)
+        if self._seen is not None:
+            self._seen.add(browser.id)
+
+    def _remove(self, browser_id: Optional[str], forget: bool = True):
+        browser = self._browsers.pop(browser_id, None) if browser_id else None
+        if browser is None:
+            return
+        if browser.seq is not None and self._by_seq.get(browser.seq) == browser_id:
+            del self._by_seq[browser.seq]
+        for index, key in self._index_keys(browser):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(browser_id)
+                if not ids:
+                    del index[key]
+        if forget:
+            if self._seen is not None:
+                self._seen.discard(browser_id)
+            if self.store is not None:
+                self.store.remove_browser(browser_id)
+
+    def _put_group(self, group: Group):
+        self._groups[group.id] = replace(group)
+        if self._seen_groups is not None:
+            self._seen_groups.add(group.id)
+        if self.store is not None:
+            self.store.put_group(group)
+
+    def _remove_group(self, group_id: Optional[str]):
+        if self._groups.pop(group_id, None) is None:
+            return
+        if self._seen_groups is not None:
+            self._seen_groups.discard(group_id)
+        if self.store is not None:
+            self.store.remove_group(group_id)
+
+    def _index_keys(self, browser: Browser):
+        if browser.group_id:
+            yield self._by_group, browser.group_id
+        if browser.name:
+            yield self._by_name, browser.name
+        if browser.host:
+            yield self._by_host, browser.host.lower()
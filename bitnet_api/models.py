@@ -431,6 +431,63 @@ class Browser:
             
             browser_finger_print=browser_finger_print
         )
+    
+    def to_dict(self) -> Dict:
+        """Convert to an API dictionary, the inverse of from_dict(); unset fields are left out"""
+        result = {
+            'id': self.id,
+            'name': self.name,
+            'remark': self.remark,
+            'seq': self.seq,
+            'groupId': self.group_id,
+            'ws': self.ws,
+            'http': self.http,
+            'coreVersion': self.core_version,
+            'pid': self.pid,
+            'driver': self.driver,
+            
+            # 代理设置
+            'proxyMethod': self.proxy_method,
+            'proxyType': self.proxy_type,
+            'host': self.host,
+            'port': self.port,
+            'proxyUserName': self.proxy_user_name,
+            'proxyPassword': self.proxy_password,
+            'refreshProxyUrl': self.refresh_proxy_url,
+            'isIpv6': self.is_ipv6,
+            'ipCheckService': self.ip_check_service,
+            'country': self.country,
+            'province': self.province,
+            'city': self.city,
+            
+            # 动态IP设置
+            'dynamicIpUrl': self.dynamic_ip_url,
+            'dynamicIpChannel': self.dynamic_ip_channel,
+            'isDynamicIpChangeIp': self.is_dynamic_ip_change_ip,
+            'duplicateCheck': self.duplicate_check,
+            
+            # 平台信息
+            'platform': self.platform,
+            'url': self.url,
+            'userName': self.user_name,
+            'password': self.password,
+            'isSynOpen': self.is_syn_open,
+            'faSecretKey': self.fa_secret_key,
+            'cookie': self.cookie,
+            
+            # 浏览器设置
+            'workbench': self.workbench,
+            'abortImage': self.abort_image,
+            'abortImageMaxSize': self.abort_image_max_size,
+            'abortMedia': self.abort_media,
+            'muteAudio': self.mute_audio,
+            'stopWhileNetError': self.stop_while_net_error,
+            'stopWhileIpChange': self.stop_while_ip_change,
+            'stopWhileCountryChange': self.stop_while_country_change,
+        }
+        if self.browser_finger_print is not None:
+            result['browserFingerPrint'] = self.browser_finger_print.to_dict()
+        return {key: value for key, value in result.items() if value is not None}
 
 
 @dataclass
@@ -448,6 +505,14 @@ class Group:
             group_name=data.get('groupName', ''),
             sort_num=data.get('sortNum', 0)
         )
+    
+    def to_dict(self) -> Dict:
+        """Convert to an API dictionary, the inverse of from_dict()"""
+        return {
+            'id': self.id,
+            'groupName': self.group_name,
+            'sortNum': self.sort_num
+        }
 
 
 @dataclass
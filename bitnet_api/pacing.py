@@ -0,0 +1,117 @@
+"""
+Request pacing with token buckets.
+
+Local browser APIs throttle clients that exceed a fixed request rate. A
+RequestPacer spaces calls out so they leave at the highest rate the server
+accepts: callers queue for a token instead of being rejected.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill at `rate` per second up to `burst`. Taking a token when
+    none is left puts the bucket into debt, and the caller is told how long
+    to wait for its turn. Waiters are therefore served in FIFO order at
+    exactly `rate` calls per second.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens that can accumulate
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self):
+        """Return a reserved token that was not used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def acquire(self):
+        """Block until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait on the event loop until a token is available"""
+        delay = self.reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund()
+                raise
+
+
+RateSetting = Union[float, Tuple[float, int]]
+
+
+class RequestPacer:
+    """
+    Per-endpoint request pacing.
+
+    Endpoints listed in `endpoint_rates` get a bucket of their own; all other
+    endpoints share the default bucket.
+    """
+
+    def __init__(self,
+                 rate: float = 2.0,
+                 burst: int = 1,
+                 endpoint_rates: Optional[Dict[str, RateSetting]] = None):
+        """
+        Args:
+            rate: Default requests per second shared by all endpoints
+            burst: Default number of requests that may be sent back to back
+            endpoint_rates: Overrides keyed by endpoint (without leading slash),
+                either a rate or a (rate, burst) tuple
+        """
+        self.default = TokenBucket(rate, burst)
+        self.buckets = {}
+        for endpoint, setting in (endpoint_rates or {}).items():
+            if isinstance(setting, tuple):
+                self.buckets[endpoint] = TokenBucket(*setting)
+            else:
+                self.buckets[endpoint] = TokenBucket(setting, burst)
+
+    def bucket_for(self, endpoint: str) -> TokenBucket:
+        """Return the bucket that paces `endpoint`"""
+        return self.buckets.get(endpoint, self.default)
+
+    def acquire(self, endpoint: str):
+        """Block until `endpoint` may be called"""
+        self.bucket_for(endpoint).acquire()
+
+    async def acquire_async(self, endpoint: str):
+        """Wait until `endpoint` may be called"""
+        await self.bucket_for(endpoint).acquire_async()
@@ -0,0 +1,131 @@
+"""
+Automatic paging over list endpoints.
+
+`browser/list` returns one page per call. PagePrefetcher walks every page
+and asks for page n+1 from a background thread while the caller is still
+working through page n, so a fleet walk takes about as long as the slower
+of fetching and processing instead of the two added together.
+
+When every page is needed at once, fetch_all_pages() reads the page count
+from the first page and fetches the remaining pages concurrently.
+"""
+
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+from .exceptions import APIError, ListChangedError
+from .models import PagedResult
+
+
+class PagePrefetcher:
+    """
+    Iterates over the pages of a list endpoint, one page ahead of the caller.
+
+        pages = PagePrefetcher(lambda page: client.browser_list(page=page, page_size=500))
+        for response in pages:
+            ...
+
+    Paging stops after the last page according to `page_info.total_pages`,
+    or at the first short or empty page when the response has no page info.
+    Stopping the iteration early cancels the prefetch if it has not started.
+    """
+
+    def __init__(self, fetch: Callable[[int], PagedResult], page_size: int, first_page: int = 0):
+        """
+        Args:
+            fetch: Returns the response for a page number
+            page_size: Page size `fetch` asks for, used to spot the last page
+            first_page: Page to start from (0-based)
+        """
+        self.fetch = fetch
+        self.page_size = page_size
+        self.first_page = first_page
+
+    def __iter__(self) -> Iterator[PagedResult]:
+        # Every page, the first included, is fetched on the worker so that
+        # calls made inside a client.batch() block are not queued
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bitnet-prefetch")
+        pending: Optional[Future] = None
+        try:
+            page = self.first_page
+            pending = self._submit(executor, page)
+            while pending is not None:
+                response = _checked(pending.result(), page)
+                pending = None
+                if self._has_next(response, page):
+                    pending = self._submit(executor, page + 1)
+                yield response
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+    def _submit(self, executor: ThreadPoolExecutor, page: int) -> Future:
+        # Run in the caller's context so its deadline and priority apply
+        return executor.submit(contextvars.copy_context().run, self.fetch, page)
+
+    def _has_next(self, response: PagedResult, page: int) -> bool:
+        if not response.content:
+            return False
+        if response.page_info is not None and response.page_info.total_pages:
+            return page + 1 < response.page_info.total_pages
+        return len(response.content) >= self.page_size
+
+
+def fetch_all_pages(fetch: Callable[[int], PagedResult], parallelism: int = 4) -> List[PagedResult]:
+    """
+    Fetch page 0, then every other page it announces, `parallelism` at a time.
+
+    The list can change while the pages are fetched: an insert or delete
+    shifts items across page boundaries, so an item may show up on two
+    pages or on none. Every page reports the total element count, and a
+    change in it, or an item id seen on two pages, is reported as
+    ListChangedError rather than returning an inconsistent listing.
+
+    Args:
+        fetch: Returns the response for a page number
+        parallelism: Maximum number of pages fetched at once
+
+    Returns:
+        Responses of every page, in page order
+
+    Raises:
+        APIError: If a page could not be listed
+        ListChangedError: If the list changed between page fetches
+    """
+    # Pages are fetched on workers, the first included, so that calls made
+    # inside a client.batch() block are not queued
+    with ThreadPoolExecutor(max_workers=max(1, parallelism), thread_name_prefix="bitnet-pages") as executor:
+        first = _checked(executor.submit(contextvars.copy_context().run, fetch, 0).result(), 0)
+        if first.page_info is None or first.page_info.total_pages <= 1:
+            return [first]
+        futures = [executor.submit(contextvars.copy_context().run, fetch, page)
+                   for page in range(1, first.page_info.total_pages)]
+        try:
+            pages = [first] + [_checked(future.result(), page) for page, future in enumerate(futures, 1)]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    total = first.page_info.total_elements
+    seen = set()
+    for page, response in enumerate(pages):
+        if response.page_info is not None and response.page_info.total_elements != total:
+            raise ListChangedError(f"List changed while paging: page 0 reported {total} items, "
+                                   f"page {page} {response.page_info.total_elements}")
+        for item in response.content:
+            item_id = getattr(item, "id", None)
+            if item_id is not None:
+                if item_id in seen:
+                    raise ListChangedError(f"List changed while paging: {item_id} appeared twice")
+                seen.add(item_id)
+    return pages
+
+
+def _checked(response: PagedResult, page: int) -> PagedResult:
+    if not response.success:
+        raise APIError(f"Listing page {page} failed: {response.msg}")
+    return response
@@ -0,0 +1,118 @@
+"""
+Retry policy with exponential backoff and jitter.
+"""
+
+import random
+from typing import Dict, Iterable, Optional
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from .endpoints import is_replayable
+from .exceptions import DeadlineExceeded
+
+
+def connection_not_established(error: BaseException) -> bool:
+    """
+    Whether `error` happened before the request could reach the server.
+
+    Such failures are safe to retry for any endpoint, because the server
+    never saw the request.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (ConnectionRefusedError, NewConnectionError)):
+            return True
+        if isinstance(error, MaxRetryError):
+            error = error.reason
+        else:
+            error = error.__cause__ or error.__context__
+    return False
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Connection failures and 5xx responses are retried, with exponential
+    backoff and full jitter, but only for requests that are safe to replay
+    (see endpoints.is_replayable). Requests that never reached the server
+    are retried for every endpoint. Each call may spend at most
+    `max_attempts` attempts and `budget` seconds on retries.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 backoff_base: float = 0.1,
+                 backoff_max: float = 2.0,
+                 jitter: bool = True,
+                 budget: float = 10.0,
+                 retry_statuses: Iterable[int] = (500, 502, 503, 504)):
+        """
+        Args:
+            max_attempts: Maximum attempts per call, including the first one;
+                1 disables retries
+            backoff_base: Delay before the first retry, doubled for each
+                further retry
+            backoff_max: Upper bound for a single backoff delay
+            jitter: Randomize each delay between 0 and its backoff value, so
+                concurrent callers do not retry in lockstep
+            budget: Maximum seconds a single call may spend retrying
+            retry_statuses: HTTP status codes treated as transient
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Delay before retry number `retry_number` (starting at 1).
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (retry_number - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def is_transient(self, error: BaseException) -> bool:
+        """Whether `error` may succeed if the request is sent again"""
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(error, (requests.exceptions.ConnectionError,
+                                  requests.exceptions.Timeout))
+
+    def next_delay(self,
+                   endpoint: str,
+                   data: Optional[Dict],
+                   error: BaseException,
+                   attempt: int,
+                   elapsed: float) -> Optional[float]:
+        """
+        Decide what to do after attempt number `attempt` failed.
+
+        Args:
+            endpoint: API endpoint (without leading slash)
+            data: Request data
+            error: Exception raised by the failed attempt
+            attempt: Number of attempts made so far
+            elapsed: Seconds spent retrying this call so far
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if attempt >= self.max_attempts or not self.is_transient(error):
+            return None
+        if not (is_replayable(endpoint, data) or connection_not_established(error)):
+            return None
+        delay = self.backoff(attempt)
+        if elapsed + delay > self.budget:
+            return None
+        return delay
@@ -0,0 +1,206 @@
+"""
+Priority dispatch of requests onto the connection pool.
+
+The local API is served by a small connection pool. When a bulk job keeps
+every connection busy, a `browser/close` or `health` call would otherwise
+wait behind hundreds of list and update calls. The scheduler hands free
+slots to waiting requests by priority class (urgent before interactive
+before bulk, FIFO within a class).
+
+Control-plane endpoints are urgent by default and everything else is
+interactive. A `priority()` block overrides the class of every call made
+inside it, so bulk jobs mark their traffic like this:
+
+    with client.priority(BULK):
+        for browser_id in browser_ids:
+            client.update_browser_partial(...)
+"""
+
+import asyncio
+import collections
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional
+
+from .endpoints import URGENT_ENDPOINTS
+from .exceptions import DeadlineExceeded
+from .metrics import ClientMetrics
+
+URGENT = "urgent"
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Highest priority first
+PRIORITIES = (URGENT, INTERACTIVE, BULK)
+
+_current_priority = contextvars.ContextVar("bitnet_priority", default=None)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """
+    Send every request made inside the block with priority class `name`.
+
+    Args:
+        name: URGENT, INTERACTIVE or BULK
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown priority {name!r}, expected one of {list(PRIORITIES)}")
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def priority_for(endpoint: str) -> str:
+    """Return the priority class a request to `endpoint` is sent with"""
+    name = _current_priority.get()
+    if name is not None:
+        return name
+    return URGENT if endpoint in URGENT_ENDPOINTS else INTERACTIVE
+
+
+class _Waiter:
+    """A request queued for a slot"""
+
+    __slots__ = ("priority", "enqueued", "granted", "event", "future")
+
+    def __init__(self, priority: str, event: Optional[threading.Event] = None,
+                 future: Optional[asyncio.Future] = None):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = event
+        self.future = future
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.future.get_loop().call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class PriorityScheduler:
+    """
+    Grants at most `slots` requests in flight, serving waiters by priority.
+
+    Works for threads and for coroutines; one scheduler should only be used
+    by one kind of client.
+    """
+
+    def __init__(self, slots: int, metrics: Optional[ClientMetrics] = None):
+        """
+        Args:
+            slots: Requests allowed in flight at once, normally the
+                connection pool size
+            metrics: Receives per-class queue depth and wait times
+        """
+        self.slots = max(1, slots)
+        self.metrics = metrics
+        self.in_flight = 0
+        self._queues: List[Deque[_Waiter]] = [collections.deque() for _ in PRIORITIES]
+        self._lock = threading.Lock()
+
+    def queued(self) -> dict:
+        """Return the number of requests waiting in each class"""
+        with self._lock:
+            return {name: len(queue) for name, queue in zip(PRIORITIES, self._queues)}
+
+    def _try_acquire(self, priority: str, waiter_factory) -> Optional[_Waiter]:
+        """Take a free slot, or queue a waiter; must be called with the lock held"""
+        if self.in_flight < self.slots:
+            self.in_flight += 1
+            if self.metrics is not None:
+                self.metrics.record_dispatch(priority, 0.0)
+            return None
+        waiter = waiter_factory()
+        self._queues[PRIORITIES.index(priority)].append(waiter)
+        if self.metrics is not None:
+            self.metrics.record_enqueue(priority)
+        return waiter
+
+    def _abandon(self, waiter: _Waiter):
+        """Withdraw a waiter that stopped waiting; must be called with the lock held"""
+        if waiter.granted:
+            # The slot arrived too late: pass it on
+            self._release_locked()
+            return
+        self._queues[PRIORITIES.index(waiter.priority)].remove(waiter)
+        if self.metrics is not None:
+            self.metrics.record_abandon(waiter.priority)
+
+    def acquire(self, priority: str, timeout: Optional[float] = None):
+        """
+        Block until the request may be sent.
+
+        Args:
+            priority: Priority class of the request
+            timeout: Longest time to wait for a slot
+
+        Raises:
+            DeadlineExceeded: If `timeout` passes first
+        """
+        with self._lock:
+            waiter = self._try_acquire(priority, lambda: _Waiter(priority, event=threading.Event()))
+        if waiter is None:
+            return
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            self._abandon(waiter)
+        raise DeadlineExceeded(f"Deadline exceeded waiting for a connection ({priority})")
+
+    async def acquire_async(self, priority: str, timeout: Optional[float] = None):
+        """
+        Wait on the event loop until the request may be sent.
+
+        Args:
+            priority: Priority class of the request
+            timeout: Longest time to wait for a slot
+
+        Raises:
+            DeadlineExceeded: If `timeout` passes first
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._try_acquire(priority, lambda: _Waiter(priority, future=loop.create_future()))
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if waiter.granted:
+                    return
+                self._abandon(waiter)
+            raise DeadlineExceeded(f"Deadline exceeded waiting for a connection ({priority})") from None
+        except asyncio.CancelledError:
+            with self._lock:
+                self._abandon(waiter)
+            raise
+
+    def release(self):
+        """Free a slot, handing it to the highest-priority waiter"""
+        with self._lock:
+            self._release_locked()
+
+    def _release_locked(self):
+        for queue in self._queues:
+            if queue:
+                waiter = queue.popleft()
+                waiter.granted = True
+                if self.metrics is not None:
+                    self.metrics.record_dispatch(waiter.priority, time.monotonic() - waiter.enqueued,
+                                                 queued=True)
+                waiter.wake()
+                return
+        self.in_flight -= 1
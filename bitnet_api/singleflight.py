@@ -0,0 +1,139 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+
+When several callers ask for the same thing at the same time, only the
+first one (the leader) sends a request; the others wait for its result and
+share it. Once the request finishes the key is forgotten, so later calls
+go to the server again: nothing is cached.
+
+A leader that failed because of its own deadline or cancellation says
+nothing about the request, so its waiters then make the call themselves.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .exceptions import DeadlineExceeded
+
+
+def _leader_only(error: BaseException) -> bool:
+    """Whether a leader's error comes from the leader itself rather than the request"""
+    return (isinstance(error, (DeadlineExceeded, asyncio.CancelledError, concurrent.futures.CancelledError))
+            or not isinstance(error, Exception))
+
+
+class _Flight:
+    """One in-flight call and its outcome"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls made from several threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run `fn`, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Makes the call; only run by the leader
+            timeout: Longest time a waiter waits for the leader
+
+        Returns:
+            Tuple of the result and whether it was shared from another caller
+
+        Raises:
+            DeadlineExceeded: If a waiter's timeout passes first
+        """
+        expires = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+            if leader:
+                try:
+                    flight.result = fn()
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+                return flight.result, False
+            if not flight.done.wait(None if expires is None else max(0.0, expires - time.monotonic())):
+                raise DeadlineExceeded("Deadline exceeded waiting for a shared request")
+            if flight.error is None:
+                return flight.result, True
+            if not _leader_only(flight.error):
+                raise flight.error
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical concurrent calls made from one event loop.
+
+    The shared call runs in a task of its own, so cancelling one caller
+    never cancels the request the others are waiting for.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Await `fn()`, or the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function making the call; only run by the leader
+            timeout: Longest time a waiter waits for the leader
+
+        Returns:
+            Tuple of the result and whether it was shared from another caller
+
+        Raises:
+            DeadlineExceeded: If a waiter's timeout passes first
+        """
+        loop = asyncio.get_running_loop()
+        expires = None if timeout is None else loop.time() + timeout
+        while True:
+            task = self._flights.get(key)
+            if task is None or task.done():
+                task = self._flights[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda done: self._finish(key, done))
+                return await asyncio.shield(task), False
+            try:
+                remaining = None if expires is None else max(0.0, expires - loop.time())
+                return await asyncio.wait_for(asyncio.shield(task), remaining), True
+            except BaseException as e:
+                if not task.done():
+                    # This waiter timed out or was cancelled
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise DeadlineExceeded("Deadline exceeded waiting for a shared request") from None
+                    raise
+                if not (task.cancelled() or _leader_only(e)):
+                    raise
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
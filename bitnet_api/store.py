@@ -0,0 +1,181 @@
+"""
+An on-disk cache of the account's browsers and groups.
+
+A controller that starts with an empty FleetMirror has to re-list the whole
+account before it can schedule anything. FleetStore keeps the mirror's
+Browser, BrowserFingerPrint and Group records in a SQLite file, written in
+the background as the mirror changes, so the next start loads them from
+disk and reconciles with the live API afterwards:
+
+    with FleetStore("fleet.db") as store, FleetMirror(client, store=store, refresh_interval=60) as mirror:
+        mirror.in_group(group_id)  # served from disk-loaded records right away
+
+Fingerprints, the bulk of a record, are kept in their own table and only
+rewritten when they change.
+"""
+
+import copy
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from .codec import JSONCodec, make_codec
+from .models import Browser, BrowserFingerPrint, Group
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS browsers (id TEXT PRIMARY KEY, record BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS fingerprints (browser_id TEXT PRIMARY KEY, record BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS groups (id TEXT PRIMARY KEY, record BLOB NOT NULL);
+"""
+
+
+class FleetStore:
+    """SQLite file holding Browser, BrowserFingerPrint and Group records, written behind"""
+
+    def __init__(self, path: str, flush_interval: float = 0.5, codec: Union[None, str, JSONCodec] = None):
+        """
+        Args:
+            path: SQLite database file; created when missing
+            flush_interval: Seconds changes are collected before they are
+                written in one transaction; a failed write is retried at the
+                next interval, and its error kept in `last_error`
+            codec: JSON codec for the stored records: a JSONCodec, "orjson"
+                or "json"; defaults to orjson when it is installed
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.codec = make_codec(codec)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        # Pending writes by id; None deletes the record
+        self._browsers: Dict[str, Optional[Browser]] = {}
+        self._fingerprints: Dict[str, Optional[Browser]] = {}
+        self._groups: Dict[str, Optional[Group]] = {}
+        self._lock = threading.Lock()
+        self.last_error: Optional[BaseException] = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bitnet-store", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'FleetStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def load(self) -> Tuple[List[Browser], List[Group]]:
+        """Read every stored browser, with its fingerprint, and every stored group"""
+        decode = self.codec.decode
+        with self._db_lock:
+            rows = self._db.execute("SELECT b.record, f.record FROM browsers b "
+                                    "LEFT JOIN fingerprints f ON f.browser_id = b.id").fetchall()
+            group_rows = self._db.execute("SELECT record FROM groups").fetchall()
+        # Profiles created from one template share their fingerprint; parse each distinct one once
+        parsed: Dict[bytes, BrowserFingerPrint] = {}
+        browsers = []
+        for record, fingerprint in rows:
+            browser = Browser.from_dict(decode(record))
+            if fingerprint is not None:
+                template = parsed.get(fingerprint)
+                if template is None:
+                    template = parsed[fingerprint] = BrowserFingerPrint.from_dict(decode(fingerprint))
+                browser.browser_finger_print = copy.copy(template)
+            browsers.append(browser)
+        return browsers, [Group.from_dict(decode(record)) for record, in group_rows]
+
+    def put_browser(self, browser: Browser, fingerprint_changed: bool = True):
+        """Queue a browser for writing; its fingerprint only when `fingerprint_changed`"""
+        with self._lock:
+            self._browsers[browser.id] = browser
+            if fingerprint_changed:
+                self._fingerprints[browser.id] = browser
+
+    def remove_browser(self, browser_id: str):
+        """Queue a browser and its fingerprint for deletion"""
+        with self._lock:
+            self._browsers[browser_id] = None
+            self._fingerprints[browser_id] = None
+
+    def put_group(self, group: Group):
+        """Queue a group for writing"""
+        with self._lock:
+            self._groups[group.id] = group
+
+    def remove_group(self, group_id: str):
+        """Queue a group for deletion"""
+        with self._lock:
+            self._groups[group_id] = None
+
+    def flush(self):
+        """
+        Write every queued change in one transaction.
+
+        Raises:
+            sqlite3.Error: If the write failed; the changes stay queued
+        """
+        # Flushes are serialized, so batches are committed in the order they were taken
+        with self._db_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            browsers, self._browsers = self._browsers, {}
+            fingerprints, self._fingerprints = self._fingerprints, {}
+            groups, self._groups = self._groups, {}
+        if not (browsers or fingerprints or groups):
+            return
+        try:
+            self._write(browsers, fingerprints, groups)
+        except BaseException:
+            # Queue the batch again, behind any change made since
+            with self._lock:
+                self._browsers = {**browsers, **self._browsers}
+                self._fingerprints = {**fingerprints, **self._fingerprints}
+                self._groups = {**groups, **self._groups}
+            raise
+
+    def _write(self, browsers: Dict[str, Optional[Browser]], fingerprints: Dict[str, Optional[Browser]],
+               groups: Dict[str, Optional[Group]]):
+        encode = self.codec.encode
+        browser_rows, fingerprint_rows = [], []
+        for browser_id, browser in browsers.items():
+            if browser is not None:
+                record = browser.to_dict()
+                record.pop("browserFingerPrint", None)
+                browser_rows.append((browser_id, encode(record)))
+        for browser_id, browser in fingerprints.items():
+            if browser is not None and browser.browser_finger_print is not None:
+                fingerprint_rows.append((browser_id, encode(browser.browser_finger_print.to_dict())))
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM browsers WHERE id = ?",
+                                 [(browser_id,) for browser_id, browser in browsers.items() if browser is None])
+            self._db.executemany("DELETE FROM fingerprints WHERE browser_id = ?",
+                                 [(browser_id,) for browser_id in fingerprints])
+            self._db.executemany("INSERT OR REPLACE INTO browsers VALUES (?, ?)", browser_rows)
+            self._db.executemany("INSERT INTO fingerprints VALUES (?, ?)", fingerprint_rows)
+            self._db.executemany("DELETE FROM groups WHERE id = ?",
+                                 [(group_id,) for group_id, group in groups.items() if group is None])
+            self._db.executemany("INSERT OR REPLACE INTO groups VALUES (?, ?)",
+                                 [(group_id, encode(group.to_dict()))
+                                  for group_id, group in groups.items() if group is not None])
+
+    def close(self):
+        """Write the queued changes and close the database"""
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+        with self._db_lock:
+            self._db.close()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+                self.last_error = None
+            except sqlite3.Error as e:
+                # The changes stay queued for the next interval
+                self.last_error = e
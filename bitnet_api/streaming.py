@@ -0,0 +1,251 @@
+"""
+Incremental parsing of large list responses.
+
+A `browser/list` page with thousands of browsers is several megabytes of
+JSON. Decoding it in one go holds the raw bytes, the full dict tree and
+the models in memory at once. JSONArrayStream instead takes the response
+body chunk by chunk and hands out the items of one array in it (by default
+`data.content`) as soon as each item is complete, so only one chunk and
+one item are held at a time. Everything outside the array is kept, and
+decoded once the body has ended.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .models import Browser, BrowserListResponse, PageInfo
+from .transport import ResponseStream
+
+_WHITESPACE = " \t\r\n"
+
+# Characters that can follow a complete array item
+_DELIMITERS = _WHITESPACE + ",]"
+
+# Drop parsed text from the buffer once this many characters have piled up
+_COMPACT_AT = 64 * 1024
+
+
+class _Frame:
+    """An open object or array outside the streamed array"""
+
+    __slots__ = ("kind", "key", "expect_key", "key_chars")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.key = None
+        self.expect_key = kind == "{"
+        self.key_chars = None
+
+
+class JSONArrayStream:
+    """
+    Push parser that yields the items of one array inside a JSON document.
+
+        parser = JSONArrayStream(("data", "content"))
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        for item in parser.close():
+            ...
+        parser.document  # everything else, with the array left empty
+    """
+
+    def __init__(self, path: Sequence[str] = ("data", "content")):
+        """
+        Args:
+            path: Object keys leading from the document root to the array
+        """
+        self.path = tuple(path)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._skeleton: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._in_array = False
+        self.document: Optional[Dict] = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Add the next chunk of the document.
+
+        Returns:
+            Array items completed by this chunk, in order
+        """
+        self._buf = self._buf[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        items = []
+        self._scan(items, final=False)
+        return items
+
+    def close(self) -> List[Any]:
+        """
+        Finish parsing once the whole document has been fed.
+
+        Sets `document` to the document with the streamed array replaced by
+        an empty list.
+
+        Returns:
+            Array items that only the end of the input completed
+
+        Raises:
+            ValueError: If the document is malformed or truncated
+        """
+        self._buf = self._buf[self._pos:] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        items = []
+        self._scan(items, final=True)
+        if self._in_array or self._stack or self._in_string:
+            raise ValueError("Truncated JSON document")
+        self.document = json.loads("".join(self._skeleton))
+        return items
+
+    def _scan(self, items: List[Any], final: bool):
+        while self._pos < len(self._buf):
+            if self._in_array:
+                if not self._scan_array(items, final):
+                    return
+            else:
+                self._scan_outside()
+
+    def _scan_array(self, items: List[Any], final: bool) -> bool:
+        """Parse complete array items; False when more input is needed"""
+        buf = self._buf
+        while True:
+            pos = self._pos
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+                pos += 1
+            self._pos = pos
+            if pos == len(buf):
+                return False
+            if buf[pos] == "]":
+                self._skeleton.append("]")
+                self._in_array = False
+                self._pos = pos + 1
+                return True
+            try:
+                item, end = self._json.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Malformed or truncated array item") from None
+                return False
+            if (not final and not isinstance(item, (dict, list))
+                    and (end == len(buf) or buf[end] not in _DELIMITERS)):
+                # A number may continue in the next chunk ("1" + ".5", "2" + "e3")
+                return False
+            items.append(item)
+            self._pos = end
+            if end >= _COMPACT_AT:
+                buf = self._buf = buf[end:]
+                self._pos = 0
+
+    def _scan_outside(self):
+        """Scan structure outside the streamed array, up to its start"""
+        buf, skeleton, stack = self._buf, self._skeleton, self._stack
+        pos = self._pos
+        while pos < len(buf):
+            c = buf[pos]
+            pos += 1
+            if self._in_string:
+                frame = stack[-1] if stack else None
+                if frame is not None and frame.key_chars is not None:
+                    frame.key_chars.append(c)
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if frame is not None and frame.key_chars is not None:
+                        frame.key = json.loads('"' + "".join(frame.key_chars))
+                        frame.key_chars = None
+                skeleton.append(c)
+                continue
+            if c == '"':
+                self._in_string = True
+                if stack and stack[-1].kind == "{" and stack[-1].expect_key:
+                    stack[-1].key_chars = []
+            elif c == "[" and self._at_target():
+                skeleton.append(c)
+                self._in_array = True
+                break
+            elif c in "{[":
+                stack.append(_Frame(c))
+            elif c in "}]":
+                if stack:
+                    stack.pop()
+            elif c == ":":
+                if stack:
+                    stack[-1].expect_key = False
+            elif c == ",":
+                if stack and stack[-1].kind == "{":
+                    stack[-1].expect_key = True
+            skeleton.append(c)
+        self._pos = pos
+
+    def _at_target(self) -> bool:
+        """Whether a value starting now is the array to stream"""
+        stack = self._stack
+        if len(stack) != len(self.path) or stack[-1].expect_key:
+            return False
+        return all(frame.kind == "{" and frame.key == key for frame, key in zip(stack, self.path))
+
+
+class BrowserStream:
+    """
+    Browsers of one `browser/list` page, built as they arrive.
+
+    Iterate over the stream to get Browser objects. `success`, `msg` and
+    `page_info` are filled in once the whole page has been read. The stream
+    can be iterated only once; close it (or use it as a context manager)
+    if you stop before the end, so the connection is released.
+
+        with client.browser_list(page_size=5000, stream=True) as browsers:
+            for browser in browsers:
+                ...
+        print(browsers.page_info.total_elements)
+    """
+
+    def __init__(self, body: ResponseStream,
+                 observe: Optional[Callable[[List[Browser]], List[Browser]]] = None):
+        """
+        Args:
+            body: Streamed response body of a browser/list call
+            observe: Called with the browsers completed by each chunk before
+                they are yielded; returns the browsers to yield
+        """
+        self._body = body
+        self._observe = observe
+        self.success: Optional[bool] = None
+        self.msg: Optional[str] = None
+        self.page_info: Optional[PageInfo] = None
+
+    def __iter__(self) -> Iterator[Browser]:
+        parser = JSONArrayStream(("data", "content"))
+        with self._body:
+            for chunk in self._body:
+                yield from self._browsers(parser.feed(chunk))
+        yield from self._browsers(parser.close())
+        rest = BrowserListResponse.from_dict(parser.document)
+        self.success = rest.success
+        self.msg = rest.msg
+        self.page_info = rest.page_info
+
+    def _browsers(self, items: List[Dict]) -> List[Browser]:
+        browsers = [Browser.from_dict(item) for item in items]
+        if browsers and self._observe is not None:
+            browsers = self._observe(browsers)
+        return browsers
+
+    def close(self):
+        """Stop reading and release the connection"""
+        self._body.close()
+
+    def __enter__(self) -> 'BrowserStream':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
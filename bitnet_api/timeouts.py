@@ -0,0 +1,111 @@
+"""
+Request timeouts and deadlines.
+
+Every request gets a connect and a read timeout: the client default, or a
+longer one for endpoints that are slow by nature. A deadline bounds a whole
+operation instead of one request. It is stored in a context variable, so
+it applies to every request made inside the `with` block, including all
+requests of multi-call helpers and all of their retries:
+
+    with client.deadline(30):
+        client.open_browser(id=browser_id)
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+from .exceptions import DeadlineExceeded
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """Connect and read timeouts in seconds; None waits forever"""
+    connect: Optional[float] = 3.0
+    read: Optional[float] = 30.0
+
+    @classmethod
+    def coerce(cls, value: Union[None, float, 'Timeout']) -> 'Timeout':
+        """Accept a Timeout, or a number used for both phases"""
+        if isinstance(value, Timeout):
+            return value
+        return cls(connect=value, read=value)
+
+
+DEFAULT_TIMEOUT = Timeout(connect=3.0, read=30.0)
+
+# Endpoints that legitimately take longer than the default read timeout
+SLOW_ENDPOINT_TIMEOUTS = {
+    "browser/open": Timeout(connect=3.0, read=120.0),
+    "browser/reopenAtPos": Timeout(connect=3.0, read=120.0),
+    "browser/close/all": Timeout(connect=3.0, read=60.0),
+    "cache/clear": Timeout(connect=3.0, read=120.0),
+    "cache/clear/exceptExtensions": Timeout(connect=3.0, read=120.0),
+    "checkagent": Timeout(connect=3.0, read=60.0),
+}
+
+
+class Deadline:
+    """Point in time by which an operation must finish"""
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Time budget from now
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, negative once expired"""
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current_deadline = contextvars.ContextVar("bitnet_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline of the innermost active deadline() block"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """
+    Bound every request made inside the block by one shared deadline.
+
+    Nested blocks can only shorten an enclosing deadline, never extend it.
+
+    Args:
+        seconds: Time budget for the whole block
+    """
+    new = Deadline(seconds)
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new = outer
+    token = _current_deadline.set(new)
+    try:
+        yield new
+    finally:
+        _current_deadline.reset(token)
+
+
+def effective_timeout(timeout: Timeout, endpoint: str) -> Timeout:
+    """
+    Clamp `timeout` to the remaining time of the current deadline.
+
+    Raises:
+        DeadlineExceeded: If the current deadline has already passed
+    """
+    active = _current_deadline.get()
+    if active is None:
+        return timeout
+    remaining = active.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before calling {endpoint}")
+    return Timeout(connect=remaining if timeout.connect is None else min(timeout.connect, remaining),
+                   read=remaining if timeout.read is None else min(timeout.read, remaining))
@@ -0,0 +1,634 @@
+"""
+HTTP transports used by the API clients.
+
+The local Bitnet/AdsPower APIs are plain HTTP/1.1 servers on loopback, so
+the transports here speak just enough HTTP/1.1 to keep connections alive and
+reuse them across calls. Errors are raised as the matching
+`requests.exceptions` types, so callers handle every client the same way.
+"""
+
+import asyncio
+import http.client
+import select
+import socket
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .timeouts import Timeout
+
+
+def raise_for_status(status: int, reason: str, url: str, content: bytes):
+    """
+    Raise `requests.exceptions.HTTPError` for 4xx/5xx statuses.
+
+    A minimal `requests.Response` is only built on the error path, so the
+    raised exception looks exactly like the one requests itself would raise.
+    """
+    if status < 400:
+        return
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.url = url
+    response._content = content
+    response.raise_for_status()
+
+
+def build_path(endpoint: str, params: Optional[Dict] = None) -> str:
+    """Build the request target for an endpoint and optional query params"""
+    path = f"/{endpoint}"
+    if params:
+        path = f"{path}?{urlencode(params, doseq=True)}"
+    return path
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    """
+    Whether an idle pooled connection can no longer be used.
+
+    An idle connection has no response pending, so a readable socket means
+    the server closed it (or sent something unexpected). Checking before
+    reuse avoids sending a request into a connection that is already gone,
+    where a failure could not be told apart from one after the server
+    received the request.
+    """
+    if connection.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+# Read size for streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseStream:
+    """
+    Body of a streamed response, read chunk by chunk.
+
+    The connection is released once the body has been read to the end, or
+    dropped if the stream is closed early. Use it as a context manager, or
+    call close(), when a stream may be abandoned before the end.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], release: Callable[[bool], None]):
+        """
+        Args:
+            chunks: Body chunks in order
+            release: Called once with True if the whole body was read, or
+                False if the stream was closed early
+        """
+        self._chunks = chunks
+        self._release = release
+        self._released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            yield chunk
+        self._finish(True)
+
+    def close(self):
+        """Stop reading and release the connection"""
+        self._finish(False)
+
+    def _finish(self, complete: bool):
+        if not self._released:
+            self._released = True
+            self._release(complete)
+
+    def __enter__(self) -> 'ResponseStream':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Transport:
+    """
+    Interface for synchronous HTTP transports.
+
+    A transport sends one already-encoded request to the API server and
+    returns the raw response; JSON handling and status checks stay in the
+    client so every backend behaves the same.
+    """
+
+    def request(self,
+                method: str,
+                path: str,
+                body: bytes = b"",
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[Timeout] = None) -> Tuple[int, str, bytes]:
+        """
+        Send one request and read the full response.
+
+        Args:
+            method: HTTP method
+            path: Request target, including any query string
+            body: Encoded request body
+            headers: Request headers
+            timeout: Connect and read timeouts; None waits forever
+
+        Returns:
+            Tuple of (status, reason, body)
+
+        Raises:
+            requests.exceptions.ConnectTimeout: If connecting timed out
+            requests.exceptions.ReadTimeout: If the server did not answer in time
+            requests.exceptions.ConnectionError: On any other connection failure
+        """
+        raise NotImplementedError
+
+    def stream(self,
+               method: str,
+               path: str,
+               body: bytes = b"",
+               headers: Optional[Dict[str, str]] = None,
+               timeout: Optional[Timeout] = None) -> Tuple[int, str, Union[bytes, ResponseStream]]:
+        """
+        Send one request and return as soon as the response headers arrive.
+
+        Transports that cannot stream read the whole body and hand it out
+        as a single chunk.
+
+        Returns:
+            Tuple of (status, reason, body). For 4xx/5xx statuses the body is
+            read in full and returned as bytes; otherwise it is a
+            ResponseStream.
+        """
+        status, reason, content = self.request(method, path, body, headers, timeout)
+        if status >= 400:
+            return status, reason, content
+        return status, reason, ResponseStream([content], lambda complete: None)
+
+    def close(self):
+        """Release all connections held by the transport"""
+        pass
+
+
+class HTTPTransport(Transport):
+    """
+    Lean keep-alive transport built directly on `http.client`.
+
+    Idle connections are kept in a LIFO pool of up to `pool_maxsize`
+    connections. There are no hooks, adapters, cookie jars or header
+    merging on the request path, which makes this the cheapest backend for
+    the loopback APIs the clients talk to.
+    """
+
+    def __init__(self, host: str, port: int, pool_maxsize: int = 10, pool_block: bool = False):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            pool_maxsize: Maximum number of idle connections kept for reuse
+            pool_block: Limit open connections to `pool_maxsize`, making extra
+                callers wait instead of opening short-lived connections
+        """
+        self.host = host
+        self.port = port
+        self.pool_maxsize = pool_maxsize
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_maxsize) if pool_block else None
+        self._closed = False
+
+    def request(self,
+                method: str,
+                path: str,
+                body: bytes = b"",
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[Timeout] = None) -> Tuple[int, str, bytes]:
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            connection, response, _ = self._exchange(method, path, body, headers, timeout)
+            try:
+                content = response.read()
+            except socket.timeout as e:
+                connection.close()
+                raise requests.exceptions.ReadTimeout(
+                    f"{method} {self._url(path)} timed out while reading the response") from e
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                raise requests.exceptions.ConnectionError(
+                    f"{method} {self._url(path)} failed: {e!r}") from e
+            self._finish(connection, response)
+            return response.status, response.reason, content
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def stream(self,
+               method: str,
+               path: str,
+               body: bytes = b"",
+               headers: Optional[Dict[str, str]] = None,
+               timeout: Optional[Timeout] = None) -> Tuple[int, str, Union[bytes, ResponseStream]]:
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            connection, response, _ = self._exchange(method, path, body, headers, timeout)
+            if response.status >= 400:
+                content = response.read()
+                self._finish(connection, response)
+        except BaseException:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+        if response.status >= 400:
+            if self._slots is not None:
+                self._slots.release()
+            return response.status, response.reason, content
+
+        def chunks() -> Iterator[bytes]:
+            try:
+                while True:
+                    chunk = response.read1(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+            except socket.timeout as e:
+                raise requests.exceptions.ReadTimeout(
+                    f"{method} {self._url(path)} timed out while reading the response") from e
+            except (http.client.HTTPException, OSError) as e:
+                raise requests.exceptions.ConnectionError(
+                    f"{method} {self._url(path)} failed: {e!r}") from e
+
+        def release(complete: bool):
+            if complete:
+                self._finish(connection, response)
+            else:
+                # Unread body left on the connection: it cannot be reused
+                connection.close()
+            if self._slots is not None:
+                self._slots.release()
+
+        return response.status, response.reason, ResponseStream(chunks(), release)
+
+    def _exchange(self,
+                  method: str,
+                  path: str,
+                  body: bytes,
+                  headers: Optional[Dict[str, str]],
+                  timeout: Optional[Timeout]) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse, bool]:
+        """
+        Send a request and read the response status line and headers.
+
+        Returns:
+            Tuple of (connection, response, whether the connection was reused)
+        """
+        if self._closed:
+            raise requests.exceptions.ConnectionError("Transport is closed")
+        timeout = timeout or Timeout(connect=None, read=None)
+        url = self._url(path)
+        while True:
+            connection, reused = self._get_connection()
+            if connection.sock is None:
+                try:
+                    connection.timeout = timeout.connect
+                    connection.connect()
+                except socket.timeout as e:
+                    connection.close()
+                    raise requests.exceptions.ConnectTimeout(
+                        f"Connecting for {method} {url} timed out") from e
+                except OSError as e:
+                    connection.close()
+                    raise requests.exceptions.ConnectionError(
+                        f"{method} {url} failed: {e!r}") from e
+            connection.sock.settimeout(timeout.read)
+            try:
+                connection.request(method, path, body, headers or {})
+            except socket.timeout as e:
+                connection.close()
+                raise requests.exceptions.ReadTimeout(
+                    f"{method} {url} timed out after {timeout.read}s") from e
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                # The request was not written in full, so the server cannot
+                # have acted on it: a pooled connection the server closed
+                # while idle is retried on a fresh connection
+                if reused and isinstance(e, (ConnectionResetError, BrokenPipeError)):
+                    continue
+                raise requests.exceptions.ConnectionError(
+                    f"{method} {url} failed: {e!r}") from e
+            try:
+                response = connection.getresponse()
+            except socket.timeout as e:
+                connection.close()
+                raise requests.exceptions.ReadTimeout(
+                    f"{method} {url} timed out after {timeout.read}s") from e
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                # The server may have run the request; whether it is sent
+                # again is up to the RetryPolicy (see endpoints.is_replayable)
+                raise requests.exceptions.ConnectionError(
+                    f"{method} {url} failed: {e!r}") from e
+            return connection, response, reused
+
+    def _url(self, path: str) -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    def _finish(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """Return a connection whose response has been read in full to the pool"""
+        if response.will_close:
+            connection.close()
+        else:
+            self._put_connection(connection)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _get_connection(self) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection = self._idle.pop()
+            if not _is_dropped(connection):
+                return connection, True
+            connection.close()
+        return http.client.HTTPConnection(self.host, self.port), False
+
+    def _put_connection(self, connection: http.client.HTTPConnection):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.pool_maxsize:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+
+class RequestsTransport(Transport):
+    """
+    Compatibility transport built on a pooled `requests.Session`.
+
+    Slower than HTTPTransport, but honours everything requests does
+    (environment proxies, session hooks, mounted adapters).
+    """
+
+    def __init__(self,
+                 host: str,
+                 port: int,
+                 pool_connections: int = 1,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of connections kept open per host
+            pool_block: Block when all pooled connections are in use
+        """
+        self.base_url = f"http://{host}:{port}"
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self,
+                method: str,
+                path: str,
+                body: bytes = b"",
+                headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[Timeout] = None) -> Tuple[int, str, bytes]:
+        response = self.session.request(method, f"{self.base_url}{path}",
+                                        data=body or None, headers=headers,
+                                        timeout=(timeout.connect, timeout.read) if timeout else None)
+        return response.status_code, response.reason, response.content
+
+    def stream(self,
+               method: str,
+               path: str,
+               body: bytes = b"",
+               headers: Optional[Dict[str, str]] = None,
+               timeout: Optional[Timeout] = None) -> Tuple[int, str, Union[bytes, ResponseStream]]:
+        response = self.session.request(method, f"{self.base_url}{path}",
+                                        data=body or None, headers=headers, stream=True,
+                                        timeout=(timeout.connect, timeout.read) if timeout else None)
+        if response.status_code >= 400:
+            return response.status_code, response.reason, response.content
+        return (response.status_code, response.reason,
+                ResponseStream(response.iter_content(STREAM_CHUNK_SIZE), lambda complete: response.close()))
+
+    def close(self):
+        self.session.close()
+
+
+TRANSPORTS = {
+    "http": HTTPTransport,
+    "requests": RequestsTransport,
+}
+
+
+def make_transport(transport: Union[str, Transport],
+                   host: str,
+                   port: int,
+                   pool_connections: int = 1,
+                   pool_maxsize: int = 10,
+                   pool_block: bool = False) -> Transport:
+    """
+    Resolve a client's `transport` argument into a Transport instance.
+
+    Args:
+        transport: A Transport instance, or the name of a built-in backend
+            ("http" or "requests")
+        host: Server host
+        port: Server port
+        pool_connections: Number of per-host pools (requests backend only)
+        pool_maxsize: Maximum number of pooled connections
+        pool_block: Block when all pooled connections are in use
+
+    Returns:
+        Transport instance
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r}, expected one of {sorted(TRANSPORTS)}")
+    if transport == "requests":
+        return RequestsTransport(host, port, pool_connections=pool_connections,
+                                 pool_maxsize=pool_maxsize, pool_block=pool_block)
+    return HTTPTransport(host, port, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+
+class _RequestNotSent(Exception):
+    """Writing a request failed before all of it reached the socket"""
+
+
+class AsyncConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connection pool on top of asyncio streams.
+
+    At most `maxsize` connections are open at once; further requests wait
+    for a free connection instead of opening new sockets, so thousands of
+    in-flight calls cost one coroutine each rather than one socket each.
+    """
+
+    def __init__(self, host: str, port: int, maxsize: int = 100):
+        """
+        Args:
+            host: Server host
+            port: Server port
+            maxsize: Maximum number of simultaneously open connections
+        """
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self._idle = deque()
+        # Created lazily so the pool binds to the loop that first uses it
+        self._semaphore = None
+        self._closed = False
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      body: bytes = b"",
+                      headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[Timeout] = None) -> Tuple[int, str, bytes]:
+        """
+        Send one request and read the full response.
+
+        Args:
+            method: HTTP method
+            path: Request target, including any query string
+            body: Encoded request body
+            headers: Extra request headers
+            timeout: Connect timeout, and read timeout for the whole response
+
+        Returns:
+            Tuple of (status, reason, body)
+        """
+        if self._closed:
+            raise requests.exceptions.ConnectionError("Connection pool is closed")
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.maxsize)
+
+        timeout = timeout or Timeout(connect=None, read=None)
+        request = self._encode_request(method, path, body, headers or {})
+        async with self._semaphore:
+            while True:
+                connection, reused = await self._get_connection(timeout.connect)
+                try:
+                    status, reason, content, keep_alive = await asyncio.wait_for(
+                        self._send(connection, request), timeout.read)
+                except asyncio.TimeoutError as e:
+                    self._discard(connection)
+                    raise requests.exceptions.ReadTimeout(
+                        f"{method} {path} timed out after {timeout.read}s") from e
+                except _RequestNotSent as e:
+                    self._discard(connection)
+                    # The request was not written in full, so the server
+                    # cannot have acted on it: a pooled connection the server
+                    # closed while idle is retried on a fresh connection
+                    if reused:
+                        continue
+                    raise requests.exceptions.ConnectionError(str(e.__cause__) or repr(e.__cause__)) from e.__cause__
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    self._discard(connection)
+                    # The server may have run the request; whether it is sent
+                    # again is up to the RetryPolicy (see endpoints.is_replayable)
+                    raise requests.exceptions.ConnectionError(str(e) or repr(e)) from e
+                except BaseException:
+                    self._discard(connection)
+                    raise
+                if keep_alive and not self._closed:
+                    self._idle.append(connection)
+                else:
+                    self._discard(connection)
+                return status, reason, content
+
+    async def close(self):
+        """Close all idle connections and reject further requests"""
+        self._closed = True
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    async def _get_connection(self, connect_timeout: Optional[float]):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return (reader, writer), True
+            writer.close()
+        try:
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), connect_timeout)
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ConnectTimeout(
+                f"Connecting to {self.host}:{self.port} timed out") from e
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(
+                f"Failed to connect to {self.host}:{self.port}: {e}") from e
+        return connection, False
+
+    def _discard(self, connection):
+        connection[1].close()
+
+    def _encode_request(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> bytes:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(body)}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _send(self, connection, request: bytes):
+        reader, writer = connection
+        try:
+            writer.write(request)
+            await writer.drain()
+        except ConnectionError as e:
+            raise _RequestNotSent() from e
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection")
+        parts = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        version, status = parts[0], int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ""
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        connection_header = response_headers.get("connection", "").lower()
+        keep_alive = connection_header != "close" and (
+            version != "HTTP/1.0" or connection_header == "keep-alive")
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            content = await self._read_chunked(reader)
+        elif "content-length" in response_headers:
+            content = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        return status, reason, content, keep_alive
+
+    async def _read_chunked(self, reader) -> bytes:
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
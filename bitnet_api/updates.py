@@ -0,0 +1,163 @@
+"""
+Grouped updates of many browsers.
+
+`browser/update/partial` and `browser/proxy/update` take a list of browser
+ids and apply the same change to all of them. Instead of one request per
+browser, the helpers here group browsers that receive an identical change
+and send one request per group (split into calls of at most
+`max_ids_per_call` ids), several groups at a time:
+
+    # Only the fields that differ from the current state are sent
+    report = client.apply_browser_changes(current=client.iter_browsers(),
+                                          desired={browser_id: {"remark": "warm"} for browser_id in ids})
+
+    # One browser/proxy/update call per distinct proxy
+    report = client.assign_proxies({browser_id: {"proxy_type": "socks5", "host": host, "port": port}
+                                    for browser_id, (host, port) in rotation.items()})
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple, Union
+
+import requests
+
+from .batch import run_bounded
+from .models import BaseResponse, Browser
+
+# A group of browsers and the call applying their shared change to some of them
+UpdateGroup = Tuple[List[str], Callable[[List[str]], BaseResponse]]
+
+# Change key to the shared change and the ids of the browsers receiving it
+ChangeGroups = Dict[str, Tuple[Dict[str, Any], List[str]]]
+
+# Proxy settings update_browser_proxy() sends for arguments left at their defaults
+PROXY_DEFAULTS = {
+    "proxy_method": 2,
+    "proxy_type": "noproxy",
+    "host": "",
+    "port": "",
+    "proxy_username": "",
+    "proxy_password": "",
+}
+
+
+@dataclass
+class UpdateReport:
+    """Totals of a grouped update"""
+    browsers: int = 0
+    unchanged: int = 0
+    groups: int = 0
+    requests: int = 0
+    elapsed: float = 0.0
+    failed: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def change_key(changes: Mapping[str, Any]) -> str:
+    """Canonical form of a change set, equal for equal changes"""
+    return json.dumps(changes, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def diff_browser(current: Browser, desired: Union[Browser, Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Return the API fields of `desired` that differ from `current`.
+
+    Args:
+        current: Browser as returned by the list or detail endpoints
+        desired: Browser, or dict of Browser field names, holding the
+            wanted values; fields left unset (None) are not compared
+
+    Returns:
+        Changed fields, keyed as the API expects them
+    """
+    if not isinstance(desired, Browser):
+        desired = Browser(**desired)
+    wanted = desired.to_dict()
+    wanted.pop("id", None)
+    have = current.to_dict()
+    return {key: value for key, value in wanted.items() if have.get(key) != value}
+
+
+def send_groups(groups: Iterable[UpdateGroup], report: UpdateReport, concurrency: int,
+                max_ids_per_call: int) -> UpdateReport:
+    """
+    Send every group, `concurrency` calls at a time.
+
+    Ids whose call failed (success false or a request error) are added to
+    `report.failed`, with the error message per id in `report.errors`.
+    """
+    lock = threading.Lock()
+    max_ids_per_call = max(1, max_ids_per_call)
+
+    def calls():
+        for ids, send in groups:
+            report.groups += 1
+            for start in range(0, len(ids), max_ids_per_call):
+                yield ids[start:start + max_ids_per_call], send
+
+    def run(call: UpdateGroup):
+        ids, send = call
+        try:
+            response = send(ids)
+            error = None if response.success else (response.msg or "request failed")
+        except requests.exceptions.RequestException as e:
+            error = str(e) or type(e).__name__
+        with lock:
+            report.requests += 1
+            if error is not None:
+                report.failed.extend(ids)
+                report.errors.update(dict.fromkeys(ids, error))
+
+    started = time.monotonic()
+    for _ in run_bounded(run, calls(), concurrency, thread_name_prefix="bitnet-updates"):
+        pass
+    report.elapsed = time.monotonic() - started
+    return report
+
+
+def group_changes(current: Iterable[Browser],
+                  desired: Mapping[str, Union[Browser, Mapping[str, Any]]]) -> Tuple[ChangeGroups, int]:
+    """
+    Diff each browser against its desired state and group identical changes.
+
+    Browsers in `desired` that are missing from `current` are compared
+    against an empty Browser, so every desired field is sent.
+
+    Returns:
+        Tuple of {change key: (changes, browser ids)} and the number of
+        browsers that need no change
+    """
+    current_by_id = {browser.id: browser for browser in current if browser.id in desired}
+    groups: ChangeGroups = {}
+    unchanged = 0
+    for browser_id, wanted in desired.items():
+        changes = diff_browser(current_by_id.get(browser_id) or Browser(id=browser_id), wanted)
+        if not changes:
+            unchanged += 1
+            continue
+        groups.setdefault(change_key(changes), (changes, []))[1].append(browser_id)
+    return groups, unchanged
+
+
+def group_proxies(assignments: Mapping[str, Mapping[str, Any]]) -> ChangeGroups:
+    """
+    Group browsers that are assigned an identical proxy configuration.
+
+    Args:
+        assignments: Browser id to update_browser_proxy() arguments
+            (proxy_method, proxy_type, host, port, proxy_username,
+            proxy_password and any extra API fields); missing arguments
+            take update_browser_proxy()'s defaults before comparing
+
+    Returns:
+        {config key: (update_browser_proxy() arguments, browser ids)}
+    """
+    groups: ChangeGroups = {}
+    for browser_id, proxy in assignments.items():
+        config = {**PROXY_DEFAULTS, **proxy}
+        config["port"] = str(config["port"])
+        groups.setdefault(change_key(config), (config, []))[1].append(browser_id)
+    return groups
@@ -0,0 +1,212 @@
+"""
+Write-behind buffering of remark and group updates.
+
+Automation that finishes tasks one browser at a time tends to call
+update_browser_remark() and update_browser_group() once per browser, each
+with a single id. Both endpoints take a list of ids, so the write-behind
+queue holds these calls for a short window, merges the ones that set the
+same value, and sends one request per value:
+
+    client = BitnetClient(write_behind=0.2)
+    for browser_id in finished:
+        client.update_browser_remark("done", [browser_id])  # returns a Future
+    client.close()  # sends whatever is still buffered
+
+A later write to the same browser and field replaces the buffered one.
+Browser detail and list responses read through the client show the
+buffered values, so callers see their own writes before they are sent.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .batch import run_bounded
+from .models import Browser, BrowserListResponse, BrowserResponse, GenericResponse
+
+if TYPE_CHECKING:
+    from .client import BitnetClient
+
+# Browser attribute to the endpoint that sets it and the request key of the value
+WRITE_BEHIND_FIELDS = {
+    "remark": ("browser/remark/update", "remark"),
+    "group_id": ("browser/group/update", "groupId"),
+}
+
+
+@dataclass(eq=False)
+class _Ticket:
+    """One buffered call: its Future and the ids it covers"""
+    name: str
+    future: Future
+    ids: List[str] = field(default_factory=list)
+
+
+class WriteBehindQueue:
+    """Buffers remark and group updates and sends them merged by value"""
+
+    def __init__(self, client: 'BitnetClient', window: float = 0.2, max_ids: int = 1000,
+                 concurrency: int = 4):
+        """
+        Args:
+            client: Client the merged updates are sent through
+            window: Seconds a write is held, counted from the oldest
+                buffered write
+            max_ids: Number of buffered writes that triggers an early flush;
+                also the most ids sent in one request
+            concurrency: Maximum number of requests in flight per flush
+        """
+        self.client = client
+        self.window = window
+        self.max_ids = max(1, max_ids)
+        self.concurrency = max(1, concurrency)
+        # Field to {browser id: value}, in write order
+        self._pending: Dict[str, Dict[str, Any]] = {name: {} for name in WRITE_BEHIND_FIELDS}
+        # Values of the flush being sent, shown until its responses arrive
+        self._sending: Dict[str, Dict[str, Any]] = {name: {} for name in WRITE_BEHIND_FIELDS}
+        self._tickets: List[_Ticket] = []
+        self._count = 0
+        self._oldest: Optional[float] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="bitnet-write-behind", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """Number of buffered writes"""
+        return self._count
+
+    def submit(self, name: str, value: Any, browser_ids: List[str]) -> Future:
+        """
+        Buffer setting field `name` to `value` on `browser_ids`.
+
+        Returns:
+            Future resolved with the GenericResponse of the request that
+            carried these ids (a failed one, if any failed), or with the
+            exception that request raised
+
+        Raises:
+            RuntimeError: If the queue has been closed
+        """
+        if name not in WRITE_BEHIND_FIELDS:
+            raise ValueError(f"Field {name!r} cannot be written behind")
+        ticket = _Ticket(name, Future(), list(dict.fromkeys(browser_ids)))
+        if not ticket.ids:
+            ticket.future.set_result(GenericResponse(success=True))
+            return ticket.future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            pending = self._pending[name]
+            for browser_id in ticket.ids:
+                if browser_id in pending:
+                    del pending[browser_id]
+                else:
+                    self._count += 1
+                pending[browser_id] = value
+            self._tickets.append(ticket)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._wakeup.notify()
+        return ticket.future
+
+    def pending_for(self, browser_id: str) -> Dict[str, Any]:
+        """Return the buffered or still-sending values for one browser, by Browser attribute"""
+        with self._lock:
+            values = {name: sending[browser_id] for name, sending in self._sending.items()
+                      if browser_id in sending}
+            values.update((name, pending[browser_id]) for name, pending in self._pending.items()
+                          if browser_id in pending)
+        return values
+
+    def overlay(self, browser: Browser) -> Browser:
+        """Return `browser` with its buffered values applied"""
+        values = self.pending_for(browser.id) if browser.id else None
+        return replace(browser, **values) if values else browser
+
+    def apply(self, response: Any) -> Any:
+        """Apply buffered values to the browsers in a detail or list response"""
+        if isinstance(response, BrowserResponse) and response.data is not None:
+            response.data = self.overlay(response.data)
+        elif isinstance(response, BrowserListResponse) and response.content:
+            response.content = [self.overlay(browser) for browser in response.content]
+        return response
+
+    def flush(self):
+        """Send every buffered write now and wait for the requests to finish"""
+        with self._flush_lock:
+            with self._lock:
+                snapshot = self._pending
+                tickets, self._tickets = self._tickets, []
+                self._pending = {name: {} for name in WRITE_BEHIND_FIELDS}
+                self._sending = snapshot
+                self._count = 0
+                self._oldest = None
+            try:
+                self._send(snapshot, tickets)
+            finally:
+                with self._lock:
+                    self._sending = {name: {} for name in WRITE_BEHIND_FIELDS}
+
+    def close(self):
+        """Stop the timer and send whatever is still buffered"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed:
+                    if self._count >= self.max_ids:
+                        break
+                    if self._oldest is None:
+                        self._wakeup.wait()
+                        continue
+                    remaining = self._oldest + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _send(self, snapshot: Dict[str, Dict[str, Any]], tickets: List[_Ticket]):
+        calls = []
+        for name, writes in snapshot.items():
+            endpoint, key = WRITE_BEHIND_FIELDS[name]
+            by_value: Dict[Any, List[str]] = {}
+            for browser_id, value in writes.items():
+                by_value.setdefault(value, []).append(browser_id)
+            for value, ids in by_value.items():
+                for start in range(0, len(ids), self.max_ids):
+                    calls.append((name, endpoint, {key: value, "browserIds": ids[start:start + self.max_ids]}))
+
+        def send(call):
+            name, endpoint, data = call
+            try:
+                outcome = self.client._call(endpoint, GenericResponse, data)
+            except Exception as e:
+                outcome = e
+            return [((name, browser_id), outcome) for browser_id in data["browserIds"]]
+
+        outcomes: Dict[Tuple[str, str], Any] = {}
+        for results in run_bounded(send, calls, self.concurrency, thread_name_prefix="bitnet-write-behind"):
+            outcomes.update(results)
+        # A write replaced by a later one for the same browser resolves with the later one's outcome
+        for ticket in tickets:
+            results = [outcomes[ticket.name, browser_id] for browser_id in ticket.ids]
+            failure = next((outcome for outcome in results if isinstance(outcome, Exception)), None)
+            if failure is not None:
+                ticket.future.set_exception(failure)
+                continue
+            failed = next((outcome for outcome in results if not outcome.success), None)
+            ticket.future.set_result(failed or results[-1])
@@ -115,12 +115,15 @@ def main():
         print("\nBrowser windows are open. Waiting 10 seconds before closing...")
         time.sleep(10)
         
-        # 9. Close all browser windows
+        # 9. Close all browser windows concurrently
         print("\nClosing all browser windows...")
-        for i, browser_id in enumerate(browser_ids):
-            print(f"Closing browser window #{i+1}...")
-            close_response = client.close_browser(id=browser_id)
-            if close_response.success:
+        with client.batch() as batch:
+            for browser_id in browser_ids:
+                client.close_browser(id=browser_id)
+        for i, close_response in enumerate(batch.results()):
+            if isinstance(close_response, Exception):
+                print(f"Failed to close browser #{i+1}. Error: {close_response}")
+            elif close_response.success:
                 print(f"Browser #{i+1} closed successfully.")
             else:
                 print(f"Failed to close browser #{i+1}. Error: {close_response.msg}")
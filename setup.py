@@ -7,6 +7,9 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0"],
+    },
     author="Bitnet API SDK",
     author_email="example@example.com",
     description="Python SDK for Bitnet Browser API",
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+AdsPower client tests with mock server
+"""
+
+import asyncio
+import itertools
+import os
+import socket
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adspower_api import AdsPowerClient, AsyncAdsPowerClient, RequestPacer
+from bitnet_api import Timeout, TokenBucket
+from requests.exceptions import ReadTimeout
+from mock_server import MockServer, MockAdsPowerAPIHandler
+
+
+def test_token_bucket_pacing():
+    """Test that a token bucket spaces calls at its rate"""
+    print("\n=== Testing Token Bucket ===")
+    bucket = TokenBucket(rate=50, burst=2)
+    delays = [bucket.reserve() for _ in range(6)]
+    print(f"Reserved delays: {delays}")
+    assert delays[0] == 0 and delays[1] == 0
+    # Every further token is queued one interval behind the previous one
+    for previous, current in zip(delays[2:], delays[3:]):
+        assert abs((current - previous) - 0.02) < 0.005
+    print("Token bucket test passed!")
+
+
+def test_sync_client(adspower_server):
+    """Test the sync client against the mock AdsPower API"""
+    print("\n=== Testing AdsPowerClient ===")
+    with AdsPowerClient(host=adspower_server.host, port=adspower_server.port) as client:
+        assert client.check_status().code == 0
+        start_response = client.start_browser(profile_id="ads-profile-1")
+        assert start_response.code == 0
+        assert start_response.debug_port == "9222"
+        list_response = client.list_browsers()
+        assert any(browser.profile_id == "ads-profile-1" for browser in list_response.browsers)
+        assert client.check_browser_active(profile_id="ads-profile-1").status == "Inactive"
+        assert client.stop_browser(profile_id="ads-profile-1").code == 0
+    print("AdsPowerClient test passed!")
+
+
+def test_iter_browsers(adspower_server):
+    """Test that iter_browsers pages until a short page and grows the page size"""
+    print("\n=== Testing AdsPowerClient.iter_browsers ===")
+    added = {f"ads-paged-{n}": {"profile_id": f"ads-paged-{n}", "profile_no": str(n), "name": f"Paged {n}",
+                                "group_id": "0", "remark": ""} for n in range(130)}
+    MockAdsPowerAPIHandler.profiles.update(added)
+    pacer = RequestPacer(rate=200, burst=1)
+    try:
+        with AdsPowerClient(host=adspower_server.host, port=adspower_server.port, pacing=pacer) as client:
+            expected = [profile["profile_id"] for profile in MockAdsPowerAPIHandler.profiles.values()]
+            
+            limits = [len(response.browsers) for response in client.iter_browser_pages(limit=20)]
+            print(f"Page sizes: {limits}")
+            # 131 profiles: the limit doubles once the offset is a multiple of it
+            assert limits == [20, 20, 40, 51]
+            
+            MockAdsPowerAPIHandler.request_times.clear()
+            start = time.monotonic()
+            assert [browser.profile_id for browser in client.iter_browsers(limit=20)] == expected
+            # Every page waited for the pacer
+            assert time.monotonic() - start >= 3 / 200
+            assert len(MockAdsPowerAPIHandler.request_times) == 4
+            
+            # Pages are only fetched as they are needed
+            MockAdsPowerAPIHandler.request_times.clear()
+            assert len(list(itertools.islice(client.iter_browsers(limit=20), 5))) == 5
+            assert len(MockAdsPowerAPIHandler.request_times) == 1
+    finally:
+        for profile_id in added:
+            MockAdsPowerAPIHandler.profiles.pop(profile_id, None)
+    print("AdsPowerClient.iter_browsers test passed!")
+
+
+def test_async_client_paces_requests(adspower_server):
+    """Test that the async client queues calls instead of exceeding its rate"""
+    print("\n=== Testing AsyncAdsPowerClient Pacing ===")
+    pacer = RequestPacer(rate=20, burst=1, endpoint_rates={"status": 100})
+
+    async def scenario():
+        async with AsyncAdsPowerClient(host=adspower_server.host, port=adspower_server.port,
+                                       pacing=pacer) as client:
+            MockAdsPowerAPIHandler.request_times.clear()
+            start = time.monotonic()
+            responses = await asyncio.gather(*[
+                client.check_browser_active(profile_id="ads-profile-1") for _ in range(6)
+            ])
+            elapsed = time.monotonic() - start
+            assert all(response.code == 0 for response in responses)
+            print(f"6 paced calls at 20/s took {elapsed:.3f}s")
+            # One immediate token, then five more at 50ms intervals
+            assert elapsed >= 0.24
+
+            times = sorted(MockAdsPowerAPIHandler.request_times)
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            assert min(gaps) > 0.03
+
+            status = await client.check_status()
+            assert status.code == 0
+
+    asyncio.run(scenario())
+    print("AsyncAdsPowerClient pacing test passed!")
+
+
+def test_timeouts():
+    """Test that both clients give up on a server that accepts but never answers"""
+    print("\n=== Testing AdsPower Timeouts ===")
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        port = listener.getsockname()[1]
+        for transport in ("http", "requests"):
+            with AdsPowerClient(port=port, transport=transport, timeout=0.2) as client:
+                assert client.timeout_for("api/v2/browser-profile/start").read == 120.0
+                start = time.monotonic()
+                try:
+                    client.check_status()
+                    assert False, "Expected a read timeout"
+                except ReadTimeout:
+                    pass
+                assert time.monotonic() - start < 2
+        
+        async def scenario():
+            async with AsyncAdsPowerClient(port=port, timeout=Timeout(connect=1.0, read=0.2)) as client:
+                try:
+                    await client.check_status()
+                    assert False, "Expected a read timeout"
+                except ReadTimeout:
+                    pass
+        
+        asyncio.run(scenario())
+    print("AdsPower timeout test passed!")
+
+
+def main():
+    """Run all AdsPower client tests"""
+    print("==== AdsPower API Client Tests ====\n")
+    test_token_bucket_pacing()
+    test_timeouts()
+    server = MockServer(port=0, handler=MockAdsPowerAPIHandler)
+    try:
+        server.start()
+        test_sync_client(server)
+        test_iter_browsers(server)
+        test_async_client_paces_requests(server)
+        print("\n==== All AdsPower client tests passed successfully! ====")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Async client test for Bitnet API Python SDK with mock server
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitnet_api import (
+    AsyncBitnetClient, BrowserFingerPrint, BrowserResponse, ConcurrencyLimiter, DeadlineExceeded
+)
+from mock_server import MockServer, MockBitnetAPIHandler
+
+
+def test_async_browser_lifecycle(server):
+    """Test create/open/list/close/delete through the async client"""
+    print("\n=== Testing Async Browser Lifecycle ===")
+
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port) as client:
+            health = await client.health_check()
+            assert health.success is True
+
+            create_response = await client.create_or_update_browser(
+                browser_fingerprint=BrowserFingerPrint(core_version="104"),
+                proxy_type="noproxy"
+            )
+            assert create_response.success is True
+            browser_id = create_response.data.id
+
+            open_response = await client.open_browser(id=browser_id)
+            assert isinstance(open_response, BrowserResponse)
+            assert open_response.data.ws is not None
+
+            list_response = await client.browser_list()
+            assert list_response.success is True
+            assert any(browser.id == browser_id for browser in list_response.content)
+
+            proxy_response = await client.check_proxy(host="example.com", port=8080, proxy_type="http")
+            assert proxy_response.data.ip == "1.2.3.4"
+
+            assert (await client.close_browser(id=browser_id)).success is True
+            assert (await client.delete_browser(id=browser_id)).success is True
+
+    asyncio.run(scenario())
+    print("Async browser lifecycle test passed!")
+
+
+def test_async_concurrent_calls_share_pool(server):
+    """Test that many concurrent calls run over a bounded connection pool"""
+    print("\n=== Testing Async Concurrency ===")
+
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port, pool_maxsize=8) as client:
+            responses = await asyncio.gather(*[
+                client.get_browser_detail(id="test-browser-1") for _ in range(200)
+            ])
+            assert all(response.data.id == "test-browser-1" for response in responses)
+            assert len(client.pool._idle) <= 8
+
+    asyncio.run(scenario())
+    print("Async concurrency test passed!")
+
+
+def test_async_coalesced_reads(server):
+    """Test that identical concurrent reads share one round-trip"""
+    print("\n=== Testing Async Coalesced Reads ===")
+
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port) as client:
+            MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.1)]
+            responses = await asyncio.gather(
+                *[client.get_browser_detail(id="test-browser-1") for _ in range(20)],
+                client.get_browser_detail(id="missing-browser"),
+            )
+            assert all(response.success for response in responses[:20])
+            stats = client.metrics.snapshot()["endpoints"]
+            # A different body is a different request
+            assert stats["browser/detail"]["calls"] == 2
+            assert stats["browser/detail"]["coalesced"] == 19
+
+            # A leader that runs out of its own deadline does not fail its waiters
+            MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.3)]
+
+            async def leader():
+                with client.deadline(0.1):
+                    return await client.get_browser_detail(id="test-browser-1")
+
+            async def waiter():
+                await asyncio.sleep(0.02)
+                return await client.get_browser_detail(id="test-browser-1")
+
+            outcomes = await asyncio.gather(leader(), waiter(), return_exceptions=True)
+            assert isinstance(outcomes[0], DeadlineExceeded), outcomes
+            assert outcomes[1].success is True
+
+    asyncio.run(scenario())
+    print("Async coalesced reads test passed!")
+
+
+def test_async_concurrency_limiter(server):
+    """Test that concurrent async calls wait for a slot under the adaptive limit"""
+    print("\n=== Testing Async Concurrency Limiter ===")
+
+    async def scenario():
+        limiter = ConcurrencyLimiter(initial_limit=2, max_limit=2)
+        async with AsyncBitnetClient(host=server.host, port=server.port,
+                                     concurrency_limiter=limiter) as client:
+            limit = limiter.get("browser/open")
+            peak = []
+            acquire_async = limit.acquire_async
+
+            async def tracking_acquire(timeout=None):
+                started = await acquire_async(timeout)
+                peak.append(limit.in_flight)
+                return started
+
+            limit.acquire_async = tracking_acquire
+            MockBitnetAPIHandler.faults["/browser/open"] = [("delay", 0.02)] * 10
+            responses = await asyncio.gather(*[client.open_browser(id="test-browser-1") for _ in range(10)])
+            assert all(response.success for response in responses)
+            assert len(peak) == 10 and max(peak) <= 2
+            assert limit.in_flight == 0
+
+    asyncio.run(scenario())
+    print("Async concurrency limiter test passed!")
+
+
+def test_async_priority_scheduling(server):
+    """Test that an urgent call overtakes queued bulk calls"""
+    print("\n=== Testing Async Priority Scheduling ===")
+
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port, pool_maxsize=1) as client:
+            MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.05)] * 4
+            finished = []
+
+            async def bulk(n):
+                with client.priority("bulk"):
+                    await client.get_browser_detail(id=f"bulk-{n}")
+                finished.append(f"bulk-{n}")
+
+            async def urgent():
+                await asyncio.sleep(0.02)
+                await client.close_browser(id="test-browser-1")
+                finished.append("urgent")
+
+            await asyncio.gather(*[bulk(n) for n in range(4)], urgent())
+            print(f"Completion order: {finished}")
+            assert finished.index("urgent") == 1
+            assert client.metrics.snapshot()["priorities"]["bulk"]["waited"] == 3
+
+    asyncio.run(scenario())
+    print("Async priority scheduling test passed!")
+
+
+def test_async_deadline(server):
+    """Test that a deadline cuts a slow async call short"""
+    print("\n=== Testing Async Deadline ===")
+
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port) as client:
+            MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0.3)]
+            try:
+                with client.deadline(0.1):
+                    await client.browser_list()
+                assert False, "Expected the deadline to pass"
+            except DeadlineExceeded:
+                pass
+            await asyncio.sleep(0.3)
+            assert (await client.browser_list()).success is True
+
+    asyncio.run(scenario())
+    print("Async deadline test passed!")
+
+
+def main():
+    """Run all async client tests"""
+    print("==== Bitnet API Async Client Tests ====\n")
+
+    server = MockServer(port=0)
+    try:
+        server.start()
+        test_async_browser_lifecycle(server)
+        test_async_concurrent_calls_share_pool(server)
+        test_async_coalesced_reads(server)
+        test_async_concurrency_limiter(server)
+        test_async_priority_scheduling(server)
+        test_async_deadline(server)
+        print("\n==== All async client tests passed successfully! ====")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
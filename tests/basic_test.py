@@ -8,8 +8,10 @@ from bitnet_api import (
     PageInfo, BrowserListResponse, GroupListResponse, 
     HealthResponse, BrowserResponse, GroupResponse, 
     ProxyCheckInfo, ProxyCheckResponse, BrowserPidInfo, 
-    BrowserPidResponse, GenericResponse
+    BrowserPidResponse, GenericResponse, JSONArrayStream
 )
+import json
+import random
 
 def test_entity_creation():
     """Test that all entity classes can be instantiated correctly"""
@@ -63,6 +65,13 @@ def test_entity_creation():
     assert browser.name == "Test Browser"
     assert browser.browser_finger_print.core_version == "104"
     
+    # Test Browser.to_dict() round trip
+    browser_dict = browser.to_dict()
+    print(f"Browser.to_dict(): {browser_dict}")
+    assert browser_dict == {"id": "test-browser-id", "name": "Test Browser", "seq": 1,
+                            "groupId": "test-group-id", "browserFingerPrint": fingerprint.to_dict()}
+    assert Browser.from_dict(browser_dict) == browser
+    
     # Test Group
     group = Group(
         id="test-group-id",
@@ -125,6 +134,32 @@ def test_fingerprint_conversions():
     print("Fingerprint conversion test passed!")
     return True
 
+def test_json_array_stream_chunking():
+    """Test that array items parse the same wherever the chunk boundaries fall"""
+    print("\n=== Testing JSONArrayStream Chunk Boundaries ===")
+    items = [1, -2.5, 1e3, 12.75e-3, 0, "text", "é \\\" ]", True, False, None,
+             {"id": "a", "n": [1, 2.5]}, [3, {"x": "]"}], 1234567890123]
+    document = {"success": True, "data": {"content": items, "totalElements": 13}}
+    for text in (json.dumps(document), json.dumps(document, indent=1), json.dumps(document, separators=(",", ":"))):
+        body = text.encode("utf-8")
+        rng = random.Random(len(body))
+        for _ in range(300):
+            cuts = sorted(rng.sample(range(1, len(body)), rng.randint(1, 12)))
+            parser = JSONArrayStream(("data", "content"))
+            parsed = []
+            for start, end in zip([0] + cuts, cuts + [len(body)]):
+                parsed.extend(parser.feed(body[start:end]))
+            parsed.extend(parser.close())
+            assert parsed == items, (cuts, parsed)
+            assert parser.document == {"success": True, "data": {"content": [], "totalElements": 13}}
+        # Every single split point, including inside numbers ("2" + ".5", "1e" + "3")
+        for cut in range(1, len(body)):
+            parser = JSONArrayStream(("data", "content"))
+            parsed = parser.feed(body[:cut]) + parser.feed(body[cut:]) + parser.close()
+            assert parsed == items, (cut, parsed)
+    print("JSONArrayStream chunking test passed!")
+
+
 def main():
     """Run all tests"""
     print("==== Bitnet API SDK Entity Tests ====\n")
@@ -132,6 +167,7 @@ def main():
     try:
         test_entity_creation()
         test_fingerprint_conversions()
+        test_json_array_stream_chunking()
         
         print("\n==== All tests passed successfully! ====")
         
@@ -6,8 +6,17 @@ Client test for Bitnet API Python SDK with mock server
 import time
 import sys
 import os
-from bitnet_api import BitnetClient, BrowserFingerPrint
-from mock_server import MockServer
+import socket
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import CancelledError, Future
+from requests.exceptions import ConnectionError, HTTPError
+from bitnet_api import (
+    BitnetClient, Browser, BrowserFingerPrint, DeadlineExceeded, BrowserTemplate, FleetLauncher, FleetMirror, FleetStore, ListChangedError, ProxyChecker, ProxySpec,
+    RetryPolicy, StdlibJSONCodec, OrjsonCodec
+)
+from mock_server import MockServer, MockBitnetAPIHandler
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -169,6 +178,810 @@ def test_proxy_check(client):
     print("Proxy check test passed!")
 
 
+def test_transports(server):
+    """Test that every transport backend returns the same results"""
+    print("\n=== Testing Transports ===")
+    
+    for transport in ("http", "requests"):
+        with BitnetClient(host=server.host, port=server.port, transport=transport) as client:
+            for _ in range(3):
+                detail_response = client.get_browser_detail(id="test-browser-1")
+                assert detail_response.success is True
+                assert detail_response.data.id == "test-browser-1"
+            print(f"{transport} transport test passed!")
+    
+    # Connection failures surface as requests exceptions for every backend
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    for transport in ("http", "requests"):
+        with BitnetClient(host="127.0.0.1", port=closed_port, transport=transport) as client:
+            try:
+                client.health_check()
+                assert False, "Expected a connection error"
+            except ConnectionError:
+                pass
+    print("Transport error test passed!")
+
+
+def test_codecs(server):
+    """Test that every JSON codec encodes and decodes the same payloads"""
+    print("\n=== Testing Codecs ===")
+    
+    payload = {"name": "浏览器 1", "ids": ["a", "b"], "seq": 3, "proxy": None, "ok": True}
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson not installed, skipping orjson codec")
+    for codec in codecs:
+        encoded = codec.encode(payload)
+        assert isinstance(encoded, bytes)
+        assert codec.decode(encoded) == payload
+        with BitnetClient(host=server.host, port=server.port, codec=codec) as client:
+            assert client.codec is codec
+            create_response = client.create_or_update_browser(name=payload["name"])
+            assert create_response.success is True
+            detail_response = client.get_browser_detail(id=create_response.data.id)
+            assert detail_response.data.name == payload["name"]
+            client.delete_browser(id=create_response.data.id)
+        print(f"{codec.name} codec test passed!")
+    
+    try:
+        BitnetClient(codec="yaml")
+        assert False, "Expected an unknown codec error"
+    except ValueError:
+        pass
+
+
+def test_coalesced_reads(server):
+    """Test that identical concurrent reads share one round-trip"""
+    print("\n=== Testing Coalesced Reads ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.2)]
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_browser_detail(id="test-browser-1")))
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.005)
+        for thread in threads:
+            thread.join()
+        
+        assert len(results) == 10
+        assert all(result.data.id == "test-browser-1" for result in results)
+        stats = client.metrics.snapshot()["endpoints"]["browser/detail"]
+        print(f"Metrics: {stats}")
+        assert stats["calls"] == 1
+        assert stats["coalesced"] == 9
+        
+        # Finished requests are not cached
+        client.get_browser_detail(id="test-browser-1")
+        assert client.metrics.snapshot()["endpoints"]["browser/detail"]["calls"] == 2
+        
+        # A leader that runs out of its own deadline does not fail its waiters
+        MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.3)]
+        outcomes = {}
+        
+        def leader():
+            try:
+                with client.deadline(0.1):
+                    client.get_browser_detail(id="test-browser-1")
+            except DeadlineExceeded as e:
+                outcomes["leader"] = e
+        
+        def waiter():
+            outcomes["waiter"] = client.get_browser_detail(id="test-browser-1")
+        
+        threads = [threading.Thread(target=leader), threading.Thread(target=waiter)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join()
+        assert isinstance(outcomes["leader"], DeadlineExceeded)
+        assert outcomes["waiter"].success is True
+    
+    with BitnetClient(host=server.host, port=server.port, coalesce_reads=False) as client:
+        MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.1)]
+        threads = [threading.Thread(target=client.get_browser_detail, kwargs={"id": "test-browser-1"})
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert client.metrics.snapshot()["endpoints"]["browser/detail"]["calls"] == 3
+    print("Coalesced reads test passed!")
+
+
+def test_batch(server):
+    """Test that calls queued in a batch run concurrently and keep their order"""
+    print("\n=== Testing Batch ===")
+    
+    with BitnetClient(host=server.host, port=server.port, retry_policy=RetryPolicy(max_attempts=1)) as client:
+        MockBitnetAPIHandler.faults["/browser/open"] = [("delay", 0.2)] * 4 + [500]
+        start = time.perf_counter()
+        with client.batch(max_workers=5) as batch:
+            futures = [client.open_browser(id="test-browser-1") for _ in range(5)]
+            futures.append(client.get_browser_detail(id="test-browser-1"))
+            assert all(isinstance(future, Future) for future in futures)
+            assert not any(future.done() for future in futures)
+        elapsed = time.perf_counter() - start
+        print(f"Batch finished in {elapsed:.3f}s")
+        assert elapsed < 0.6
+        
+        results = batch.results()
+        assert len(results) == 6
+        assert sum(isinstance(result, HTTPError) for result in results[:5]) == 1
+        assert sum(getattr(result, "success", False) for result in results[:5]) == 4
+        assert results[5].data.id == "test-browser-1"
+        
+        # Outside the block calls block again
+        assert client.get_browser_detail(id="test-browser-1").success is True
+        
+        # An exception in the block cancels the queued calls
+        try:
+            with client.batch() as batch:
+                future = client.get_browser_detail(id="test-browser-1")
+                raise KeyError("abort")
+        except KeyError:
+            pass
+        assert future.cancelled()
+        assert isinstance(batch.results()[0], CancelledError)
+    print("Batch test passed!")
+
+
+def test_priority_scheduling(server):
+    """Test that urgent calls overtake queued bulk calls for the connection pool"""
+    print("\n=== Testing Priority Scheduling ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        assert client.scheduler is None  # opt-in
+    
+    with BitnetClient(host=server.host, port=server.port, pool_maxsize=2, priority_scheduling=True) as client:
+        MockBitnetAPIHandler.faults["/browser/detail"] = [("delay", 0.1)] * 8
+        
+        def bulk_job():
+            with client.priority("bulk"), client.batch(max_workers=8):
+                for n in range(8):
+                    client.get_browser_detail(id=f"bulk-{n}")
+        
+        job = threading.Thread(target=bulk_job)
+        job.start()
+        time.sleep(0.05)
+        start = time.perf_counter()
+        assert client.close_browser(id="test-browser-1").success is True
+        elapsed = time.perf_counter() - start
+        job.join()
+        
+        print(f"Urgent call finished in {elapsed:.3f}s while bulk work was queued")
+        assert elapsed < 0.25
+        stats = client.metrics.snapshot()["priorities"]
+        print(f"Priority metrics: {stats}")
+        assert stats["bulk"]["dispatched"] == 8
+        assert stats["bulk"]["peak_queued"] >= 5
+        assert stats["bulk"]["queued"] == 0
+        assert stats["bulk"]["wait_time"] > 0
+        assert stats["urgent"]["waited"] == 1
+        assert client.scheduler.in_flight == 0
+        
+        # A streamed response keeps its slot until it is closed
+        with client.browser_list(page=0, page_size=10, stream=True) as browsers:
+            assert client.scheduler.in_flight == 1
+        assert client.scheduler.in_flight == 0
+        with client.browser_list(page=0, page_size=10, stream=True) as browsers:
+            list(browsers)
+            assert client.scheduler.in_flight == 0
+    print("Priority scheduling test passed!")
+
+
+def test_streaming_browser_list(server):
+    """Test that a streamed browser list matches the regular one"""
+    print("\n=== Testing Streaming Browser List ===")
+    
+    for transport in ("http", "requests"):
+        with BitnetClient(host=server.host, port=server.port, transport=transport) as client:
+            created = [client.create_or_update_browser(name=f"stream {n}").data.id for n in range(30)]
+            expected = client.browser_list(page=0, page_size=1000)
+            
+            observed = []
+            client.add_listener(lambda endpoint, data, response: observed.extend(response.content)
+                                if endpoint == "browser/list" else None)
+            with client.browser_list(page=0, page_size=1000, stream=True) as browsers:
+                assert browsers.page_info is None
+                streamed = list(browsers)
+            assert [browser.id for browser in streamed] == [browser.id for browser in expected.content]
+            # Streamed browsers reach the listeners like a parsed page
+            assert [browser.id for browser in observed] == [browser.id for browser in streamed]
+            assert streamed[-1].name == expected.content[-1].name
+            assert browsers.success is True
+            assert browsers.page_info == expected.page_info
+            
+            # Stopping early drops the connection; the client keeps working
+            with client.browser_list(page=0, page_size=1000, stream=True) as browsers:
+                assert next(iter(browsers)).id == expected.content[0].id
+            assert client.get_browser_detail(id=created[0]).success is True
+            
+            client.delete_browsers(ids=created)
+            print(f"{transport} streaming test passed!")
+
+
+def test_iter_browsers(server):
+    """Test that iter_browsers walks every page and prefetches the next one"""
+    print("\n=== Testing iter_browsers ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"paged {n}").data.id for n in range(20)]
+        expected = [browser.id for browser in client.browser_list(page=0, page_size=1000).content]
+        
+        assert [browser.id for browser in client.iter_browsers(page_size=7)] == expected
+        assert [browser.id for browser in client.iter_browsers_concise(page_size=7)] == expected
+        assert [browser.id for browser in client.iter_browsers(group_id="no-such-group")] == []
+        
+        # Page n+1 is fetched while the caller still works on page n
+        page_size = (len(expected) + 2) // 3
+        MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0.2)] * 3
+        start = time.perf_counter()
+        for n, browser in enumerate(client.iter_browsers(page_size=page_size)):
+            if n % page_size == 0:
+                time.sleep(0.2)
+        elapsed = time.perf_counter() - start
+        print(f"Walked 3 slow pages in {elapsed:.3f}s")
+        assert elapsed < 1.0
+        
+        # Stopping early leaves the client usable
+        walk = client.iter_browsers(page_size=5)
+        assert next(walk).id == expected[0]
+        walk.close()
+        assert client.get_browser_detail(id=created[0]).success is True
+        
+        client.delete_browsers(ids=created)
+    print("iter_browsers test passed!")
+
+
+def test_list_all_browsers(server):
+    """Test that list_all_browsers fans out pages and detects a changing list"""
+    print("\n=== Testing list_all_browsers ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"fan-out {n}").data.id for n in range(20)]
+        expected = client.browser_list(page=0, page_size=1000).content
+        
+        browsers = client.list_all_browsers(page_size=3, parallelism=4)
+        assert sorted(browser.id for browser in browsers) == sorted(browser.id for browser in expected)
+        seqs = [browser.seq for browser in browsers]
+        assert seqs == sorted(seqs)
+        
+        # Pages after the first are slow; a browser created meanwhile shifts them
+        def create_late():
+            time.sleep(0.1)
+            created.append(client.create_or_update_browser(name="late").data.id)
+        
+        MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0)] + [("delay", 0.3)] * 3
+        late = threading.Thread(target=create_late)
+        late.start()
+        try:
+            client.list_all_browsers(page_size=10, parallelism=3, attempts=1)
+            assert False, "Expected ListChangedError"
+        except ListChangedError as e:
+            print(f"Detected change: {e}")
+        late.join()
+        MockBitnetAPIHandler.faults["/browser/list"] = []
+        
+        # With attempts left the listing starts over and comes out consistent
+        assert len(client.list_all_browsers(page_size=10, parallelism=3)) == len(expected) + 1
+        
+        client.delete_browsers(ids=created)
+    print("list_all_browsers test passed!")
+
+
+def test_fleet_launcher(server):
+    """Test that FleetLauncher bounds concurrency, retries and streams results"""
+    print("\n=== Testing FleetLauncher ===")
+    
+    with BitnetClient(host=server.host, port=server.port, retry_policy=RetryPolicy(max_attempts=1)) as client:
+        created = [client.create_or_update_browser(name=f"fleet {n}").data.id for n in range(12)]
+        launcher = FleetLauncher(client, concurrency=4, max_attempts=2,
+                                 backoff=RetryPolicy(backoff_base=0.01, jitter=False))
+        assert launcher.queue is True
+        
+        MockBitnetAPIHandler.faults["/browser/open"] = [500] + [("delay", 0.1)] * 12
+        specs = created[:-1] + [{"id": created[-1], "new_page_url": "https://example.com"}, "missing-browser"]
+        start = time.perf_counter()
+        results = []
+        for result in launcher.launch(specs):
+            if not results:
+                first_after = time.perf_counter() - start
+            results.append(result)
+        elapsed = time.perf_counter() - start
+        print(f"First window after {first_after:.3f}s, all 13 after {elapsed:.3f}s")
+        assert first_after < 0.3
+        assert 0.3 <= elapsed < 0.9
+        
+        by_id = {result.id: result for result in results}
+        assert len(by_id) == 13
+        assert all(by_id[browser_id].success and by_id[browser_id].ws.startswith("ws://")
+                   for browser_id in created)
+        assert sum(result.attempts == 2 for result in results if result.success) == 1
+        assert by_id["missing-browser"].success is False
+        assert by_id["missing-browser"].attempts == 2
+        
+        summary = launcher.summary()
+        print(f"Summary: {summary}")
+        assert summary.launched == 12 and summary.failed == 1
+        assert summary.retries == 2
+        assert summary.throughput > 0
+        assert 0.1 <= summary.p50 <= summary.p95 <= summary.p99
+        assert "missing-browser" in summary.failures
+        
+        client.delete_browsers(ids=created)
+    print("FleetLauncher test passed!")
+
+
+def test_bulk_create(server):
+    """Test that bulk creates encode the template once and respect the rate"""
+    print("\n=== Testing Bulk Create ===")
+    
+    class CountingCodec(StdlibJSONCodec):
+        def __init__(self):
+            super().__init__()
+            self.fingerprints_encoded = 0
+        
+        def encode(self, obj):
+            content = super().encode(obj)
+            self.fingerprints_encoded += content.count(b"browserFingerPrint")
+            return content
+    
+    codec = CountingCodec()
+    with BitnetClient(host=server.host, port=server.port, codec=codec) as client:
+        fingerprint = BrowserFingerPrint(core_version="112", ostype="PC", os="Win32")
+        template = BrowserTemplate(group_id="bulk-group", browser_fingerprint=fingerprint, proxy_type="socks5")
+        rows = ({"name": f"bulk {n}", "remark": f"row {n}"} if n % 2 else
+                {"name": f"bulk {n}", "host": f"10.0.0.{n}", "port": "1080", "proxy_username": "u"}
+                for n in range(40))
+        
+        start = time.perf_counter()
+        results = list(client.create_browsers(template, rows, concurrency=4, rate=200))
+        elapsed = time.perf_counter() - start
+        print(f"Created {len(results)} profiles in {elapsed:.3f}s")
+        assert elapsed >= 39 / 200
+        assert all(result.success for result in results)
+        assert sorted(result.index for result in results) == list(range(40))
+        # One encoded template per distinct set of per-profile fields
+        assert codec.fingerprints_encoded == 2
+        
+        for result in results:
+            stored = MockBitnetAPIHandler.browsers[result.id]
+            assert stored["name"] == f"bulk {result.index}"
+            assert stored["groupId"] == "bulk-group"
+            assert stored["proxyType"] == "socks5"
+            assert stored["browserFingerPrint"]["coreVersion"] == "112"
+            if result.index % 2:
+                assert stored["remark"] == f"row {result.index}" and stored["host"] == ""
+            else:
+                assert stored["host"] == f"10.0.0.{result.index}" and stored["proxyUserName"] == "u"
+        
+        client.delete_browsers(ids=[result.id for result in results])
+        
+        # A bad row fails on its own, without a request
+        results = list(client.create_browsers(template, [{"id": "x"}, {"nmae": "typo"}]))
+        assert not any(result.success for result in results)
+        assert all(isinstance(result.error, ValueError) for result in results)
+    print("Bulk create test passed!")
+
+
+def test_chunked_bulk_calls(server):
+    """Test that chunked deletes isolate failing ids and report them in a bitmap"""
+    print("\n=== Testing Chunked Bulk Calls ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"chunked {n}").data.id for n in range(60)]
+        MockBitnetAPIHandler.protected_ids.update([created[7], created[41]])
+        try:
+            result = client.delete_browsers_chunked(created, chunk_size=4, concurrency=3)
+        finally:
+            MockBitnetAPIHandler.protected_ids.clear()
+        print(f"{result.succeeded}/{len(result)} deleted with {result.requests} requests, "
+              f"last error: {result.last_error}")
+        assert result.failed_indices() == [7, 41]
+        assert result.succeeded == 58 and not result.all_succeeded
+        assert len(result.bits) == 8
+        assert "protected" in result.last_error
+        # Fast responses grow the chunks, so far fewer than one request per 4 ids
+        assert result.requests < 30
+        remaining = [browser_id for browser_id in created if browser_id in MockBitnetAPIHandler.browsers]
+        assert remaining == [created[7], created[41]]
+        
+        for browser_id in remaining:
+            client.open_browser(id=browser_id)
+        seqs = [MockBitnetAPIHandler.browsers[browser_id]["seq"] for browser_id in remaining]
+        result = client.close_browsers_by_seqs_chunked(seqs, chunk_size=1)
+        assert result.all_succeeded and result.requests == 2
+        assert not any("ws" in MockBitnetAPIHandler.browsers[browser_id] for browser_id in remaining)
+        
+        assert client.delete_browsers_chunked(remaining).all_succeeded
+        assert len(client.delete_browsers_chunked([])) == 0
+    
+    # Chunks that could not be sent, or that failed on the server side, are not split
+    with BitnetClient(host=server.host, port=server.port, retry_policy=RetryPolicy(max_attempts=1)) as client:
+        MockBitnetAPIHandler.faults["/browser/delete/ids"] = [503]
+        result = client.delete_browsers_chunked([f"unsent-{n}" for n in range(8)], chunk_size=8)
+        assert result.requests == 1 and result.succeeded == 0 and "503" in result.last_error
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+    with BitnetClient(host="127.0.0.1", port=closed_port, retry_policy=RetryPolicy(max_attempts=1)) as client:
+        result = client.delete_browsers_chunked([f"unsent-{n}" for n in range(16)], chunk_size=4, concurrency=1)
+        assert result.requests == 4 and result.succeeded == 0
+    print("Chunked bulk calls test passed!")
+
+
+def test_grouped_updates(server):
+    """Test that diffed partial updates and proxy assignments are grouped into few calls"""
+    print("\n=== Testing Grouped Updates ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"grouped {n}", remark="warm" if n < 5 else "cold").data.id
+                   for n in range(30)]
+        desired = {browser_id: {"remark": "warm"} for browser_id in created[:20]}
+        desired.update({browser_id: {"remark": "warm", "mute_audio": True} for browser_id in created[20:]})
+        desired["ghost-browser"] = {"remark": "haunted"}
+        
+        report = client.apply_browser_changes(client.list_all_browsers(), desired, max_ids_per_call=10)
+        print(f"Changes: {report}")
+        assert report.browsers == 31 and report.unchanged == 5
+        # remark only (15 ids, 2 calls), remark + muteAudio (10 ids), and the unknown browser
+        assert report.groups == 3 and report.requests == 4
+        assert report.failed == ["ghost-browser"]
+        assert "not found" in report.errors["ghost-browser"]
+        assert all(MockBitnetAPIHandler.browsers[browser_id]["remark"] == "warm" for browser_id in created)
+        assert all(MockBitnetAPIHandler.browsers[browser_id].get("muteAudio") for browser_id in created[20:])
+        assert not any("muteAudio" in MockBitnetAPIHandler.browsers[browser_id] for browser_id in created[:20])
+        
+        proxies = [{"proxy_type": "socks5", "host": f"10.0.0.{n}", "port": 1080, "proxy_username": "u",
+                    "proxy_password": "p"} for n in range(3)]
+        assignments = {browser_id: proxies[n % 3] for n, browser_id in enumerate(created)}
+        assignments[created[0]] = dict(proxies[0], port="1080", proxy_method=2)
+        report = client.assign_proxies(assignments, concurrency=3)
+        print(f"Proxies: {report}")
+        assert report.groups == 3 and report.requests == 3 and not report.failed
+        for n, browser_id in enumerate(created):
+            stored = MockBitnetAPIHandler.browsers[browser_id]
+            assert stored["host"] == f"10.0.0.{n % 3}" and stored["port"] == "1080"
+            assert stored["proxyType"] == "socks5" and stored["proxyUserName"] == "u"
+        
+        client.delete_browsers(ids=created)
+    print("Grouped updates test passed!")
+
+
+def test_proxy_checker(server):
+    """Test that proxy lists are checked concurrently, once per proxy, with cached results"""
+    print("\n=== Testing Proxy Checker ===")
+    
+    assert ProxySpec.parse("socks5://u%40x:p@Example.com:1080") == ProxySpec("example.com", 1080, "socks5", "u@x", "p")
+    assert ProxySpec.parse("10.0.0.1:8080:user:pass", default_type="http").key == ("10.0.0.1", 8080, "user")
+    
+    lines = [f"10.0.0.{n}:1080:user:pass" for n in range(8)] + ["dead.example.com:1080", "# comment", ""]
+    lines += ["10.0.0.1:1080:user:other-pass", {"host": "10.0.0.2", "port": "1080", "proxy_username": "user"}]
+    with BitnetClient(host=server.host, port=server.port) as client:
+        checker = ProxyChecker(client, concurrency=8, ttl=0.5, failure_ttl=0.5)
+        MockBitnetAPIHandler.proxy_checks.clear()
+        MockBitnetAPIHandler.faults["/checkagent"] = [("delay", 0.2)] * 9
+        start = time.perf_counter()
+        results = list(checker.check(lines))
+        elapsed = time.perf_counter() - start
+        print(f"Checked {len(results)} proxies in {elapsed:.3f}s")
+        assert elapsed < 0.6
+        assert len(results) == 9 and len(MockBitnetAPIHandler.proxy_checks) == 9
+        assert len({check["id"] for check in MockBitnetAPIHandler.proxy_checks}) == 9
+        by_host = {result.proxy.host: result for result in results}
+        assert not by_host["dead.example.com"].ok and by_host["dead.example.com"].msg
+        assert all(by_host[f"10.0.0.{n}"].ok and by_host[f"10.0.0.{n}"].info.ip for n in range(8))
+        assert not any(result.cached for result in results)
+        
+        # Unchanged list: served from the cache without requests
+        start = time.perf_counter()
+        results = list(checker.check(lines + ["10.0.0.9:1080"]))
+        print(f"Re-checked in {time.perf_counter() - start:.3f}s")
+        assert len(results) == 10 and len(MockBitnetAPIHandler.proxy_checks) == 10
+        assert sum(result.cached for result in results) == 9
+        
+        # Cached results come out while a slow check is still in flight
+        MockBitnetAPIHandler.faults["/checkagent"] = [("delay", 0.4)]
+        start = time.perf_counter()
+        results = checker.check(["10.0.0.10:1080"] + lines)
+        assert next(results).cached and time.perf_counter() - start < 0.2
+        results = list(results)
+        assert len(results) == 9 and not results[-1].cached
+        
+        # Expired results are checked again
+        time.sleep(0.6)
+        results = list(checker.check(lines))
+        assert not any(result.cached for result in results)
+        assert len(MockBitnetAPIHandler.proxy_checks) == 20
+        
+        assert ProxyChecker(client).concurrency == client.pool_maxsize
+    print("Proxy checker test passed!")
+
+
+def test_write_behind(server):
+    """Test that buffered remark and group updates are merged by value and still read back"""
+    print("\n=== Testing Write-Behind ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"write-behind {n}", remark="new").data.id for n in range(20)]
+    
+    MockBitnetAPIHandler.listed_updates.clear()
+    with BitnetClient(host=server.host, port=server.port, write_behind=0.3) as client:
+        futures = [client.update_browser_remark("odd" if n % 2 else "even", [browser_id])
+                   for n, browser_id in enumerate(created)]
+        futures += [client.update_browser_group("test-group-1", [browser_id]) for browser_id in created[:5]]
+        futures.append(client.update_browser_remark("last", [created[1]]))
+        futures.append(client.update_browser_remark("lost", ["ghost-browser"]))
+        assert all(isinstance(future, Future) for future in futures)
+        
+        # Buffered writes are visible through the client before they are sent
+        assert not MockBitnetAPIHandler.listed_updates
+        assert MockBitnetAPIHandler.browsers[created[1]]["remark"] == "new"
+        detail = client.get_browser_detail(id=created[1]).data
+        assert detail.remark == "last" and detail.group_id == "test-group-1"
+        listed = {browser.id: browser for browser in client.list_all_browsers()}
+        assert listed[created[2]].remark == "even" and listed[created[9]].group_id != "test-group-1"
+        
+        responses = [future.result(timeout=2) for future in futures]
+        print(f"Sent {len(MockBitnetAPIHandler.listed_updates)} requests for {len(futures)} calls")
+        assert all(response.success for response in responses[:-1])
+        assert not responses[-1].success and "ghost-browser" in responses[-1].msg
+        # even, odd, last, lost and one group move
+        assert len(MockBitnetAPIHandler.listed_updates) == 5
+        for n, browser_id in enumerate(created):
+            stored = MockBitnetAPIHandler.browsers[browser_id]
+            assert stored["remark"] == ("last" if n == 1 else "odd" if n % 2 else "even")
+            assert (stored.get("groupId") == "test-group-1") == (n < 5)
+        
+        # Reaching max_ids flushes without waiting for the window
+        client.write_behind.max_ids = 10
+        client.write_behind.window = 30
+        start = time.perf_counter()
+        futures = [client.update_browser_remark("batch", [browser_id]) for browser_id in created[:10]]
+        assert all(future.result(timeout=2).success for future in futures)
+        assert time.perf_counter() - start < 1
+        
+        # Updates made in a batch are sent when it exits and listed in its results
+        client.write_behind.max_ids = 1000
+        with client.batch() as batch:
+            client.get_browser_detail(id=created[0])
+            client.update_browser_remark("batched", created[:3])
+        results = batch.results()
+        assert len(results) == 2 and results[0].success and results[1].success
+        assert MockBitnetAPIHandler.browsers[created[2]]["remark"] == "batched"
+        
+        # Closing the client sends what is still buffered
+        future = client.update_browser_remark("closing", created[10:])
+        assert not future.done()
+    assert future.result(timeout=0).success
+    assert all(MockBitnetAPIHandler.browsers[browser_id]["remark"] == "closing" for browser_id in created[10:])
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        client.delete_browsers(ids=created)
+    print("Write-behind test passed!")
+
+
+def test_close_browsers_by_known_seqs(server):
+    """Test that closing by id uses the seqs the client has seen and falls back per id"""
+    print("\n=== Testing Close By Known Seqs ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        created = [client.create_or_update_browser(name=f"close {n}").data.id for n in range(12)]
+        for browser_id in created[8:]:
+            client.open_browser(id=browser_id)
+    
+    MockBitnetAPIHandler.close_requests.clear()
+    with BitnetClient(host=server.host, port=server.port) as client:
+        # Only the browsers opened through this client have a known seq
+        for browser_id in created[:8]:
+            assert client.open_browser(id=browser_id).success
+        result = client.close_browsers(created + ["ghost-browser"])
+        print(f"Closed {result.succeeded}/{len(result)} in {result.requests} requests")
+        assert result.failed_indices() == [12] and "ghost-browser" in result.last_error
+        paths = [path for path, _ in MockBitnetAPIHandler.close_requests]
+        assert paths.count("/browser/close/byseqs") == 1 and paths.count("/browser/close") == 5
+        closed_seqs = next(body["seqs"] for path, body in MockBitnetAPIHandler.close_requests
+                           if path == "/browser/close/byseqs")
+        assert sorted(closed_seqs) == sorted(MockBitnetAPIHandler.browsers[browser_id]["seq"]
+                                             for browser_id in created[:8])
+        assert not any("ws" in MockBitnetAPIHandler.browsers[browser_id] for browser_id in created)
+        
+        # A list response teaches every seq at once
+        client.list_all_browsers()
+        MockBitnetAPIHandler.close_requests.clear()
+        assert client.close_browsers(created).all_succeeded
+        assert [path for path, _ in MockBitnetAPIHandler.close_requests] == ["/browser/close/byseqs"]
+        
+        client.delete_browsers(ids=created)
+    print("Close by known seqs test passed!")
+
+
+def test_fleet_mirror(server):
+    """Test that the mirror indexes browsers and follows the client's writes and refreshes"""
+    print("\n=== Testing Fleet Mirror ===")
+    
+    with BitnetClient(host=server.host, port=server.port) as client, FleetMirror(client, page_size=7) as mirror:
+        created = [client.create_or_update_browser(name=f"mirror {n % 3}", group_id="mirror-a",
+                                                   host=f"Proxy{n % 2}.example.com", port="1080").data.id
+                   for n in range(9)]
+        # Creates made through the client are mirrored right away
+        assert all(browser_id in mirror for browser_id in created)
+        mirror.refresh()
+        assert len(mirror) == len(MockBitnetAPIHandler.browsers)
+        assert {browser.id for browser in mirror.in_group("mirror-a")} == set(created)
+        assert [browser.id for browser in mirror.named("mirror 1")] == created[1::3]
+        assert len(mirror.on_proxy_host("proxy1.example.com")) == 4
+        first = mirror.get(created[0])
+        assert mirror.by_seq(first.seq).id == created[0]
+        
+        client.update_browser_remark("mirrored", created[:3])
+        client.update_browser_group("mirror-b", created[:2])
+        client.update_browser_proxy(created[:1], proxy_type="http", host="other.example.com", port="8080")
+        client.update_browser_partial(created[3:4], name="renamed")
+        assert mirror.get(created[2]).remark == "mirrored"
+        assert [browser.id for browser in mirror.in_group("mirror-b")] == created[:2]
+        assert mirror.on_proxy_host("other.example.com")[0].id == created[0]
+        assert len(mirror.on_proxy_host("proxy0.example.com")) == 4
+        assert mirror.named("renamed")[0].id == created[3] and len(mirror.named("mirror 0")) == 2
+        
+        assert client.open_browser(id=created[4]).success and mirror.get(created[4]).ws
+        client.close_browsers_by_seqs([mirror.get(created[4]).seq])
+        assert mirror.get(created[4]).ws is None
+        client.delete_browser(id=created[5])
+        assert created[5] not in mirror
+        
+        # Changes made elsewhere show up after a refresh
+        MockBitnetAPIHandler.browsers[created[6]]["name"] = "changed elsewhere"
+        del MockBitnetAPIHandler.browsers[created[7]]
+        mirror.refresh()
+        assert mirror.get(created[6]).name == "changed elsewhere" and created[7] not in mirror
+        assert mirror.by_seq(mirror.get(created[8]).seq).id == created[8]
+        
+        # A listing that changes while it is paged drops nothing
+        browser_list = client.browser_list
+        
+        def shifting_list(page=0, **kwargs):
+            if page == 1:
+                MockBitnetAPIHandler.browsers.pop(created[8], None)
+            return browser_list(page=page, **kwargs)
+        
+        client.browser_list = shifting_list
+        mirror.attempts = 1
+        known = len(mirror)
+        try:
+            mirror.refresh()
+            assert False, "Expected the listing to change"
+        except ListChangedError:
+            pass
+        assert len(mirror) == known and created[8] in mirror
+        # The next consistent listing does
+        mirror.attempts = 3
+        mirror.refresh()
+        assert created[8] not in mirror and len(mirror) == known - 1
+        del client.browser_list
+        
+        client.delete_browsers(ids=[browser_id for browser_id in created if browser_id in mirror])
+        assert not mirror.in_group("mirror-a") and not mirror.in_group("mirror-b")
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        with FleetMirror(client, refresh_interval=0.1) as mirror:
+            time.sleep(0.5)
+            assert len(mirror) == len(MockBitnetAPIHandler.browsers) and mirror.last_error is None
+        assert not client._listeners
+    print("Fleet mirror test passed!")
+
+
+def test_fleet_store(server):
+    """Test that the mirror saves its records to SQLite and starts from them on the next run"""
+    print("\n=== Testing Fleet Store ===")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        _check_fleet_store(server, os.path.join(directory, "fleet.db"))
+    print("Fleet store test passed!")
+
+
+def _check_fleet_store(server, path):
+    fingerprint = BrowserFingerPrint(core_version="112", ostype="PC", os="Win32")
+    with BitnetClient(host=server.host, port=server.port) as client:
+        with FleetStore(path) as store, FleetMirror(client, store=store) as mirror:
+            mirror.refresh()
+            created = [client.create_or_update_browser(name=f"stored {n}", browser_fingerprint=fingerprint).data.id
+                       for n in range(3)]
+            group_id = client.add_group(group_name="Stored Group", sort_num=5).data.id
+            client.update_browser_group(group_id, created[:2])
+            expected = len(mirror)
+    
+    # Changes made while the controller was down
+    MockBitnetAPIHandler.browsers[created[0]]["name"] = "renamed while down"
+    del MockBitnetAPIHandler.browsers[created[1]]
+    
+    with BitnetClient(host=server.host, port=server.port) as client:
+        MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0.3)]
+        start = time.perf_counter()
+        with FleetStore(path) as store, FleetMirror(client, store=store, refresh_interval=10) as mirror:
+            print(f"Loaded {len(mirror)} browsers in {time.perf_counter() - start:.3f}s")
+            # Served from disk before the reconcile has listed anything
+            assert len(mirror) == expected and mirror.get(created[0]).name == "stored 0"
+            assert [browser.id for browser in mirror.in_group(group_id)] == created[:2]
+            assert mirror.get(created[2]).browser_finger_print == fingerprint
+            assert mirror.group(group_id).group_name == "Stored Group"
+            
+            deadline = time.monotonic() + 3
+            while created[1] in mirror and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert created[1] not in mirror and mirror.get(created[0]).name == "renamed while down"
+            assert mirror.get(created[2]).browser_finger_print == fingerprint
+        
+        with FleetStore(path) as store:
+            browsers, groups = store.load()
+        assert {browser.id for browser in browsers} == set(MockBitnetAPIHandler.browsers)
+        assert group_id in {group.id for group in groups}
+        client.delete_browsers(ids=[created[0], created[2]])
+        client.delete_group(id=group_id)
+    
+    # Flushes running at once commit in the order their changes were queued
+    with FleetStore(path, flush_interval=60) as store:
+        codec, gate = store.codec, threading.Event()
+        
+        class GatedCodec:
+            decode = codec.decode
+            
+            def encode(self, value):
+                if value.get("name") == "older":
+                    gate.wait(2)
+                return codec.encode(value)
+        
+        store.codec = GatedCodec()
+        store.put_browser(Browser(id="flushed", name="older"))
+        older = threading.Thread(target=store.flush)
+        older.start()
+        time.sleep(0.05)
+        store.put_browser(Browser(id="flushed", name="newer"))
+        newer = threading.Thread(target=store.flush)
+        newer.start()
+        time.sleep(0.1)
+        gate.set()
+        older.join()
+        newer.join()
+        assert [browser.name for browser in store.load()[0] if browser.id == "flushed"] == ["newer"]
+        store.remove_browser("flushed")
+    
+    # A failed background flush is recorded and retried at the next interval
+    with FleetStore(path, flush_interval=0.05) as store:
+        codec, failures = store.codec, []
+        
+        class FailingCodec:
+            decode = codec.decode
+            
+            def encode(self, value):
+                if value.get("name") == "unlucky" and not failures:
+                    failures.append(sqlite3.OperationalError("database is locked"))
+                    raise failures[0]
+                return codec.encode(value)
+        
+        store.codec = FailingCodec()
+        store.put_browser(Browser(id="unlucky", name="unlucky"))
+        for _ in range(100):
+            if store.last_error is not None:
+                break
+            time.sleep(0.01)
+        assert store.last_error is failures[0]
+        for _ in range(100):
+            if store.last_error is None:
+                break
+            time.sleep(0.01)
+        assert store.last_error is None
+        assert [browser.id for browser in store.load()[0] if browser.id == "unlucky"] == ["unlucky"]
+        store.remove_browser("unlucky")
+
+
 def main():
     """Run all client tests"""
     print("==== Bitnet API Client Tests ====\n")
@@ -188,6 +1001,23 @@ def main():
             test_browser_management(client)
             test_group_management(client)
             test_proxy_check(client)
+            test_transports(server)
+            test_codecs(server)
+            test_coalesced_reads(server)
+            test_batch(server)
+            test_priority_scheduling(server)
+            test_streaming_browser_list(server)
+            test_iter_browsers(server)
+            test_list_all_browsers(server)
+            test_fleet_launcher(server)
+            test_bulk_create(server)
+            test_chunked_bulk_calls(server)
+            test_grouped_updates(server)
+            test_proxy_checker(server)
+            test_write_behind(server)
+            test_close_browsers_by_known_seqs(server)
+            test_fleet_mirror(server)
+            test_fleet_store(server)
             print("\n==== All client tests passed successfully! ====")
         except AssertionError as e:
             print(f"\nTest failed: {e}")
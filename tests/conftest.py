@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures for the client tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitnet_api import BitnetClient
+from mock_server import MockServer, MockAdsPowerAPIHandler
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Run a mock Bitnet API server on a free port"""
+    server = MockServer(port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    """Client connected to the mock server"""
+    client = BitnetClient(host=server.host, port=server.port)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="module")
+def adspower_server():
+    """Run a mock AdsPower API server on a free port"""
+    server = MockServer(port=0, handler=MockAdsPowerAPIHandler)
+    server.start()
+    yield server
+    server.stop()
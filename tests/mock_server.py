@@ -3,9 +3,9 @@
 Mock HTTP server to simulate Bitnet API for testing
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 import uuid
 import time
 import threading
@@ -14,6 +14,10 @@ import threading
 class MockBitnetAPIHandler(BaseHTTPRequestHandler):
     """Mock HTTP request handler for Bitnet API"""
     
+    # Keep connections alive so pooled clients can reuse them
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
     # Store some data for the mock API
     browsers = {
         "test-browser-1": {
@@ -34,6 +38,23 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
         }
     }
     
+    # Injected failures: path -> list of faults to apply to the next requests.
+    # A fault is an HTTP status code, "reset" to drop the connection
+    # without answering, or ("delay", seconds) to answer normally but late.
+    faults = {}
+    
+    # Browser ids that browser/delete/ids refuses to delete
+    protected_ids = set()
+    
+    # Bodies of the checkagent requests received
+    proxy_checks = []
+    
+    # Bodies of the browser/remark/update and browser/group/update requests received
+    listed_updates = []
+    
+    # (path, body) of the browser/close and browser/close/byseqs requests received
+    close_requests = []
+    
     groups = {
         "test-group-1": {
             "id": "test-group-1",
@@ -42,12 +63,23 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
         }
     }
     
-    def _set_headers(self):
+    def _set_headers(self, content_length=0):
         """Set common headers for all responses"""
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(content_length))
         self.end_headers()
     
+    def _send_json(self, response):
+        """Serialize and send a JSON response body"""
+        body = json.dumps(response).encode('utf-8')
+        self._set_headers(len(body))
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+    
     def do_POST(self):
         """Handle all POST requests"""
         content_length = int(self.headers['Content-Length'])
@@ -63,6 +95,20 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
         
         path = urlparse(self.path).path
         
+        if self.faults.get(path):
+            fault = self.faults[path].pop(0)
+            if isinstance(fault, tuple) and fault[0] == "delay":
+                time.sleep(fault[1])
+                fault = None
+            elif fault == "reset":
+                self.close_connection = True
+            else:
+                self.send_response(fault)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            if fault is not None:
+                return
+        
         # Route requests to appropriate handlers
         handlers = {
             '/health': self._handle_health,
@@ -73,6 +119,12 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
             '/browser/open': self._handle_browser_open,
             '/browser/close': self._handle_browser_close,
             '/browser/delete': self._handle_browser_delete,
+            '/browser/delete/ids': self._handle_browser_delete_ids,
+            '/browser/close/byseqs': self._handle_browser_close_byseqs,
+            '/browser/update/partial': self._handle_browser_update_fields,
+            '/browser/proxy/update': self._handle_browser_update_fields,
+            '/browser/remark/update': self._handle_browser_update_listed,
+            '/browser/group/update': self._handle_browser_update_listed,
             '/group/add': self._handle_group_add,
             '/group/list': self._handle_group_list,
             '/group/detail': self._handle_group_detail,
@@ -87,21 +139,19 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
     
     def _send_success(self, data=None):
         """Send a success response"""
-        self._set_headers()
         response = {
             "success": True,
             "data": data
         }
-        self.wfile.write(json.dumps(response).encode('utf-8'))
+        self._send_json(response)
     
     def _send_error(self, message):
         """Send an error response"""
-        self._set_headers()
         response = {
             "success": False,
             "msg": message
         }
-        self.wfile.write(json.dumps(response).encode('utf-8'))
+        self._send_json(response)
     
     def _handle_health(self, request_data):
         """Handle health check endpoint"""
@@ -182,6 +232,7 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
     
     def _handle_browser_close(self, request_data):
         """Handle browser close endpoint"""
+        self.close_requests.append(("/browser/close", request_data))
         browser_id = request_data.get("id")
         if browser_id in self.browsers:
             # Just remove runtime information
@@ -205,6 +256,52 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
         else:
             self._send_error(f"Browser not found: {browser_id}")
     
+    def _handle_browser_delete_ids(self, request_data):
+        """Handle bulk delete endpoint; rejects the whole request if it names a protected id"""
+        ids = request_data.get("ids", [])
+        protected = [browser_id for browser_id in ids if browser_id in self.protected_ids]
+        if protected:
+            self._send_error(f"Browser is protected: {protected[0]}")
+            return
+        for browser_id in ids:
+            self.browsers.pop(browser_id, None)
+        self._send_success()
+    
+    def _handle_browser_close_byseqs(self, request_data):
+        """Handle close by seqs endpoint"""
+        self.close_requests.append(("/browser/close/byseqs", request_data))
+        seqs = set(request_data.get("seqs", []))
+        for browser in self.browsers.values():
+            if browser.get("seq") in seqs:
+                browser.pop("ws", None)
+                browser.pop("http", None)
+        self._send_success()
+    
+    def _handle_browser_update_fields(self, request_data):
+        """Handle partial and proxy updates: set the given fields on every listed browser"""
+        fields = dict(request_data)
+        ids = fields.pop("ids", [])
+        missing = [browser_id for browser_id in ids if browser_id not in self.browsers]
+        if missing:
+            self._send_error(f"Browser not found: {missing[0]}")
+            return
+        for browser_id in ids:
+            self.browsers[browser_id].update(fields)
+        self._send_success()
+    
+    def _handle_browser_update_listed(self, request_data):
+        """Handle remark and group updates: set the value on every browser in browserIds"""
+        self.listed_updates.append(request_data)
+        fields = dict(request_data)
+        ids = fields.pop("browserIds", [])
+        missing = [browser_id for browser_id in ids if browser_id not in self.browsers]
+        if missing:
+            self._send_error(f"Browser not found: {missing[0]}")
+            return
+        for browser_id in ids:
+            self.browsers[browser_id].update(fields)
+        self._send_success()
+    
     def _handle_group_add(self, request_data):
         """Handle group add endpoint"""
         group_name = request_data.get("groupName", "")
@@ -260,7 +357,11 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
     
     def _handle_check_agent(self, request_data):
         """Handle proxy check endpoint"""
-        # Always return a successful proxy check
+        self.proxy_checks.append(request_data)
+        # Proxies on hosts starting with "dead" fail; all others work
+        if str(request_data.get("host", "")).startswith("dead"):
+            self._send_success({"success": False, "message": "Proxy connection failed"})
+            return
         proxy_info = {
             "success": True,
             "data": {
@@ -284,13 +385,115 @@ class MockBitnetAPIHandler(BaseHTTPRequestHandler):
         self._send_success(proxy_info)
 
 
+class MockAdsPowerAPIHandler(BaseHTTPRequestHandler):
+    """Mock HTTP request handler for the AdsPower local API"""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    profiles = {
+        "ads-profile-1": {
+            "profile_id": "ads-profile-1",
+            "profile_no": "1",
+            "name": "AdsPower Profile 1",
+            "group_id": "0",
+            "remark": ""
+        }
+    }
+    
+    # Request timestamps, used by tests to check client-side pacing
+    request_times = []
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+    
+    def _send_json(self, response):
+        """Serialize and send a JSON response body"""
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_success(self, data=None):
+        self._send_json({"code": 0, "msg": "success", "data": data})
+    
+    def _send_error(self, message):
+        self._send_json({"code": -1, "msg": message})
+    
+    def do_GET(self):
+        """Handle GET requests"""
+        self.request_times.append(time.monotonic())
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        if parsed.path == '/status':
+            self._send_success()
+        elif parsed.path == '/api/v2/browser-profile/active':
+            profile_id = params.get("profile_id")
+            if profile_id in self.profiles:
+                self._send_success({"status": "Inactive"})
+            else:
+                self._send_error(f"Profile not found: {profile_id}")
+        elif parsed.path == '/api/v1/group/list':
+            self._send_success({"list": [{"group_id": "0", "group_name": "Default"}],
+                                "page": int(params.get("page", 1)),
+                                "page_size": int(params.get("page_size", 10))})
+        else:
+            self._send_error(f"Unsupported endpoint: {parsed.path}")
+    
+    def do_POST(self):
+        """Handle POST requests"""
+        self.request_times.append(time.monotonic())
+        content_length = int(self.headers['Content-Length'])
+        request_json = json.loads(self.rfile.read(content_length) or b"{}")
+        path = urlparse(self.path).path
+        
+        if path == '/api/v2/browser-profile/create':
+            profile_id = str(uuid.uuid4())
+            self.profiles[profile_id] = {
+                "profile_id": profile_id,
+                "profile_no": str(len(self.profiles) + 1),
+                "name": request_json.get("name", ""),
+                "group_id": request_json.get("group_id", "0"),
+                "remark": request_json.get("remark", "")
+            }
+            self._send_success(self.profiles[profile_id])
+        elif path == '/api/v2/browser-profile/list':
+            page = request_json.get("page", 1)
+            limit = request_json.get("limit", 50)
+            profiles = list(self.profiles.values())
+            self._send_success({"list": profiles[(page - 1) * limit:page * limit],
+                                "page": page, "page_size": limit})
+        elif path == '/api/v2/browser-profile/start':
+            profile_id = request_json.get("profile_id")
+            if profile_id in self.profiles:
+                self._send_success({"ws": {"selenium": "127.0.0.1:9222",
+                                           "puppeteer": "ws://127.0.0.1:9222/devtools/browser/abc"},
+                                    "debug_port": "9222",
+                                    "webdriver": "/path/to/chromedriver"})
+            else:
+                self._send_error(f"Profile not found: {profile_id}")
+        elif path in ('/api/v2/browser-profile/stop', '/api/v2/browser-profile/update'):
+            self._send_success()
+        elif path == '/api/v2/browser-profile/delete':
+            for profile_id in request_json.get("profile_id", []):
+                self.profiles.pop(profile_id, None)
+            self._send_success()
+        else:
+            self._send_error(f"Unsupported endpoint: {path}")
+
+
 class MockServer:
     """Mock HTTP server for Bitnet API"""
     
-    def __init__(self, host="127.0.0.1", port=55055):
+    def __init__(self, host="127.0.0.1", port=55055, handler=MockBitnetAPIHandler):
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
         self.host = host
-        self.port = port
-        self.server = HTTPServer((host, port), MockBitnetAPIHandler)
+        # Resolve the real port when binding to port 0
+        self.port = self.server.server_address[1]
         self.server_thread = None
     
     def start(self):
@@ -298,14 +501,14 @@ class MockServer:
         self.server_thread = threading.Thread(target=self.server.serve_forever)
         self.server_thread.daemon = True
         self.server_thread.start()
-        print(f"Mock Bitnet API server started at http://{self.host}:{self.port}")
+        print(f"Mock API server started at http://{self.host}:{self.port}")
     
     def stop(self):
         """Stop the server"""
         if self.server:
             self.server.shutdown()
             self.server.server_close()
-            print("Mock Bitnet API server stopped")
+            print("Mock API server stopped")
 
 
 if __name__ == "__main__":
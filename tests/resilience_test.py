@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Resilience tests for Bitnet API Python SDK with mock server
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+
+from requests.exceptions import ConnectionError, HTTPError, ReadTimeout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitnet_api import (
+    AsyncBitnetClient, BitnetClient, RetryPolicy, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, DeadlineExceeded, Timeout,
+    AdaptiveLimit, ConcurrencyLimiter
+)
+from mock_server import MockServer, MockBitnetAPIHandler
+
+FAST_RETRIES = RetryPolicy(max_attempts=4, backoff_base=0.01, backoff_max=0.02)
+
+
+def test_retry_backoff_bounds():
+    """Test that backoff grows exponentially and stays within bounds"""
+    print("\n=== Testing Retry Backoff ===")
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=1.0, jitter=False)
+    delays = [policy.backoff(n) for n in range(1, 6)]
+    print(f"Backoff delays: {delays}")
+    assert delays == [0.1, 0.2, 0.4, 0.8, 1.0]
+
+    jittered = RetryPolicy(backoff_base=0.1, backoff_max=1.0)
+    assert all(0 <= jittered.backoff(3) <= 0.4 for _ in range(100))
+    print("Retry backoff test passed!")
+
+
+def test_retry_transient_failures(server):
+    """Test that safe endpoints are retried on 5xx and connection resets"""
+    print("\n=== Testing Retries ===")
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/browser/list"] = ["reset", 503]
+        response = client.browser_list()
+        assert response.success is True
+
+        stats = client.metrics.snapshot()
+        print(f"Metrics: {stats}")
+        assert stats["endpoints"]["browser/list"]["retries"] == 2
+        assert stats["endpoints"]["browser/list"]["retry_time"] > 0
+        assert stats["errors"] == 0
+    print("Retry test passed!")
+
+
+def test_no_retry_for_unsafe_endpoints(server):
+    """Test that creating a browser is not replayed after an ambiguous failure"""
+    print("\n=== Testing Unsafe Endpoints ===")
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/browser/update"] = ["reset"]
+        try:
+            client.create_or_update_browser(name="not replayed")
+            assert False, "Expected a connection error"
+        except ConnectionError:
+            pass
+        assert client.metrics.snapshot()["endpoints"]["browser/update"]["retries"] == 0
+
+    # Updating an existing browser carries an id and may be replayed
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/browser/update"] = [502]
+        response = client.create_or_update_browser(id="test-browser-1", name="Test Browser 1")
+        assert response.success is True
+        assert client.metrics.snapshot()["retries"] == 1
+
+    # Every close path may be replayed, like browser/close
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/browser/close/byseqs"] = [502]
+        assert client.close_browsers_by_seqs([]).success is True
+        assert client.metrics.snapshot()["endpoints"]["browser/close/byseqs"]["retries"] == 1
+
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/group/add"] = [500]
+        try:
+            client.add_group(group_name="not replayed")
+            assert False, "Expected an HTTP error"
+        except HTTPError:
+            pass
+    print("Unsafe endpoint test passed!")
+
+
+def test_no_replay_on_reused_connection(server):
+    """Test that a request the server may have received is not resent by the transport"""
+    print("\n=== Testing Reused Connection Failures ===")
+    for transport in ("http", "requests"):
+        with BitnetClient(host=server.host, port=server.port, transport=transport,
+                          retry_policy=FAST_RETRIES) as client:
+            assert client.health_check().success  # leaves a pooled connection behind
+            MockBitnetAPIHandler.faults["/browser/update"] = ["reset", "reset"]
+            try:
+                client.create_or_update_browser(name="not replayed")
+                assert False, "Expected a connection error"
+            except ConnectionError:
+                pass
+            assert len(MockBitnetAPIHandler.faults.pop("/browser/update")) == 1
+            
+            # Reads are still retried, by the RetryPolicy
+            MockBitnetAPIHandler.faults["/browser/detail"] = ["reset"]
+            assert client.get_browser_detail(id="test-browser-1").success
+            assert client.metrics.snapshot()["endpoints"]["browser/detail"]["retries"] == 1
+    
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+            assert (await client.health_check()).success
+            MockBitnetAPIHandler.faults["/browser/update"] = ["reset", "reset"]
+            try:
+                await client.create_or_update_browser(name="not replayed")
+                assert False, "Expected a connection error"
+            except ConnectionError:
+                pass
+            assert len(MockBitnetAPIHandler.faults.pop("/browser/update")) == 1
+    
+    asyncio.run(scenario())
+    print("Reused connection test passed!")
+
+
+def test_retry_when_connection_refused():
+    """Test that requests that never reached the server are retried for any endpoint"""
+    print("\n=== Testing Connection Refused ===")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    for transport in ("http", "requests"):
+        with BitnetClient(port=closed_port, transport=transport, retry_policy=FAST_RETRIES) as client:
+            try:
+                client.open_browser(id="test-browser-1")
+                assert False, "Expected a connection error"
+            except ConnectionError:
+                pass
+            stats = client.metrics.snapshot()
+            assert stats["retries"] == 3
+            assert stats["errors"] == 1
+    print("Connection refused test passed!")
+
+
+def test_circuit_breaker(server):
+    """Test that a failing endpoint family fails fast and recovers through health probes"""
+    print("\n=== Testing Circuit Breaker ===")
+    breakers = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=0.2)
+    with BitnetClient(host=server.host, port=server.port, circuit_breakers=breakers,
+                      retry_policy=RetryPolicy(max_attempts=1)) as client:
+        MockBitnetAPIHandler.faults["/browser/open"] = [503, 503, 503]
+        for _ in range(3):
+            try:
+                client.open_browser(id="test-browser-1")
+                assert False, "Expected an HTTP error"
+            except HTTPError:
+                pass
+        assert breakers.states()["launch"] == "open"
+
+        # Open circuit: fail fast without touching the server
+        start = time.perf_counter()
+        try:
+            client.open_browser(id="test-browser-1")
+            assert False, "Expected the circuit to be open"
+        except CircuitOpenError:
+            pass
+        print(f"Rejected in {(time.perf_counter() - start) * 1e6:.0f}us")
+        assert client.metrics.snapshot()["rejected"] == 1
+
+        # Other families are unaffected
+        assert client.get_browser_detail(id="test-browser-1").success is True
+
+        # A failed health probe keeps the circuit open
+        time.sleep(0.25)
+        MockBitnetAPIHandler.faults["/health"] = [503]
+        try:
+            client.open_browser(id="test-browser-1")
+            assert False, "Expected the circuit to stay open"
+        except CircuitOpenError:
+            pass
+        assert breakers.states()["launch"] == "open"
+
+        # A healthy probe lets a trial call through, which closes the circuit
+        time.sleep(0.25)
+        assert client.open_browser(id="test-browser-1").success is True
+        assert breakers.states()["launch"] == "closed"
+    print("Circuit breaker test passed!")
+
+
+def test_circuit_breaker_cancelled_probe(server):
+    """Test that a cancelled probe or trial does not leave a circuit stuck open"""
+    print("\n=== Testing Cancelled Circuit Probes ===")
+    breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0.1)
+    
+    async def scenario():
+        async with AsyncBitnetClient(host=server.host, port=server.port, circuit_breakers=breakers,
+                                     retry_policy=RetryPolicy(max_attempts=1)) as client:
+            MockBitnetAPIHandler.faults["/browser/open"] = [503]
+            try:
+                await client.open_browser(id="test-browser-1")
+                assert False, "Expected an HTTP error"
+            except HTTPError:
+                pass
+            assert breakers.states()["launch"] == "open"
+            
+            # Cancel the caller while its health probe is waiting for the server
+            await asyncio.sleep(0.15)
+            MockBitnetAPIHandler.faults["/health"] = [("delay", 0.5)]
+            task = asyncio.ensure_future(client.open_browser(id="test-browser-1"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+                assert False, "Expected the call to be cancelled"
+            except asyncio.CancelledError:
+                pass
+            
+            # The next caller probes again once the circuit has waited another timeout
+            await asyncio.sleep(0.15)
+            assert (await client.open_browser(id="test-browser-1")).success is True
+            assert breakers.states()["launch"] == "closed"
+    
+    asyncio.run(scenario())
+    
+    # A half-open trial that never reports back is given up after recovery_timeout
+    breaker = CircuitBreaker("launch", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.acquire() is True
+    breaker.probe_succeeded()
+    try:
+        breaker.acquire()
+        assert False, "Expected the trial slot to be taken"
+    except CircuitOpenError:
+        pass
+    time.sleep(0.06)
+    assert breaker.acquire() is False
+    breaker.release()
+    assert breaker.acquire() is False
+    print("Cancelled circuit probe test passed!")
+
+
+def test_timeouts(server):
+    """Test read timeouts and the slow-endpoint overrides"""
+    print("\n=== Testing Timeouts ===")
+    with BitnetClient(host=server.host, port=server.port, timeout=Timeout(connect=1.0, read=0.1),
+                      retry_policy=RetryPolicy(max_attempts=1)) as client:
+        assert client.timeout_for("browser/list").read == 0.1
+        assert client.timeout_for("browser/open").read == 120.0
+
+        MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0.5)]
+        start = time.perf_counter()
+        try:
+            client.browser_list()
+            assert False, "Expected a read timeout"
+        except ReadTimeout:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"Timed out after {elapsed:.3f}s")
+        assert elapsed < 0.4
+        time.sleep(0.5)
+
+        # The connection was discarded; the next call gets a fresh one
+        assert client.browser_list().success is True
+    print("Timeout test passed!")
+
+
+def test_deadline(server):
+    """Test that a deadline bounds several calls and their retries together"""
+    print("\n=== Testing Deadlines ===")
+    with BitnetClient(host=server.host, port=server.port, retry_policy=FAST_RETRIES) as client:
+        MockBitnetAPIHandler.faults["/browser/list"] = [("delay", 0.2), ("delay", 0.2), ("delay", 0.2)]
+        start = time.perf_counter()
+        try:
+            with client.deadline(0.3):
+                client.browser_list()
+                client.browser_list()
+            assert False, "Expected the deadline to pass"
+        except DeadlineExceeded:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"Deadline hit after {elapsed:.3f}s")
+        assert elapsed < 0.45
+        time.sleep(0.3)
+        MockBitnetAPIHandler.faults["/browser/list"] = []
+
+        # Nested deadlines can only shorten the outer one
+        with client.deadline(0.05) as outer:
+            with client.deadline(10) as inner:
+                assert inner is outer
+        with client.deadline(5):
+            assert client.browser_list().success is True
+    print("Deadline test passed!")
+
+
+def test_adaptive_limit():
+    """Test additive increase and multiplicative decrease of a concurrency limit"""
+    print("\n=== Testing Adaptive Limit ===")
+    limit = AdaptiveLimit("browser/open", initial_limit=2, max_limit=4)
+
+    # Fast responses while the limit is in use grow it up to max_limit
+    for _ in range(10):
+        starts = [limit.acquire() for _ in range(int(limit.limit))]
+        for started in starts:
+            limit.release(started)
+    print(f"Limit after fast rounds: {limit.limit:.2f}")
+    assert limit.limit == 4
+
+    # A caller that never uses the limit does not grow it
+    limit.limit = 3
+    for _ in range(10):
+        limit.release(limit.acquire())
+    assert limit.limit == 3
+    limit.limit = 4
+
+    # A round of overloaded responses cuts the limit once, not once per response
+    starts = [limit.acquire() for _ in range(4)]
+    for started in starts:
+        limit.release(started, overloaded=True)
+    print(f"Limit after overload: {limit.limit:.2f}")
+    assert limit.limit == 2
+
+    # Slow responses count as overload once a baseline is known
+    limit.latency_floor = 0.01
+    limit.release(limit.acquire())
+    started = limit.acquire()
+    time.sleep(0.02)
+    limit.release(started)
+    assert limit.limit < 2
+
+    # No free slot: waiting is bounded by the deadline
+    started = limit.acquire()
+    try:
+        limit.acquire(timeout=0.05)
+        assert False, "Expected to time out waiting for a slot"
+    except DeadlineExceeded:
+        pass
+    limit.cancel(started)
+    assert limit.in_flight == 0
+    print("Adaptive limit test passed!")
+
+
+def test_concurrency_limiter(server):
+    """Test that the client never exceeds the adaptive limit"""
+    print("\n=== Testing Concurrency Limiter ===")
+    limiter = ConcurrencyLimiter(initial_limit=3, max_limit=3)
+    with BitnetClient(host=server.host, port=server.port, pool_maxsize=20,
+                      concurrency_limiter=limiter) as client:
+        limit = limiter.get("browser/open")
+        peak = []
+        acquire = limit.acquire
+
+        def tracking_acquire(timeout=None):
+            started = acquire(timeout)
+            peak.append(limit.in_flight)
+            return started
+
+        limit.acquire = tracking_acquire
+        MockBitnetAPIHandler.faults["/browser/open"] = [("delay", 0.05)] * 12
+        with client.batch(max_workers=12) as batch:
+            for _ in range(12):
+                client.open_browser(id="test-browser-1")
+        assert all(result.success for result in batch.results())
+        print(f"Peak in flight: {max(peak)}, limits: {limiter.limits()}")
+        assert max(peak) <= 3
+        assert limit.in_flight == 0
+        assert limiter.get("health") is None
+    print("Concurrency limiter test passed!")
+
+
+def main():
+    """Run all resilience tests"""
+    print("==== Bitnet API Resilience Tests ====\n")
+    test_retry_backoff_bounds()
+    test_retry_when_connection_refused()
+    test_adaptive_limit()
+    server = MockServer(port=0)
+    try:
+        server.start()
+        test_retry_transient_failures(server)
+        test_no_retry_for_unsafe_endpoints(server)
+        test_no_replay_on_reused_connection(server)
+        test_circuit_breaker(server)
+        test_circuit_breaker_cancelled_probe(server)
+        test_timeouts(server)
+        test_deadline(server)
+        test_concurrency_limiter(server)
+        print("\n==== All resilience tests passed successfully! ====")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()